@@ -0,0 +1 @@
+"benchmarks for kedro-static-viz, run from the repository root with `python -m`"
@@ -0,0 +1,80 @@
+"""
+benchmark concurrent builds in one process and the memory they leave behind
+
+Formats `--builds` synthetic projects one after the other and in a thread pool
+of `--threads`, each with its own StaticVizBuilder, and checks the concurrent
+builds match the serial ones.  Reports the formatting time and the memory
+traced by tracemalloc while the builders are open and after they are closed and
+the projects dropped.
+
+Example:
+
+    python -m benchmarks.bench_builder --size 20000 --builds 8 --threads 4
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
+
+from kedro_static_viz.builder import StaticVizBuilder
+
+from .synthetic import shared_pipelines
+
+
+def _build(project: Tuple[Dict, Any]) -> StaticVizBuilder:
+    "formats a project, leaving its builder open"
+    pipelines, catalog = project
+    builder = StaticVizBuilder(catalog, pipelines)
+    builder.format_pipelines()
+    return builder
+
+
+def main() -> None:
+    "runs the benchmark and prints one row per mode"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--builds", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'builds (s)':>12}{'open (MiB)':>12}{'closed (MiB)':>14}")
+    expected = None
+    for mode in ("serial", "threads"):
+        tracemalloc.start()
+        projects = [
+            shared_pipelines(args.size, n_params=10) for _ in range(args.builds)
+        ]
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        if mode == "serial":
+            builders = [_build(project) for project in projects]
+        else:
+            with ThreadPoolExecutor(max_workers=args.threads) as pool:
+                builders = list(pool.map(_build, projects))
+        seconds = time.perf_counter() - start
+        opened = tracemalloc.get_traced_memory()[0] - before
+
+        outputs = {json.dumps(builder.data) for builder in builders}
+        if expected is None:
+            expected = outputs
+        elif outputs != expected:
+            raise AssertionError("concurrent builds differ from the serial builds")
+
+        for builder in builders:
+            builder.close()
+        del builders, projects
+        gc.collect()
+        closed = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(
+            f"{mode:<12}{seconds:>12.3f}{opened / 2 ** 20:>12.1f}"
+            f"{closed / 2 ** 20:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+benchmark cold and warm builds of the static site template
+
+Times `copy_site` into a fresh directory (cold) and into a directory that already
+holds the previous build (warm) for the clean copy and every sync link mode.
+
+Example:
+
+    python -m benchmarks.bench_copy_site --repeat 10
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from kedro_static_viz.core import LINK_MODES, copy_site
+
+
+def _time(func: Callable[[], None], repeat: int) -> List[float]:
+    "wall time in seconds of each of repeat calls"
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    "runs the benchmark and prints a table of median timings"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--root", default=None, help="directory to build into, e.g. an NFS mount"
+    )
+    args = parser.parse_args()
+
+    modes = [("clean", dict(sync=False))] + [
+        (f"sync-{link}", dict(sync=True, link=link)) for link in LINK_MODES
+    ]
+    print(f"{'mode':<16}{'cold (ms)':>12}{'warm (ms)':>12}")
+    for name, kwargs in modes:
+        with tempfile.TemporaryDirectory(dir=args.root) as tmp:
+            cold = []
+            for i in range(args.repeat):
+                target = Path(tmp) / f"cold-{i}"
+                cold.extend(_time(lambda: copy_site(target, **kwargs), 1))
+            warm_target = Path(tmp) / "warm"
+            copy_site(warm_target, **kwargs)
+            warm = _time(lambda: copy_site(warm_target, **kwargs), args.repeat)
+        print(
+            f"{name:<16}{statistics.median(cold) * 1000:>12.2f}"
+            f"{statistics.median(warm) * 1000:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+benchmark formatting large synthetic pipelines
+
+Reports the formatting time for 10k, 50k and 100k edge graphs shared between
+overlapping modular pipelines, and compares the old list scan edge
+deduplication with the hashed index on the same stream of edges.
+
+Example:
+
+    python -m benchmarks.bench_format --sizes 10000 50000 100000
+"""
+import argparse
+import time
+from typing import List, Tuple
+
+from kedro_static_viz import vendored
+from kedro_static_viz.builder import StaticVizBuilder
+
+from .synthetic import shared_pipelines
+
+
+def _edge_stream(pipelines: dict) -> List[Tuple[str, str]]:
+    "every (source, target) pair in the order format_pipeline_data visits them"
+    stream = []
+    for pipeline in pipelines.values():
+        for node in sorted(pipeline.nodes, key=lambda n: n.name):
+            task_id = vendored._hash(str(node))
+            for data_set in node.inputs:
+                stream.append((vendored._hash(data_set.split("@")[0]), task_id))
+            for data_set in node.outputs:
+                stream.append((task_id, vendored._hash(data_set.split("@")[0])))
+    return stream
+
+
+def _dedup_list_scan(stream: List[Tuple[str, str]]) -> float:
+    "seconds to deduplicate with `edge not in edges_list`, the old approach"
+    start = time.perf_counter()
+    edges_list: List[dict] = []
+    for source, target in stream:
+        edge = {"source": source, "target": target}
+        if edge not in edges_list:
+            edges_list.append(edge)
+    return time.perf_counter() - start
+
+
+def _dedup_index(stream: List[Tuple[str, str]]) -> float:
+    "seconds to deduplicate with a hashed index next to the list"
+    start = time.perf_counter()
+    edges_list: List[dict] = []
+    edges_index = set()
+    for source, target in stream:
+        if (source, target) not in edges_index:
+            edges_index.add((source, target))
+            edges_list.append({"source": source, "target": target})
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    "runs the benchmark and prints one row per graph size"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000]
+    )
+    parser.add_argument(
+        "--list-scan-max",
+        type=int,
+        default=50_000,
+        help="largest size to run the quadratic list scan for",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'edges':>8}{'format (s)':>12}{'list scan (s)':>15}{'index (s)':>12}"
+    )
+    for size in args.sizes:
+        pipelines, catalog = shared_pipelines(size)
+        builder = StaticVizBuilder(catalog, pipelines)
+
+        start = time.perf_counter()
+        data = builder.format_pipelines()
+        formatting = time.perf_counter() - start
+
+        stream = _edge_stream(pipelines)
+        scan = (
+            f"{_dedup_list_scan(stream):>15.3f}"
+            if size <= args.list_scan_max
+            else f"{'skipped':>15}"
+        )
+        print(
+            f"{len(data['edges']):>8}{formatting:>12.3f}{scan}"
+            f"{_dedup_index(stream):>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
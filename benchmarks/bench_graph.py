@@ -0,0 +1,66 @@
+"""
+benchmark the integer indexed graph on large synthetic projects
+
+For every size reports the time and the peak and retained memory traced by
+tracemalloc while formatting, the time to sort the layers of the graph, and the
+time to slice every pipeline from the graph and from the formatted dicts.
+
+Example:
+
+    python -m benchmarks.bench_graph --sizes 10000 50000 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from kedro_static_viz import vendored
+from kedro_static_viz.builder import StaticVizBuilder
+
+from .synthetic import shared_pipelines
+
+
+def main() -> None:
+    "runs the benchmark and prints one row per graph size"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000]
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'edges':>8}{'format (s)':>12}{'peak (MiB)':>12}{'kept (MiB)':>12}"
+        f"{'layers (s)':>12}{'slice graph (s)':>17}{'slice dicts (s)':>17}"
+    )
+    for size in args.sizes:
+        pipelines, catalog = shared_pipelines(size)
+        builder = StaticVizBuilder(catalog, pipelines)
+        gc.collect()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        data = builder.format_pipelines()
+        formatting = time.perf_counter() - start
+        kept, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        graph = builder.graph
+
+        start = time.perf_counter()
+        graph.sort_layers()
+        layers = time.perf_counter() - start
+
+        timings = []
+        for slice_graph in (graph, None):
+            start = time.perf_counter()
+            for pipeline in data["pipelines"]:
+                vendored._pipeline_data(data, pipeline["id"], slice_graph)
+            timings.append(time.perf_counter() - start)
+        print(
+            f"{len(data['edges']):>8}{formatting:>12.3f}{peak / 2 ** 20:>12.1f}"
+            f"{kept / 2 ** 20:>12.1f}{layers:>12.3f}{timings[0]:>17.3f}"
+            f"{timings[1]:>17.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+benchmark the import time of the package, the cli and the hooks
+
+Every module is imported in a fresh interpreter with `python -X importtime`.
+Reports the best cumulative import time over `--repeat` runs and fails when a
+module goes over `--budget-ms` or imports a dependency that should only be
+imported when a site is built or served, so the benchmark doubles as a guard
+against import time regressions.
+
+Example:
+
+    python -m benchmarks.bench_import --budget-ms 150
+"""
+import argparse
+import re
+import subprocess
+import sys
+from typing import List, Set, Tuple
+
+MODULES = ("kedro_static_viz", "kedro_static_viz.cli", "kedro_static_viz.hooks")
+
+# imported by the vendored kedro-viz app, only when building or serving
+HEAVY = (
+    "flask",
+    "IPython",
+    "requests",
+    "kedro_viz",
+    "toposort",
+    "kedro.framework.cli",
+    "kedro.framework.context",
+    "kedro.framework.hooks",
+    "kedro_static_viz.vendored",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_time(module: str) -> Tuple[float, Set[str]]:
+    """
+    imports module in a fresh interpreter
+
+    Returns (tuple): cumulative import time in ms, excluding the interpreter's
+        own startup, and the names of the modules imported
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    total = 0
+    imported: Set[str] = set()
+    startup = True
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        cumulative, indent, name = int(match[2]), match[3], match[4]
+        imported.add(name)
+        # top level imports, everything up to site is the interpreter's startup
+        if len(indent) == 1:
+            if not startup:
+                total += cumulative
+            elif name == "site":
+                startup = False
+    return total / 1000, imported
+
+
+def _heavy(imported: Set[str]) -> List[str]:
+    "the heavy dependencies imported, or one of their submodules"
+    return [
+        heavy
+        for heavy in HEAVY
+        if any(name == heavy or name.startswith(heavy + ".") for name in imported)
+    ]
+
+
+def main() -> None:
+    "runs the benchmark, prints one row per module and exits 1 on a regression"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    print(f"{'module':<26}{'import (ms)':>13}  heavy imports")
+    for module in args.modules:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        best = min(ms for ms, _ in runs)
+        heavy = _heavy(runs[0][1])
+        print(f"{module:<26}{best:>13.1f}  {', '.join(heavy) or '-'}")
+        if best > args.budget_ms:
+            failures.append(f"{module} took {best:.1f}ms, over {args.budget_ms}ms")
+        if heavy:
+            failures.append(f"{module} imported {', '.join(heavy)}")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+benchmark the build time layout on synthetic project shapes
+
+For every shape and size reports the time to lay out every pipeline into an
+empty layout cache, and again from the cache as an unchanged rebuild does.
+
+Example:
+
+    python -m benchmarks.bench_layout --sizes 1000 10000 --shapes fan_out layers
+"""
+import argparse
+import tempfile
+import time
+
+from kedro_static_viz.builder import StaticVizBuilder
+
+from .synthetic import SHAPES
+
+
+def main() -> None:
+    "runs the benchmark and prints one row per shape and size"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument(
+        "--shapes", nargs="+", choices=sorted(SHAPES), default=sorted(SHAPES)
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'shape':<10}{'edges':>8}{'pipelines':>11}{'layout (s)':>12}"
+        f"{'cached (s)':>12}"
+    )
+    for shape in args.shapes:
+        for size in args.sizes:
+            pipelines, catalog = SHAPES[shape](size, seed=0)
+            builder = StaticVizBuilder(catalog, pipelines)
+            data = builder.format_pipelines()
+            timings = []
+            with tempfile.TemporaryDirectory() as cache:
+                for _ in range(2):
+                    start = time.perf_counter()
+                    builder.layout_pipelines(cache=cache)
+                    timings.append(time.perf_counter() - start)
+            print(
+                f"{shape:<10}{len(data['edges']):>8}{len(data['pipelines']):>11}"
+                f"{timings[0]:>12.3f}{timings[1]:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
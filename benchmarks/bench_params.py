@@ -0,0 +1,69 @@
+"""
+benchmark parameter loading while formatting pipelines that share parameters
+
+Every node reads one of `--params` large `params:<x>` namespaces and every
+tenth node reads `parameters`.  Reports the formatting time with parameters
+loaded eagerly and deferred, the number of dataset loads, and the time to then
+resolve the parameters of every task node, which the metadata export does.
+
+Example:
+
+    python -m benchmarks.bench_params --sizes 4000 20000
+"""
+import argparse
+import time
+from typing import Any, Dict
+
+from kedro_static_viz.builder import StaticVizBuilder
+
+from .synthetic import shared_pipelines
+
+
+def _count_loads(catalog: Any) -> Dict[str, int]:
+    "wraps the load of every dataset in catalog to count its calls"
+    counts: Dict[str, int] = {}
+    for name, dataset in catalog._data_sets.items():
+        counts[name] = 0
+
+        def load(load=dataset.load, name=name):  # type: ignore
+            counts[name] += 1
+            return load()
+
+        dataset.load = load
+    return counts
+
+
+def main() -> None:
+    "runs the benchmark and prints one row per size and mode"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4_000, 20_000])
+    parser.add_argument("--params", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'edges':>8}  {'mode':<9}{'format (s)':>12}{'loads':>8}{'resolve (s)':>13}"
+    )
+    for size in args.sizes:
+        for defer in (False, True):
+            pipelines, catalog = shared_pipelines(size, n_params=args.params)
+            counts = _count_loads(catalog)
+            builder = StaticVizBuilder(catalog, pipelines)
+
+            start = time.perf_counter()
+            data = builder.format_pipelines(defer_parameters=defer)
+            formatting = time.perf_counter() - start
+
+            start = time.perf_counter()
+            parameters = builder.parameters
+            for node in builder.json_nodes.values():
+                if node["type"] == "task" and "parameter_namespaces" in node:
+                    parameters.node_parameters(node["parameter_namespaces"])
+            resolving = time.perf_counter() - start
+            print(
+                f"{len(data['edges']):>8}  {'deferred' if defer else 'eager':<9}"
+                f"{formatting:>12.3f}{sum(counts.values()):>8}{resolving:>13.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
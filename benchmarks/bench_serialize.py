@@ -0,0 +1,98 @@
+"""
+benchmark saving pipeline.json for large graphs
+
+Every mode runs in its own subprocess so the reported peak RSS growth is the
+memory the save itself needed on top of the graph data.
+
+Modes:
+    legacy          json.dumps(indent=4, sort_keys=True) then write_text
+    pretty          streamed, byte for byte identical to legacy
+    compact-json    streamed compact output with the standard library
+    compact-orjson  streamed compact output with orjson, when installed
+
+Example:
+
+    python -m benchmarks.bench_serialize --sizes 10000 100000
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kedro_static_viz.serialize import _orjson, dump
+
+from .synthetic import formatted_data
+
+MODES = ["legacy", "pretty", "compact-json", "compact-orjson"]
+
+
+def _max_rss_kib() -> int:
+    "peak resident set size of this process in KiB"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _child(mode: str, size: int) -> None:
+    "saves one graph in one mode and prints bytes, seconds and rss growth as json"
+    data = formatted_data(size)
+    before = _max_rss_kib()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pipeline.json"
+        start = time.perf_counter()
+        if mode == "legacy":
+            path.write_text(json.dumps(data, indent=4, sort_keys=True))
+        else:
+            compact = mode.startswith("compact")
+            backend = mode.split("-")[1] if compact else None
+            with open(path, "wb") as f:
+                dump(data, f, compact=compact, backend=backend)
+        elapsed = time.perf_counter() - start
+        written = path.stat().st_size
+    print(
+        json.dumps(
+            {"bytes": written, "seconds": elapsed, "rss_kib": _max_rss_kib() - before}
+        )
+    )
+
+
+def main() -> None:
+    "runs every mode for every size in a subprocess and prints a table"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--child", nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child[0], int(args.child[1]))
+        return
+
+    modes = [m for m in MODES if m != "compact-orjson" or _orjson() is not None]
+    print(
+        f"{'nodes':>8}  {'mode':<16}{'MiB written':>12}{'time (s)':>10}"
+        f"{'peak +MiB':>11}"
+    )
+    for size in args.sizes:
+        for mode in modes:
+            command = [sys.executable, "-m", "benchmarks.bench_serialize"]
+            command += ["--child", mode, str(size)]
+            out = subprocess.run(
+                command,
+                check=True,
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+            ).stdout
+            result = json.loads(out.strip().splitlines()[-1])
+            print(
+                f"{size * 2:>8}  {mode:<16}{result['bytes'] / 2 ** 20:>12.2f}"
+                f"{result['seconds']:>10.3f}{result['rss_kib'] / 1024:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+local load test of the preview server
+
+Starts the server on a free port over a freshly built site template and lets
+concurrent clients fetch the site's files over keep-alive connections, then
+reports requests per second and latency percentiles for the threaded server
+and the single threaded server of earlier versions.
+
+Example:
+
+    python -m benchmarks.bench_server --clients 8 --requests 200
+"""
+import argparse
+import contextlib
+import http.client
+import io
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from kedro_static_viz.core import copy_site
+from kedro_static_viz.server import make_server
+
+
+def _client(
+    port: int, paths: List[str], requests: int, latencies: List[float]
+) -> None:
+    "fetches paths round robin over one connection, recording each latency"
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for i in range(requests):
+        start = time.perf_counter()
+        connection.request("GET", paths[i % len(paths)])
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def _run(site: Path, threaded: bool, clients: int, requests: int) -> None:
+    "load tests one server mode and prints its row"
+    paths = [
+        "/" + path.relative_to(site).as_posix()
+        for path in sorted(site.rglob("*"))
+        if path.is_file() and not path.name.startswith(".")
+    ]
+    server = make_server(site, port=0, host="127.0.0.1", threaded=threaded)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    latencies: List[float] = []
+    workers = [
+        threading.Thread(target=_client, args=(port, paths, requests, latencies))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{'threaded' if threaded else 'single':<10}{len(latencies) / elapsed:>10.0f}"
+        f"{quantiles[49] * 1000:>10.2f}{quantiles[98] * 1000:>10.2f}"
+    )
+
+
+def main() -> None:
+    "builds the site template once and load tests both server modes"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="per client")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        site = Path(tmp) / "public"
+        copy_site(site)
+        print(f"{'server':<10}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        for threaded in (False, True):
+            # keep the per request access log out of the report
+            with contextlib.redirect_stderr(io.StringIO()):
+                _run(site, threaded, args.clients, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+benchmark _sort_layers on deep chains and wide fan-out graphs
+
+Reports wall time and the peak memory traced by tracemalloc while sorting.
+
+Example:
+
+    python -m benchmarks.bench_sort_layers --sizes 1000 10000 100000
+"""
+import argparse
+import time
+import tracemalloc
+
+from kedro_static_viz.vendored import _sort_layers
+
+from .synthetic import chain_graph, fan_out_graph
+
+SHAPES = {"chain": chain_graph, "fan-out": fan_out_graph}
+
+
+def main() -> None:
+    "runs the benchmark and prints one row per shape and size"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--layers", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'shape':<10}{'nodes':>8}{'time (s)':>10}{'peak (MiB)':>12}  layers")
+    for shape, make_graph in SHAPES.items():
+        for size in args.sizes:
+            nodes, dependencies = make_graph(size, n_layers=args.layers)
+            tracemalloc.start()
+            start = time.perf_counter()
+            layers = _sort_layers(nodes, dependencies)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{shape:<10}{size:>8}{elapsed:>10.3f}{peak / 2 ** 20:>12.2f}"
+                f"  {len(layers)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+benchmark every stage of a build across synthetic project shapes
+
+Generates a synthetic project of every shape in `synthetic.SHAPES` and times the
+stages of a build separately: formatting the pipelines, sorting the layers,
+writing pipeline.json, copying the site template and an end to end
+`static_viz(load_file=...)`.  Every stage reports its best time over
+`--repeat` runs.  Results are written as JSON, and `compare` flags the stages
+that got slower than a baseline by more than `--threshold`, so two commits can
+be compared with
+
+    git checkout main && python -m benchmarks.suite run --output main.json
+    git checkout - && python -m benchmarks.suite run --output branch.json
+    python -m benchmarks.suite compare main.json branch.json --threshold 0.2
+
+`compare` exits 1 when a stage regressed.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from kedro_static_viz import __version__
+from kedro_static_viz.builder import StaticVizBuilder
+from kedro_static_viz.core import copy_site, static_viz
+from kedro_static_viz.serialize import dump
+
+from .synthetic import SHAPES
+
+STAGES = ("format", "sort_layers", "serialize", "copy_site", "end_to_end")
+# results format, bumped when the keys change
+SCHEMA = 1
+# slower stages under this many seconds are timer noise, not regressions
+NOISE_SECONDS = 0.005
+
+Results = Dict[str, Dict[str, float]]
+
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    "best wall time of func over repeat calls"
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _commit() -> str:
+    "the checked out commit, empty outside a git checkout"
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    "silences what static_viz prints"
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def bench_shape(shape: str, size: int, repeat: int, seed: int = 0) -> Dict[str, float]:
+    """
+    times the stages of building a synthetic project
+
+    Arguments:
+        shape (str): one of `synthetic.SHAPES`
+        size (int): approximate number of edges of the project
+        repeat (int): runs of every stage, the best is reported
+        seed (int): random seed of the project
+
+    Returns (dict): best seconds by stage
+    """
+    pipelines, catalog = SHAPES[shape](size, seed=seed)
+    times: Dict[str, float] = {}
+
+    def format_pipelines() -> StaticVizBuilder:
+        builder = StaticVizBuilder(catalog, pipelines)
+        builder.format_pipelines()
+        return builder
+
+    times["format"] = _best(format_pipelines, repeat)
+    builder = format_pipelines()
+    times["sort_layers"] = _best(builder.graph.sort_layers, repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        load_file = Path(tmp) / "pipeline.json"
+
+        def serialize() -> None:
+            with open(load_file, "wb") as f:
+                dump(builder.data, f)
+
+        times["serialize"] = _best(serialize, repeat)
+        builder.close()
+
+        # a fresh directory every run, the template is copied from scratch
+        runs = iter(range(repeat))
+        times["copy_site"] = _best(
+            lambda: copy_site(Path(tmp) / f"copy_{next(runs)}", sync=False), repeat
+        )
+        # the same directory every run, later runs only sync the template like a
+        # rebuild does
+        with _quiet():
+            times["end_to_end"] = _best(
+                lambda: static_viz(load_file=load_file, directory=Path(tmp) / "site"),
+                repeat,
+            )
+    return times
+
+
+def run(shapes: List[str], size: int, repeat: int, seed: int = 0) -> Dict:
+    """
+    benchmarks shapes, printing a row per shape as it finishes
+
+    Returns (dict): the results document written by `run --output`
+    """
+    results: Results = {}
+    print(f"{'shape':<10}" + "".join(f"{stage:>13}" for stage in STAGES))
+    for shape in shapes:
+        results[shape] = bench_shape(shape, size, repeat, seed)
+        print(
+            f"{shape:<10}"
+            + "".join(f"{results[shape][stage]:>13.4f}" for stage in STAGES)
+        )
+    return {
+        "schema": SCHEMA,
+        "version": __version__,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": size,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Results, results: Results, threshold: float
+) -> List[Tuple[str, str, float, float]]:
+    """
+    prints the change of every stage timed in both results
+
+    Arguments:
+        baseline (dict): seconds by stage by shape of the reference run
+        results (dict): seconds by stage by shape of the run to check
+        threshold (float): relative slowdown above which a stage regressed,
+            0.2 is 20% slower
+
+    Returns (list): shape, stage, baseline and new seconds of every regression
+    """
+    regressions: List[Tuple[str, str, float, float]] = []
+    print(f"{'shape':<10}{'stage':<13}{'baseline':>10}{'new':>10}{'change':>9}")
+    for shape, stages in results.items():
+        for stage, seconds in stages.items():
+            before = baseline.get(shape, {}).get(stage)
+            if before is None:
+                continue
+            change = seconds / before - 1 if before else 0.0
+            regressed = change > threshold and seconds - before > NOISE_SECONDS
+            if regressed:
+                regressions.append((shape, stage, before, seconds))
+            print(
+                f"{shape:<10}{stage:<13}{before:>10.4f}{seconds:>10.4f}"
+                f"{change:>+9.1%}{'  REGRESSION' if regressed else ''}"
+            )
+    return regressions
+
+
+def _load(path: Path) -> Results:
+    "the results of a file written by `run --output`"
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("schema") != SCHEMA:
+        raise SystemExit(f"{path} is not a results file of schema {SCHEMA}")
+    return document["results"]
+
+
+def main() -> None:
+    "runs or compares the benchmark, exits 1 on a regression"
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    run_parser = commands.add_parser("run", help="benchmark the checked out code")
+    run_parser.add_argument(
+        "--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES)
+    )
+    run_parser.add_argument("--size", type=int, default=10_000)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", type=Path)
+    run_parser.add_argument("--baseline", type=Path)
+    run_parser.add_argument("--threshold", type=float, default=0.2)
+    compare_parser = commands.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("results", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        baseline, results = _load(args.baseline), _load(args.results)
+    else:
+        if args.command is None:
+            args = run_parser.parse_args([])
+        document = run(args.shapes, args.size, args.repeat, args.seed)
+        if args.output is not None:
+            with open(args.output, "w") as f:
+                json.dump(document, f, indent=2)
+        if args.baseline is None:
+            return
+        print()
+        baseline, results = _load(args.baseline), document["results"]
+
+    regressions = compare(baseline, results, args.threshold)
+    for shape, stage, before, seconds in regressions:
+        print(
+            f"{shape} {stage} took {seconds:.4f}s, {before:.4f}s before",
+            file=sys.stderr,
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
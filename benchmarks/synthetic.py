@@ -0,0 +1,265 @@
+"""
+synthetic kedro pipelines and catalogs for benchmarks
+
+Every generator is deterministic for a given seed so timings are comparable
+between runs and commits.
+"""
+import random
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline, node
+
+
+def _passthrough(*args):  # type: ignore
+    "node function accepting any number of inputs"
+    return args[0] if args else None
+
+
+def shared_pipelines(
+    n_edges: int,
+    fan_in: int = 3,
+    n_modular: int = 10,
+    seed: int = 0,
+    n_params: int = 0,
+) -> Tuple[Dict[str, Pipeline], DataCatalog]:
+    """
+    many overlapping modular pipelines that share their nodes
+
+    Every node reads `fan_in` earlier datasets and writes one, so a node
+    contributes `fan_in + 1` edges. Modular pipeline `k` covers an overlapping
+    window of the nodes and `__default__` covers all of them, which is the shape
+    that produces repeated edges during formatting.
+
+    Arguments:
+        n_edges (int): approximate number of distinct edges in the graph
+        fan_in (int): inputs per node
+        n_modular (int): number of modular pipelines besides `__default__`
+        seed (int): random seed
+        n_params (int): number of `params:<x>` namespaces, every node also reads
+            one of them and every tenth node reads `parameters`
+
+    Returns (tuple): pipelines by name and a catalog with layers
+    """
+    rng = random.Random(seed)
+    n_nodes = max(n_edges // (fan_in + 1), 1)
+    nodes = []
+    for i in range(n_nodes):
+        inputs = sorted(
+            {f"ds_{rng.randrange(i)}" if i else f"raw_{j}" for j in range(fan_in)}
+        )
+        if n_params:
+            inputs.append(f"params:p_{i % n_params}")
+            if i % 10 == 0:
+                inputs.append("parameters")
+        nodes.append(
+            node(_passthrough, inputs, f"ds_{i}", name=f"node_{i}", tags=[f"t{i % 7}"])
+        )
+
+    step = max(n_nodes // max(n_modular, 1), 1)
+    pipelines = {"__default__": Pipeline(nodes)}
+    for k in range(n_modular):
+        window = nodes[k * step : k * step + 2 * step]
+        if window:
+            pipelines[f"modular_{k}"] = Pipeline(window)
+
+    layers = {"raw": {f"raw_{j}" for j in range(fan_in)}}
+    catalog = DataCatalog(layers=layers)
+    if n_params:
+        parameters = {
+            f"p_{k}": {f"option_{j}": list(range(j, j + 10)) for j in range(50)}
+            for k in range(n_params)
+        }
+        feed = {f"params:{key}": value for key, value in parameters.items()}
+        feed["parameters"] = parameters
+        catalog.add_feed_dict(feed)
+    return pipelines, catalog
+
+
+def _project(
+    inputs: Callable[[int], List[str]],
+    n_nodes: int,
+    tags: Callable[[int], List[str]] = lambda i: [f"t{i % 7}"],
+    n_modular: int = 10,
+    layers: Dict[str, Set[str]] = None,
+) -> Tuple[Dict[str, Pipeline], DataCatalog]:
+    """
+    pipelines of n_nodes nodes, node `i` reads `inputs(i)` and writes `ds_<i>`,
+    with `n_modular` overlapping windows of them as modular pipelines
+    """
+    nodes = [
+        node(_passthrough, inputs(i), f"ds_{i}", name=f"node_{i}", tags=tags(i))
+        for i in range(n_nodes)
+    ]
+    step = max(n_nodes // max(n_modular, 1), 1)
+    pipelines = {"__default__": Pipeline(nodes)}
+    for k in range(n_modular):
+        window = nodes[k * step : k * step + 2 * step]
+        if window:
+            pipelines[f"modular_{k}"] = Pipeline(window)
+    return pipelines, DataCatalog(layers=layers or {"raw": {"raw_0"}})
+
+
+def _earlier(rng: random.Random, fan_in: int) -> Callable[[int], List[str]]:
+    "inputs of fan_in random earlier datasets, the first node reads raw_0"
+    return lambda i: (
+        sorted({f"ds_{rng.randrange(i)}" for _ in range(fan_in)}) if i else ["raw_0"]
+    )
+
+
+def fan_out_project(n_edges: int, fan_out: int = 50, seed: int = 0) -> Tuple:
+    "a wide tree, every dataset feeds `fan_out` nodes"
+    n_nodes = max(n_edges // 2, 1)
+    return _project(
+        lambda i: [f"ds_{(i - 1) // fan_out}"] if i else ["raw_0"], n_nodes
+    )
+
+
+def chain_project(n_edges: int, depth: int = 250, seed: int = 0) -> Tuple:
+    """
+    parallel chains of `depth` nodes, kedro's own Pipeline takes quadratic time
+    in the depth of a pipeline so longer chains only measure kedro
+    """
+    n_nodes = max(n_edges // 2, 1)
+    return _project(
+        lambda i: [f"ds_{i - 1}"] if i % depth else [f"raw_{i // depth}"], n_nodes
+    )
+
+
+def layers_project(n_edges: int, n_layers: int = 200, seed: int = 0) -> Tuple:
+    "every dataset in one of `n_layers` layers, ordered along the graph"
+    n_nodes = max(n_edges // 4, 1)
+    layers: Dict[str, Set[str]] = {}
+    for i in range(n_nodes):
+        layers.setdefault(f"layer_{i * n_layers // n_nodes:04d}", set()).add(
+            f"ds_{i}"
+        )
+    layers.setdefault("layer_0000", set()).add("raw_0")
+    return _project(_earlier(random.Random(seed), 3), n_nodes, layers=layers)
+
+
+def tags_project(n_edges: int, n_tags: int = 1000, seed: int = 0) -> Tuple:
+    "every node carries 5 of `n_tags` tags"
+    rng = random.Random(seed)
+    return _project(
+        _earlier(rng, 3),
+        max(n_edges // 4, 1),
+        tags=lambda i: [f"tag_{rng.randrange(n_tags)}" for _ in range(5)],
+    )
+
+
+def modular_project(n_edges: int, n_modular: int = 500, seed: int = 0) -> Tuple:
+    "`n_modular` small overlapping modular pipelines"
+    return _project(
+        _earlier(random.Random(seed), 3), max(n_edges // 4, 1), n_modular=n_modular
+    )
+
+
+def params_project(n_edges: int, n_params: int = 50, seed: int = 0) -> Tuple:
+    "every node reads one of `n_params` large parameter namespaces"
+    return shared_pipelines(n_edges, seed=seed, n_params=n_params)
+
+
+# project shapes by name, each called with the approximate number of edges
+SHAPES: Dict[str, Callable[..., Tuple[Dict[str, Pipeline], DataCatalog]]] = {
+    "fan_out": fan_out_project,
+    "chain": chain_project,
+    "layers": layers_project,
+    "tags": tags_project,
+    "modular": modular_project,
+    "params": params_project,
+}
+
+
+def chain_graph(
+    n_nodes: int, n_layers: int = 10
+) -> Tuple[Dict[str, dict], Dict[str, set]]:
+    """
+    a single chain of formatted nodes, the deepest possible pipeline
+
+    Returns (tuple): `nodes` and `dependencies` as passed to `_sort_layers`
+    """
+    nodes = {
+        f"n{i}": {"id": f"n{i}", "layer": f"layer_{i * n_layers // n_nodes:03d}"}
+        for i in range(n_nodes)
+    }
+    dependencies = {f"n{i}": {f"n{i + 1}"} for i in range(n_nodes - 1)}
+    return nodes, dependencies
+
+
+def fan_out_graph(
+    n_nodes: int, fan_out: int = 50, n_layers: int = 10, seed: int = 0
+) -> Tuple[Dict[str, dict], Dict[str, set]]:
+    """
+    a shallow tree where every node feeds `fan_out` children, half of the nodes
+    carry a layer
+
+    Returns (tuple): `nodes` and `dependencies` as passed to `_sort_layers`
+    """
+    rng = random.Random(seed)
+    nodes = {}
+    for i in range(n_nodes):
+        node_data: Dict[str, Any] = {"id": f"n{i}"}
+        if rng.random() < 0.5:
+            depth = 0 if i == 0 else len(str(i))
+            node_data["layer"] = f"layer_{min(depth, n_layers - 1):03d}"
+        nodes[f"n{i}"] = node_data
+    dependencies = {
+        f"n{i}": {f"n{c}" for c in range(i * fan_out + 1, (i + 1) * fan_out + 1)}
+        for i in range(n_nodes)
+        if i * fan_out + 1 < n_nodes
+    }
+    for parent, children in dependencies.items():
+        dependencies[parent] = {c for c in children if c in nodes}
+    return nodes, dependencies
+
+
+def formatted_data(n_nodes: int, fan_in: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """
+    formatted pipeline data shaped like the output of
+    `StaticVizBuilder.format_pipelines`, built directly without kedro for
+    serialization benchmarks
+
+    Returns (dict): nodes, edges, tags, layers, pipelines and selected_pipeline
+    """
+    rng = random.Random(seed)
+    nodes = []
+    edges = []
+    for i in range(n_nodes):
+        task_id = f"{i:08x}"
+        nodes.append(
+            {
+                "type": "task",
+                "id": task_id,
+                "name": f"Node {i}",
+                "full_name": f"node_{i}",
+                "tags": [f"t{i % 7}"],
+                "pipelines": ["__default__", f"modular_{i % 10}"],
+            }
+        )
+        for _ in range(fan_in):
+            source = f"d{rng.randrange(n_nodes):07x}"
+            edges.append({"source": source, "target": task_id})
+        edges.append({"source": task_id, "target": f"d{i:07x}"})
+        nodes.append(
+            {
+                "type": "data",
+                "id": f"d{i:07x}",
+                "name": f"Ds {i}",
+                "full_name": f"ds_{i}",
+                "tags": [f"t{i % 7}"],
+                "layer": None,
+                "pipelines": ["__default__"],
+            }
+        )
+    pipelines = [{"id": "__default__", "name": "Default"}] + [
+        {"id": f"modular_{k}", "name": f"Modular {k}"} for k in range(10)
+    ]
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "tags": [{"id": f"t{k}", "name": f"T{k}"} for k in range(7)],
+        "layers": [],
+        "pipelines": pipelines,
+        "selected_pipeline": "__default__",
+    }
@@ -1,22 +1,95 @@
 import React from "react"
 import KedroViz from '@quantumblack/kedro-viz';
 
+const fetchJson = url =>
+  fetch(url).then(response => {
+    if (!response.ok) {
+      throw new Error(`${url} responded ${response.status}`)
+    }
+    return response.json()
+  })
+
+const selectedFromUrl = () =>
+  new URLSearchParams(window.location.search).get('pipeline')
+
+// data is fetched relative to the page, so every route of a multi-project
+// portal reads its own pipeline.json and api shards
+const baseUrl = () => window.location.pathname.replace(/[^/]*$/, '')
+
+// kedro-viz fetches its api relative to the page and without an extension,
+// `./api/main`, `./api/pipelines/<id>` and `./api/nodes/<id>`. The static site
+// has them as json files, main being the shard of the pipeline shown first,
+// and node metadata only when it was built with --node-metadata
+const API_REQUEST = /^\.\/api\/(?:(main)|(pipelines|nodes)\/(.+))$/
+let apiServed = false
+const serveApi = (base, mainPipeline) => {
+  if (apiServed) {
+    return
+  }
+  apiServed = true
+  const fetch = window.fetch.bind(window)
+  window.fetch = (url, options) => {
+    const match = typeof url === 'string' && url.match(API_REQUEST)
+    if (!match) {
+      return fetch(url, options)
+    }
+    const [, main, kind, id] = match
+    const path = main ? `pipelines/${mainPipeline}` : `${kind}/${id}`
+    return fetch(`${base}api/${path.replace(/[^/]+$/, encodeURIComponent)}.json`, options)
+      .then(response =>
+        response.ok || kind !== 'nodes'
+          ? response
+          // without node metadata the panel shows what the pipeline data has
+          : new Response('{}', { headers: { 'Content-Type': 'application/json' } })
+      )
+  }
+}
+
 class StaticKedroViz extends React.Component {
   constructor(props) {
     super(props)
     this.state = {
-      pipelineData: undefined
+      pipelineData: undefined,
+      portal: undefined,
     }
     this.componentDidMount = () => {
-      fetch('/pipeline.json')
-        .then(response => response.json())
-        .then(data => this.setState({ pipelineData: data }))
+      // sharded sites ship a small index and one file per pipeline, that
+      // kedro-viz loads itself along with the metadata of a clicked node,
+      // sites built with --no-shard only have the full pipeline.json
+      // and the root of a portal built with build-many only has portal.json
+      const base = baseUrl()
+      fetchJson(`${base}api/main.json`)
+        .then(index => {
+          serveApi(base, selectedFromUrl() || index.selected_pipeline)
+          this.setState({ pipelineData: 'json' })
+        })
+        .catch(() =>
+          fetchJson(`${base}pipeline.json`).then(data =>
+            this.setState({ pipelineData: data })
+          )
+        )
+        .catch(() =>
+          fetchJson(`${base}portal.json`).then(portal => this.setState({ portal }))
+        )
     }
   }
   render() {
+    const { pipelineData, portal } = this.state
+    if (portal !== undefined) {
+      return (
+        <ul className="portal">
+          {portal.projects.map(p => (
+            <li key={p.name}>
+              {p.ok ? <a href={`.${p.route}`}>{p.name}</a> : `${p.name} (failed)`}
+              {p.env && ` [${p.env}]`}
+            </li>
+          ))}
+        </ul>
+      )
+    }
     return (
         <div className="pipeline" style={{ minHeight: '80vh' }}>
-          {this.state.pipelineData === undefined ? 'loading' : <KedroViz style={{ height: '80vh' }} data={this.state.pipelineData} />}
+          {pipelineData === undefined ? 'loading' : <KedroViz style={{ height: '80vh' }} data={pipelineData} />}
         </div>
     )
   }
@@ -1,7 +1,22 @@
 "kedro-static-viz"
+import sys
+
+from .cli import cli
+
 __version__ = "0.4.4"
 
 __all__ = ["cli", "static_viz", "static_viz_hook"]
 
-from .cli import cli
-from .core import static_viz
+if sys.version_info < (3, 7):  # pragma: no cover no module __getattr__
+    from .core import static_viz
+
+
+def __getattr__(name: str):  # type: ignore
+    "imports static_viz on first use, keeping `import kedro_static_viz` fast"
+    if name == "static_viz":
+        from .core import static_viz as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # importing the submodule bound its module to the name, rebind the object
+    globals()[name] = value
+    return value
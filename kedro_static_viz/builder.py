@@ -0,0 +1,359 @@
+"""
+state of a single kedro-static-viz build
+
+The vendored kedro-viz module kept the formatted data, the catalog, the graph and
+the node and dataset objects backing node metadata in module globals, so two
+builds could not run in one process and the objects of the last build stayed
+alive until the next one.  A StaticVizBuilder holds all of it for one build:
+builds running concurrently in threads each use their own builder, and closing
+a builder drops what it holds.
+
+Example:
+
+    >>> with StaticVizBuilder.from_project(env="prod") as builder:
+    ...     builder.format_pipelines(defer_parameters=True)
+    ...     builder.layout_pipelines(cache=cache_dir() / "layouts")
+    ...     builder.save("public/pipeline.json")
+    ...     builder.write_pipeline_shards("public")
+    ...     builder.write_node_metadata("public")
+    ...     builder.write_views("public", ["namespace", "layer"])
+"""
+import inspect
+import time
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .export import write_node_metadata, write_pipeline_shards
+from .graph import Graph
+from .layout import cached_layout
+from .params import ParameterCache
+from .profile import Profiler, stage
+from .serialize import dump
+from .vendored import (
+    _DEFAULT_KEY,
+    _construct_layer_mapping,
+    _get_dataset_data_params,
+    _get_dataset_metadata,
+    _load_from_file,
+    _load_project,
+    _pipeline_data,
+    _pretty_name,
+    format_pipeline_data,
+)
+from .views import VIEWS, write_views
+
+
+def _read_lines(filename: str) -> List[str]:
+    "lines of a source file"
+    with open(filename, encoding="utf-8") as f:
+        return f.readlines()
+
+
+def _relative_path(filename: str, parent: Path) -> str:
+    "a source file relative to the project's parent directory"
+    return str(Path(filename).expanduser().resolve().relative_to(parent))
+
+
+def _get_source(func: Callable, source_lines: Callable[[str], List[str]]) -> str:
+    """
+    inspect.getsource for plain functions, served from source_lines.  Anything
+    without its own code object, e.g. partials, goes through inspect.
+    """
+    func = inspect.unwrap(func)
+    filename = inspect.getsourcefile(func) if inspect.isfunction(func) else None
+    if filename is None:
+        return inspect.getsource(func)
+    lines = source_lines(filename)
+    return "".join(inspect.getblock(lines[func.__code__.co_firstlineno - 1 :]))
+
+
+class StaticVizBuilder:
+    """
+    formats the pipelines of one project and serves the kedro-viz api from the
+    result
+
+    A builder is used by one build at a time; builds in different threads use
+    different builders.  Close it, or use it as a context manager, to release the
+    catalog, the graph and the node objects once the site is written.
+
+    Arguments:
+        catalog (DataCatalog): catalog of the project, None for data loaded from
+            a file
+        pipelines (dict): pipelines to format, by key
+        profiler (Profiler): records the stages of the build, default is None
+    """
+
+    def __init__(
+        self,
+        catalog: Any = None,
+        pipelines: Dict[str, Any] = None,
+        profiler: Profiler = None,
+    ) -> None:
+        "initializes a builder that has not formatted anything yet"
+        self.catalog = catalog
+        self.profiler = profiler
+        self.pipelines: Dict[str, Any] = pipelines or {}
+        self.data: Optional[Dict] = None
+        self.graph: Optional[Graph] = None
+        # layout of every pipeline by id, once laid out
+        self.layouts: Dict[str, Dict] = {}
+        # node id -> type and the node, dataset or parameters backing its metadata
+        self.json_nodes: Dict[str, Dict] = {}
+        self.parameters = ParameterCache(
+            catalog, partial(_get_dataset_data_params, catalog)
+        )
+        # source files are read and resolved once per build
+        self.source_lines = lru_cache(maxsize=None)(_read_lines)
+        self.relative_path = lru_cache(maxsize=None)(_relative_path)
+
+    @classmethod
+    def from_project(
+        cls,
+        project_path: Union[str, Path, None] = None,
+        env: str = None,
+        pipeline_name: str = None,
+        profiler: Profiler = None,
+    ) -> "StaticVizBuilder":
+        """
+        loads the catalog and pipelines of a kedro project
+
+        Arguments:
+            project_path (str, Path): root of the project, defaults to the cwd
+            env (str): Kedro configuration environment. Default is None
+            pipeline_name (str): only load this pipeline. Default is None, all
+                registered pipelines
+            profiler (Profiler): records the stages of the build, default is None
+
+        Returns (StaticVizBuilder): a builder of the project's pipelines
+        """
+        with stage(profiler, "load_project"):
+            catalog, pipelines = _load_project(
+                Path(project_path or Path.cwd()), env, pipeline_name, profiler
+            )
+        return cls(catalog, pipelines, profiler)
+
+    @classmethod
+    def from_file(
+        cls, load_file: Union[str, Path], profiler: Profiler = None
+    ) -> "StaticVizBuilder":
+        """
+        loads the data of a saved pipeline JSON file, there is no node metadata
+        to serve for it
+
+        Arguments:
+            load_file (str, Path): Path to load the pipeline JSON file
+            profiler (Profiler): records the stages of the build, default is None
+
+        Returns (StaticVizBuilder): a builder holding the loaded data
+        """
+        builder = cls(profiler=profiler)
+        with stage(profiler, "load_file"):
+            builder.data = _load_from_file(str(load_file))
+        return builder
+
+    def __enter__(self) -> "StaticVizBuilder":
+        "the builder itself, closed when the with block ends"
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        "closes the builder"
+        self.close()
+
+    def close(self) -> None:
+        "drops the data, the graph, the catalog and the node metadata objects"
+        self.catalog = None
+        self.pipelines = {}
+        self.data = None
+        self.graph = None
+        self.layouts = {}
+        self.json_nodes = {}
+        self.parameters = ParameterCache(None, lambda namespace: None)
+        self.source_lines.cache_clear()
+        self.relative_path.cache_clear()
+
+    def format_pipelines(
+        self,
+        timings: Dict[str, float] = None,
+        defer_parameters: bool = False,
+    ) -> Dict[str, list]:
+        """
+        formats the pipelines and catalog data for kedro-viz
+
+        Arguments:
+            timings (dict): filled with the seconds spent formatting each
+                pipeline, by pipeline key
+            defer_parameters (bool): Load the parameters of task nodes when their
+                metadata is requested instead of while formatting.
+
+        Returns (dict): pipelines, nodes, edges, tags and layers, as written to
+            pipeline.json
+        """
+        with stage(self.profiler, "format"):
+            return self._format_pipelines(timings, defer_parameters)
+
+    def _format_pipelines(
+        self,
+        timings: Optional[Dict[str, float]],
+        defer_parameters: bool,
+    ) -> Dict[str, list]:
+        "see `format_pipelines`"
+        pipelines = self.pipelines
+        pipelines_list = [
+            {"id": pipeline_key, "name": _pretty_name(pipeline_key)}
+            for pipeline_key in pipelines
+        ]
+        # interned, integer indexed nodes and edges of every pipeline
+        graph = Graph(
+            list(pipelines), _construct_layer_mapping(self.catalog), _pretty_name
+        )
+        timings = {} if timings is None else timings
+
+        # formatting is pure python, threads only contend for the GIL and would
+        # inflate the timings of the pipelines they interleave with
+        with stage(self.profiler, "graph"):
+            for pipeline_key, pipeline in pipelines.items():
+                start = time.perf_counter()
+                format_pipeline_data(
+                    pipeline_key,
+                    pipeline,
+                    graph,
+                    self.json_nodes,
+                    self.parameters,
+                    defer_parameters,
+                )
+                timings[pipeline_key] = time.perf_counter() - start
+
+        sorted_tags = [
+            {"id": tag, "name": _pretty_name(tag)} for tag in sorted(graph.tags)
+        ]
+        with stage(self.profiler, "sort_layers"):
+            sorted_layers = graph.sort_layers()
+        with stage(self.profiler, "payload"):
+            graph.seal()
+            nodes, edges = graph.node_dicts(), graph.edge_dicts()
+
+        default_pipeline = {"id": _DEFAULT_KEY, "name": _pretty_name(_DEFAULT_KEY)}
+        selected_pipeline = (
+            default_pipeline["id"]
+            if default_pipeline in pipelines_list
+            else pipelines_list[0]["id"]
+        )
+
+        self.graph = graph
+        self.data = {
+            "nodes": nodes,
+            "edges": edges,
+            "tags": sorted_tags,
+            "layers": sorted_layers,
+            "pipelines": pipelines_list,
+            "selected_pipeline": selected_pipeline,
+        }
+        return self.data
+
+    def save(self, save_file: Union[str, Path], compact: bool = False) -> None:
+        """
+        writes the formatted data to a pipeline JSON file
+
+        Arguments:
+            save_file (str, Path): Path to save the pipeline JSON file
+            compact (bool): Write it without indentation. Default is False
+        """
+        with stage(self.profiler, "serialize"), open(save_file, "wb") as f:
+            dump(self.data, f, compact=compact)
+
+    def pipeline_data(self, pipeline_id: str) -> Optional[Dict]:
+        """
+        the `/api/pipelines/<pipeline_id>` payload, None for an unknown pipeline
+        """
+        data = _pipeline_data(self.data, pipeline_id, self.graph)
+        if data is not None and pipeline_id in self.layouts:
+            data["layout"] = self.layouts[pipeline_id]
+        return data
+
+    def layout_pipelines(self, cache: Union[str, Path, None] = None) -> Dict[str, Dict]:
+        """
+        lays out every pipeline, see `layout.cached_layout`.  The layout of the
+        selected pipeline is added to the data under 'layout', and every layout
+        to its pipeline's shard and api payload
+
+        Arguments:
+            cache (str, Path): directory of the cached layouts. Default is None,
+                no cache
+
+        Returns (dict): layout of every pipeline by id
+        """
+        with stage(self.profiler, "layout"):
+            layers = self.data["layers"]
+            for pipeline in self.data["pipelines"]:
+                sliced = _pipeline_data(self.data, pipeline["id"], self.graph)
+                self.layouts[pipeline["id"]] = cached_layout(
+                    sliced["nodes"], sliced["edges"], layers, cache
+                )
+            self.data["layout"] = self.layouts[self.data["selected_pipeline"]]
+        return self.layouts
+
+    def node_metadata(self, node_id: str) -> Dict:
+        """
+        the `/api/nodes/<node_id>` payload of a task, dataset or parameters node,
+        raises KeyError for an unknown node
+        """
+        node = self.json_nodes[node_id]
+        if node["type"] == "task":
+            return self._task_metadata(node)
+        if node["type"] == "data":
+            return _get_dataset_metadata(node)
+
+        if node["obj"] is not None:
+            parameter_values = self.parameters.load(node["namespace"])
+        else:  # pragma: no cover
+            parameter_values = {}
+        if "parameter_name" in node:
+            # In case of 'params:' prefix
+            return {"parameters": {node["parameter_name"]: parameter_values}}
+        # In case of 'parameters'
+        return {"parameters": parameter_values}
+
+    def _task_metadata(self, node: Dict) -> Dict:
+        """
+        code, filepath, docstring and parameters of a task node.  The filepath is
+        relative to the parent of the project, e.g. `project_root/nodes.py`
+        """
+        func = node["obj"]._func
+        task_metadata = {
+            "code": _get_source(func, self.source_lines),
+            "filepath": self.relative_path(inspect.getfile(func), Path.cwd().parent),
+        }
+
+        docstring = inspect.getdoc(func)
+        if docstring:
+            task_metadata["docstring"] = docstring
+
+        if "parameters" in node:
+            task_metadata["parameters"] = node["parameters"]
+        elif "parameter_namespaces" in node:
+            task_metadata["parameters"] = self.parameters.node_parameters(
+                node["parameter_namespaces"]
+            )
+        return task_metadata
+
+    def write_pipeline_shards(self, directory: Union[str, Path]) -> List[Path]:
+        "writes the api index and pipeline shards, see `export.write_pipeline_shards`"
+        with stage(self.profiler, "shards"):
+            return write_pipeline_shards(
+                self.data, directory, graph=self.graph, layouts=self.layouts or None
+            )
+
+    def write_node_metadata(
+        self, directory: Union[str, Path], workers: int = None
+    ) -> List[Path]:
+        "writes the metadata of every node, see `export.write_node_metadata`"
+        with stage(self.profiler, "node_metadata"):
+            return write_node_metadata(self, directory, workers=workers)
+
+    def write_views(
+        self, directory: Union[str, Path], views: Sequence[str] = VIEWS
+    ) -> List[Path]:
+        "writes the collapsed views of the graph, see `views.write_views`"
+        with stage(self.profiler, "views"):
+            return write_views(self.data, self.graph, directory, views)
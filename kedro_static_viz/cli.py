@@ -1,10 +1,9 @@
 "module to provide command line interface for kedro-static-viz"
 from pathlib import Path
+from typing import Tuple
 
 import click
 
-from .core import static_viz as _static_viz
-
 __version__ = "0.4.4"
 
 
@@ -31,7 +30,8 @@ def cli() -> None:
     "--load-file",
     default=None,
     type=click.Path(exists=True, dir_okay=False),
-    help="Path to load the pipeline JSON file",
+    help="Path to load the pipeline JSON file, validated while it is written "
+    "to the site.",
 )
 @click.option(
     "--pipeline",
@@ -62,6 +62,95 @@ def cli() -> None:
     default=True,
     help="Whether or not to serve the site after creating. Defaults to True.",
 )
+@click.option(
+    "--sync/--no-sync",
+    default=True,
+    help="Only copy site files that changed since the last build. "
+    "Defaults to True.",
+)
+@click.option(
+    "--link",
+    default="copy",
+    type=click.Choice(["copy", "hardlink", "reflink"]),
+    help="How site template files are materialized when syncing. Defaults to copy.",
+)
+@click.option(
+    "--shard/--no-shard",
+    default=True,
+    help="Write one json file per pipeline so the site only loads the pipeline "
+    "it shows. Defaults to True.",
+)
+@click.option(
+    "--node-metadata/--no-node-metadata",
+    default=False,
+    help="Write the code, docstring, filepath and parameters of every node. "
+    "Defaults to False.",
+)
+@click.option(
+    "--metadata-workers",
+    default=None,
+    type=int,
+    help="Threads used to extract node metadata.",
+)
+@click.option(
+    "--compress/--no-compress",
+    default=False,
+    help="Write precompressed .gz, and .br when brotli is installed, siblings of "
+    "the json, js and css files. Defaults to False.",
+)
+@click.option(
+    "--compress-level",
+    default=9,
+    type=click.IntRange(1, 11),
+    help="Compression level from 1 to 11, 10 and 11 only raise the brotli "
+    "quality, at a much higher cost. Defaults to 9.",
+)
+@click.option(
+    "--compact/--no-compact",
+    default=False,
+    help="Write pipeline.json without indentation. Defaults to False.",
+)
+@click.option(
+    "--report/--no-report",
+    default=False,
+    help="Print the time spent formatting each pipeline, slowest first. "
+    "Defaults to False.",
+)
+@click.option(
+    "--watch/--no-watch",
+    default=False,
+    help="Rebuild the pipeline data when src/ or conf/ change and reload the "
+    "served page. Defaults to False.",
+)
+@click.option(
+    "--profile",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Print the wall time, CPU time and peak memory of every build stage and "
+    "write them to this path as a Chrome trace-event file.",
+)
+@click.option(
+    "--content-hash/--no-content-hash",
+    default=False,
+    help="Write data files under content hashed names and a deploy manifest "
+    "listing the files changed since the last build. Defaults to False.",
+)
+@click.option(
+    "--view",
+    "views",
+    multiple=True,
+    type=click.Choice(["namespace", "modular_pipeline", "layer"]),
+    help="Write an overview of every pipeline with its nodes grouped by this "
+    "view, and the detail of every group. Not opened by the bundled viewer yet. "
+    "Repeat for several views.",
+)
+@click.option(
+    "--layout/--no-layout",
+    default=False,
+    help="Lay out every pipeline at build time, cached by its structure, and "
+    "embed node positions and edge routes in the api data. The bundled viewer "
+    "still lays out itself. Defaults to False.",
+)
 def static_viz(
     port: int,
     browser: bool,
@@ -71,20 +160,130 @@ def static_viz(
     directory: Path,
     version: bool,
     serve: bool,
+    sync: bool,
+    link: str,
+    shard: bool,
+    node_metadata: bool,
+    metadata_workers: int,
+    compress: bool,
+    compress_level: int,
+    compact: bool,
+    report: bool,
+    watch: bool,
+    profile: str,
+    content_hash: bool,
+    views: Tuple[str, ...],
+    layout: bool,
 ) -> None:
     "main kedro-static-viz command"
     if version:
         click.echo(__version__)
         return
-    _static_viz(
-        port=port,
-        browser=browser,
-        load_file=load_file,
-        pipeline=pipeline,
-        env=env,
+    from .core import static_viz as _static_viz
+    from .loadfile import LoadFileError
+
+    try:
+        _static_viz(
+            port=port,
+            browser=browser,
+            load_file=load_file,
+            pipeline=pipeline,
+            env=env,
+            directory=directory,
+            serve=serve,
+            sync=sync,
+            link=link,
+            shard=shard,
+            node_metadata=node_metadata,
+            metadata_workers=metadata_workers,
+            compress=compress,
+            compress_level=compress_level,
+            compact=compact,
+            report=report,
+            watch=watch,
+            profile=profile,
+            content_hash=content_hash,
+            views=views,
+            layout=layout,
+        )
+    except LoadFileError as e:
+        raise click.ClickException(str(e)) from None
+
+
+@cli.command()
+@click.option(
+    "--all",
+    "all_versions",
+    default=False,
+    is_flag=True,
+    help="Also remove the cached site template of the installed version and the "
+    "cached layouts.",
+)
+def clean_cache(all_versions: bool) -> None:
+    "remove cached site templates of old kedro-static-viz versions"
+    from .core import clean_cache as _clean_cache
+
+    for path in _clean_cache(all_versions=all_versions):
+        click.echo(f"removed {path}")
+
+
+@cli.command()
+@click.argument("projects", nargs=-1, required=True)
+@click.option(
+    "--directory",
+    default="public",
+    type=click.Path(exists=False, file_okay=False),
+    help="Path to save the portal to",
+)
+@click.option(
+    "--pipeline",
+    type=str,
+    default=None,
+    help="Name of the modular pipeline to visualize in every project. "
+    "If not set, the default pipeline is visualized",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=int,
+    help="Number of worker processes. Defaults to the number of cpus.",
+)
+@click.option(
+    "--compact/--no-compact",
+    default=False,
+    help="Write pipeline.json without indentation. Defaults to False.",
+)
+def build_many(
+    projects: Tuple[str, ...],
+    directory: Path,
+    pipeline: str,
+    workers: int,
+    compact: bool,
+) -> None:
+    """
+    build a portal with one route per kedro project
+
+    PROJECTS are project paths, optionally suffixed with @ENV to pick the kedro
+    configuration environment, e.g. `../sales@prod`.
+    """
+    from .portal import build_many as _build_many
+    from .portal import parse_project
+
+    results = _build_many(
+        [parse_project(project) for project in projects],
         directory=directory,
-        serve=serve,
+        pipeline=pipeline,
+        workers=workers,
+        compact=compact,
     )
+    for result in results:
+        status = "ok" if result.error is None else "FAILED"
+        click.echo(f"{result.name:<30}{result.seconds:>8.2f}s  {status}")
+    failed = [result for result in results if result.error is not None]
+    for result in failed:
+        click.echo(f"\n{result.name} ({result.path}) failed:\n{result.error}", err=True)
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
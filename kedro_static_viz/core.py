@@ -6,35 +6,549 @@ Example:
     >>> from kedro_static_viz import static_viz
     >>> static_viz()
 """
-import http.server
+import gzip
+import hashlib
+import io
+import json
+import os
 import shutil
-import socketserver
+import sys
+import tarfile
+import tempfile
+import threading
+import time
 import webbrowser
 from functools import partial
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Dict, List, Sequence, Union
 
-from .vendored import _call_viz
+from . import __version__
+from .layout import LAYOUT_CACHE
+from .profile import Profiler, stage
+from .server import (
+    COMPRESS_SUFFIXES,
+    ENCODINGS,
+    ReloadNotifier,
+    _is_fresh,
+    run_static_server,
+)
 
+MANIFEST_NAME = ".kedro-static-viz-manifest.json"
+LINK_MODES = ("copy", "hardlink", "reflink")
 
-def copy_site(directory: Path) -> None:
+# ioctl request number for FICLONE on linux, clones a file's extents (btrfs, xfs)
+_FICLONE = 0x40049409
+
+
+def _file_hash(path: Path) -> str:
+    "sha1 of the contents of a file, read in chunks"
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(partial(f.read, 1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_tree(root: Path) -> Dict[str, str]:
+    "maps every file below root, as a posix relative path, to its content hash"
+    return {
+        path.relative_to(root).as_posix(): _file_hash(path)
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and path.name != MANIFEST_NAME
+    }
+
+
+def _source_hashes(source: Path) -> Dict[str, str]:
+    """
+    content hashes of a sync source, read from its manifest when it has one
+
+    The cached site template is immutable once extracted, so its hashes are
+    written once at extraction time instead of being recomputed every build.
+    """
+    files = _load_manifest(source)
+    if files:
+        return {rel: entry["hash"] for rel, entry in files.items()}
+    return _hash_tree(source)
+
+
+def _load_manifest(directory: Path) -> Dict[str, Dict]:
+    "reads the sync manifest of an output directory, empty if missing or corrupt"
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text())
+        return dict(manifest["files"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    "clones src into dest with copy-on-write, falls back to a plain copy"
+    try:
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dest, "wb") as fdest:
+            fcntl.ioctl(fdest.fileno(), _FICLONE, fsrc.fileno())
+        shutil.copystat(str(src), str(dest))
+    except (ImportError, OSError):
+        shutil.copy2(str(src), str(dest))
+
+
+def _place_file(src: Path, dest: Path, link: str) -> None:
+    """
+    puts src at dest using the requested link mode
+
+    json files are always copied, they are data files that get rewritten in place
+    by the build and must never share an inode with the template.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    if link == "copy" or src.suffix == ".json":
+        shutil.copy(str(src), str(dest))
+        return
+    if link == "hardlink":
+        try:
+            os.link(str(src), str(dest))
+        except OSError:
+            # cross device or filesystem without hardlinks
+            shutil.copy(str(src), str(dest))
+        return
+    _reflink(src, dest)
+
+
+def _stat_matches(dest: Path, entry: Dict) -> bool:
+    "True if dest still looks exactly as it did when it was last placed"
+    try:
+        stat = dest.stat()
+    except OSError:
+        return False
+    return stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get(
+        "mtime_ns"
+    )
+
+
+def sync_tree(source: Path, directory: Path, link: str = "copy") -> Dict[str, int]:
+    """
+    incrementally materializes source into directory
+
+    A manifest of content hashes is kept in the output directory.  Files that are
+    missing or changed are placed, files that the previous sync placed and that
+    are no longer part of source are removed, everything else is left untouched.
+
+    Arguments:
+        source (Path): directory to mirror
+        directory (Path): output directory
+        link (str): one of 'copy', 'hardlink' or 'reflink'
+
+    Returns (dict): counts of 'copied', 'skipped' and 'removed' files
+    """
+    if link not in LINK_MODES:
+        raise ValueError(f"link must be one of {LINK_MODES}, got {link!r}")
+    source = Path(source)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    previous = _load_manifest(directory)
+    files = {}
+    stats = {"copied": 0, "skipped": 0, "removed": 0}
+
+    for rel, digest in _source_hashes(source).items():
+        dest = directory / rel
+        entry = previous.get(rel, {})
+        if entry.get("hash") == digest and _stat_matches(dest, entry):
+            files[rel] = entry
+            stats["skipped"] += 1
+            continue
+        _place_file(source / rel, dest, link)
+        stat = dest.stat()
+        files[rel] = {
+            "hash": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        stats["copied"] += 1
+
+    for rel in previous.keys() - files.keys():
+        stale = directory / rel
+        if stale.is_file():
+            stale.unlink()
+            stats["removed"] += 1
+        # prune directories emptied by the removal, stopping at the output root
+        parent = stale.parent
+        while parent != directory and parent.is_dir() and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+
+    (directory / MANIFEST_NAME).write_text(
+        json.dumps({"version": 1, "files": files}, sort_keys=True)
+    )
+    return stats
+
+
+def record_edit(directory: Path, rel: str) -> None:
+    """
+    records a file placed by `sync_tree` that the build replaced with an edited
+    copy, so the next sync keeps the edit until the source file changes
+
+    Arguments:
+        directory (Path): output directory of the sync
+        rel (str): path of the file relative to directory
+    """
+    manifest = _load_manifest(directory)
+    if rel not in manifest:
+        return
+    stat = (directory / rel).stat()
+    manifest[rel] = dict(manifest[rel], size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    (directory / MANIFEST_NAME).write_text(
+        json.dumps({"version": 1, "files": manifest}, sort_keys=True)
+    )
+
+
+def cache_dir() -> Path:
+    """
+    root of the kedro-static-viz user cache
+
+    `KEDRO_STATIC_VIZ_CACHE` takes precedence, then `XDG_CACHE_HOME`, then the
+    platform default user cache directory.
+    """
+    if os.environ.get("KEDRO_STATIC_VIZ_CACHE"):
+        return Path(os.environ["KEDRO_STATIC_VIZ_CACHE"])
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "kedro-static-viz" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "kedro-static-viz"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return Path(xdg) if xdg else Path.home() / ".cache" / "kedro-static-viz"
+
+
+def _extract(tar_path: Path, destination: Path) -> None:
+    "extracts tar_path into destination, refusing members that escape it"
+    with tarfile.open(str(tar_path)) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(str(destination), filter="data")
+        else:  # pragma: no cover
+            tar.extractall(str(destination))
+
+
+def template_dir() -> Path:
     """
-    unzips the prebuilt gatsby site inside the install directory if needed
-    then copies it into the public directory
+    directory holding the prebuilt gatsby site for the installed version
+
+    public.tar.gz is extracted once per package version into the user cache.
+    Extraction happens in a private temporary directory that is renamed into
+    place, so concurrent builds never see a partially extracted template, and the
+    installed package directory is never written to.
+    """
+    root = cache_dir()
+    target = root / __version__
+    if target.is_dir():
+        return target
+
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=str(root)))
+    try:
+        _extract(Path(__file__).parent / "public.tar.gz", tmp)
+        extracted = tmp / "public"
+        (extracted / MANIFEST_NAME).write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "files": {
+                        rel: {"hash": digest}
+                        for rel, digest in _hash_tree(extracted).items()
+                    },
+                },
+                sort_keys=True,
+            )
+        )
+        try:
+            os.rename(str(extracted), str(target))
+        except OSError:
+            # another process finished extracting first, use its copy
+            if not target.is_dir():
+                raise
+    finally:
+        shutil.rmtree(str(tmp), ignore_errors=True)
+    return target
+
+
+def clean_cache(all_versions: bool = False, max_tmp_age: float = 3600) -> List[Path]:
+    """
+    removes cached site templates of other kedro-static-viz versions, and the
+    cached layouts with all_versions
+
+    Leftover temporary directories from interrupted extractions are removed once
+    they are older than max_tmp_age seconds, younger ones may still be in use.
+
+    Arguments:
+        all_versions (bool): Also remove the template of the installed version
+            and the cached layouts. Default is False
+        max_tmp_age (float): Age in seconds after which a temporary extraction
+            directory is considered abandoned. Default is 3600
+
+    Returns (list): the removed paths
+    """
+    root = cache_dir()
+    if not root.is_dir():
+        return []
+    removed = []
+    for path in sorted(root.iterdir()):
+        if not path.is_dir():
+            continue
+        if path.name.startswith(".tmp-"):
+            if time.time() - path.stat().st_mtime < max_tmp_age:
+                continue
+        elif path.name in (__version__, LAYOUT_CACHE) and not all_versions:
+            continue
+        shutil.rmtree(str(path), ignore_errors=True)
+        removed.append(path)
+    return removed
+
+
+def copy_site(directory: Path, sync: bool = True, link: str = "copy") -> None:
     """
-    public = Path(__file__).parent / "public"
-    if public.exists() is False:
-        import tarfile
+    copies the prebuilt gatsby site from the template cache into the public
+    directory
 
-        f = Path(__file__).parent / "public.tar.gz"
-        tar = tarfile.open(str(f))
-        tar.extractall(f.parent)
-        tar.close()
+    Arguments:
+        directory (Path): Path to save the static site to
+        sync (bool): Only copy files that are missing or changed since the last
+            build, tracked with a manifest in directory.  When False directory is
+            removed and copied from scratch.  Default is True
+        link (str): How template files are materialized when syncing, one of
+            'copy', 'hardlink' or 'reflink'. Default is 'copy'
+    """
+    public = template_dir()
     here = Path(directory).absolute()
+    if sync:
+        sync_tree(public, here, link=link)
+        return
     if here.exists():
         shutil.rmtree(str(here))
 
-    shutil.copytree(str(public), str(here), copy_function=shutil.copy)
+    shutil.copytree(
+        str(public),
+        str(here),
+        copy_function=shutil.copy,
+        ignore=shutil.ignore_patterns(MANIFEST_NAME),
+    )
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    "gzip data with a fixed mtime so unchanged files compress to identical bytes"
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=level, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def _brotli() -> Any:
+    "the brotli module when it is installed"
+    try:
+        import brotli  # type: ignore
+
+        return brotli
+    except ImportError:
+        return None
+
+
+def compress_site(directory: Union[str, Path], level: int = 9) -> List[Path]:
+    """
+    writes precompressed `.gz`, and `.br` when brotli is installed, siblings for
+    every json, js and css file in directory
+
+    Siblings that are newer than their source are kept, siblings whose source
+    no longer exists are removed.
+
+    Arguments:
+        directory (str, Path): static site directory
+        level (int): compression level from 1 to 11, the brotli quality, gzip
+            compresses at 9 above 9.  Brotli at 11 is several times slower than
+            at 9 for a few percent smaller files. Default is 9
+
+    Returns (list): paths of the files written
+    """
+    if not 1 <= level <= 11:
+        raise ValueError(f"level must be between 1 and 11, got {level}")
+    brotli = _brotli()
+    directory = Path(directory)
+    written = []
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file():
+            continue
+        if path.suffix in ENCODINGS.values():
+            if not path.with_suffix("").exists():
+                path.unlink()
+            continue
+        if path.suffix not in COMPRESS_SUFFIXES:
+            continue
+        gz = Path(f"{path}.gz")
+        br = Path(f"{path}.br")
+        todo = [] if _is_fresh(gz, path) else [gz]
+        if brotli is not None and not _is_fresh(br, path):
+            todo.append(br)
+        if not todo:
+            continue
+        data = path.read_bytes()
+        for compressed in todo:
+            if compressed is gz:
+                payload = _gzip(data, min(level, 9))
+            else:
+                payload = brotli.compress(data, quality=level)
+            compressed.write_bytes(payload)
+            written.append(compressed)
+    return written
+
+
+def print_timings(timings: Dict[str, float]) -> None:
+    """
+    prints the seconds spent formatting each pipeline, slowest first
+
+    Arguments:
+        timings (dict): seconds by pipeline name
+    """
+    width = max((len(name) for name in timings), default=0) + 2
+    for name, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"{name:<{width}}{seconds:>8.3f}s")
+
+
+def _print_deploy_diff(diff: Dict[str, List[str]]) -> None:
+    "prints how many files a deploy of the site uploads and deletes"
+    print(
+        f"kedro-static-viz deploy: {len(diff['added'])} added, "
+        f"{len(diff['changed'])} changed, {len(diff['removed'])} removed"
+    )
+
+
+def _select_pipeline(pipelines: Dict[str, Any], pipeline: str = None) -> Dict:
+    "only the named pipeline of pipelines, all of them when pipeline is None"
+    if pipeline is None:
+        return pipelines
+    if pipeline not in pipelines:
+        raise ValueError(f"pipeline {pipeline!r} is not one of {sorted(pipelines)}")
+    return {pipeline: pipelines[pipeline]}
+
+
+# pylint: disable=too-many-arguments
+def _write_data(
+    directory: Path,
+    load_file: Union[Path, None] = None,
+    pipeline: str = None,
+    env: str = None,
+    shard: bool = True,
+    node_metadata: bool = False,
+    metadata_workers: int = None,
+    compact: bool = False,
+    report: bool = False,
+    profiler: Profiler = None,
+    pipelines: Dict[str, Any] = None,
+    catalog: Any = None,
+    content_hash: bool = False,
+    views: Sequence[str] = (),
+    layout: bool = False,
+) -> None:
+    """
+    writes pipeline.json and the api files of a site whose template is already
+    in directory, the part of a build that watch mode repeats
+
+    See `static_viz` for the arguments, profiler records the stages of the build.
+    """
+    # the builder imports kedro and the vendored kedro-viz app, only pay for it
+    # when building
+    from .builder import StaticVizBuilder
+    from .publish import clear_content_addresses, content_address
+
+    viz_file = f"{directory}/pipeline.json"
+    written = [Path(viz_file)]
+    if load_file is not None:
+        from .loadfile import convert
+
+        # validated and written to pipeline.json and the shards in one pass
+        with stage(profiler, "load_file"):
+            written = convert(load_file, directory, compact=compact, shard=shard)
+        builder = None
+    else:
+        timings: Dict[str, float] = {}
+        if pipelines is None:
+            builder = StaticVizBuilder.from_project(
+                env=env, pipeline_name=pipeline, profiler=profiler
+            )
+        else:
+            if catalog is None:
+                from kedro.io import DataCatalog
+
+                catalog = DataCatalog()
+            builder = StaticVizBuilder(
+                catalog, _select_pipeline(pipelines, pipeline), profiler
+            )
+        builder.format_pipelines(
+            timings=timings,
+            # only node metadata shows parameters, load them when it is exported
+            defer_parameters=True,
+        )
+        if layout:
+            builder.layout_pipelines(cache=cache_dir() / LAYOUT_CACHE)
+        builder.save(viz_file, compact=compact)
+        if report:
+            print_timings(timings)
+
+    if builder is not None:
+        # the catalog and node objects are released once the site is written
+        with builder:
+            if shard:
+                written += builder.write_pipeline_shards(directory)
+            if node_metadata and load_file is None:
+                written += builder.write_node_metadata(
+                    directory, workers=metadata_workers
+                )
+            if views:
+                written += builder.write_views(directory, views)
+
+    if content_hash:
+        with stage(profiler, "content_hash"):
+            content_address(directory, written)
+    else:
+        clear_content_addresses(directory)
+
+
+def _watch_project(
+    rebuild: Callable[[], None],
+    directory: Path,
+    port: int,
+    serve: bool,
+    compress_level: Union[int, None],
+) -> None:
+    """
+    rebuilds the site data whenever the project's `src/` or `conf/` changes,
+    serving the site with live reload when serve is set, until interrupted
+    """
+    from .watch import WATCHED, forget_project_modules, watch
+
+    project_path = Path.cwd()
+    reload = ReloadNotifier() if serve else None
+
+    def rebuild_site() -> None:
+        "formats the edited project and reloads the open pages"
+        forget_project_modules(project_path)
+        rebuild()
+        if compress_level is not None:
+            compress_site(directory, level=compress_level)
+        if reload is not None:
+            reload.notify()
+
+    if serve:
+        server = threading.Thread(
+            target=run_static_server,
+            kwargs=dict(directory=directory, port=port, reload=reload),
+            daemon=True,
+        )
+        server.start()
+    try:
+        watch(rebuild_site, [project_path / name for name in WATCHED])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if reload is not None:
+            reload.close()
 
 
 def static_viz(
@@ -45,6 +559,22 @@ def static_viz(
     env: str = None,
     directory: Union[str, Path] = "public",
     serve: bool = False,
+    sync: bool = True,
+    link: str = "copy",
+    shard: bool = True,
+    node_metadata: bool = False,
+    metadata_workers: int = None,
+    compress: bool = False,
+    compress_level: int = 9,
+    compact: bool = False,
+    report: bool = False,
+    watch: bool = False,
+    profile: Union[str, Path, None] = None,
+    pipelines: Dict[str, Any] = None,
+    catalog: Any = None,
+    content_hash: bool = False,
+    views: Sequence[str] = (),
+    layout: bool = False,
 ) -> None:
     """
     creates kedro-static-viz as a directory of html/css/js/json that can be hosted
@@ -54,52 +584,120 @@ def static_viz(
         port (int): TCP port that viz will listen to. Default is 4141.
         brower (bool): Whether to open viz interface in the default browser or not.
             Default is False
-        load_file (str, Path, None): Path to load the pipeline JSON file
+        load_file (str, Path, None): Path to load the pipeline JSON file, it is
+            validated while it is written to the site and a malformed file raises
+            `loadfile.LoadFileError` with the line and column of the problem
         pipeline (str): The name of the modular pipeline to visualize. Default is None
         env (str): Kedro configuration environment. If not specified,
             catalog config in `local` will be used. Default is None
         directory (str, Path): Path to save the static site to. Default is 'public'
         serve (bool): Whether or not to serve the site after creating. Default is False.
+        sync (bool): Only copy site files that changed since the last build instead
+            of recreating the directory. Default is True.
+        link (str): How site template files are materialized when syncing, one of
+            'copy', 'hardlink' or 'reflink'. Default is 'copy'.
+        shard (bool): Also write `api/main.json` and one `api/pipelines/<id>.json`
+            per pipeline so the site only loads the pipeline it shows.
+            Default is True.
+        node_metadata (bool): Also write `api/nodes/<node_id>.json` with the code,
+            docstring, filepath and parameters of every node. Not available with
+            load_file. Default is False.
+        metadata_workers (int): Threads used to extract node metadata. Default is
+            None, the ThreadPoolExecutor default.
+        compress (bool): Write precompressed `.gz` and `.br` siblings of the json,
+            js and css files. Default is False.
+        compress_level (int): Compression level from 1 to 11, levels above 9
+            only raise the brotli quality. Default is 9.
+        compact (bool): Write pipeline.json without indentation, streamed with orjson
+            when it is installed. Default is False.
+        report (bool): Print the seconds spent formatting each pipeline, slowest
+            first. Default is False.
+        watch (bool): Keep running and rewrite the pipeline data whenever the
+            project's `src/` or `conf/` changes, without copying the site again.
+            A served site reloads in the browser after every rebuild. Not
+            available with load_file. Default is False.
+        profile (str, Path, None): Print the wall time, CPU time and peak memory
+            of every stage of the build and write them to this path as a Chrome
+            trace-event file. Watch mode rebuilds are not profiled. Default is
+            None, no profile.
+        pipelines (dict): Pipelines to visualize by name, e.g. the ones already
+            loaded by a running session, instead of loading them from the project.
+            Not available with load_file or watch. Default is None
+        catalog (DataCatalog): Catalog of the pipelines, used for the dataset
+            layers and parameters. Only used with pipelines. Default is None, an
+            empty DataCatalog, datasets have no layer and parameters no values
+        content_hash (bool): Write the data files as `<name>.<hash>.json`,
+            resolved by the viewer through `data-manifest.json`, and write the
+            hash and size of every file of the site, and the files added,
+            changed and removed since the last build, to
+            `.kedro-static-viz-deploy.json` and
+            `.kedro-static-viz-deploy-diff.json`. Default is False
+        views (list): Collapsed views to write, from 'namespace',
+            'modular_pipeline' and 'layer'. Each writes an overview of every
+            pipeline with its nodes grouped into super-nodes to
+            `api/views/<view>/<pipeline_id>.json` and the nodes and edges of every
+            group to `api/views/<view>/groups/<group_id>.json`. Not available with
+            load_file. Default is (), none
+        layout (bool): Lay out every pipeline at build time and embed the node
+            positions and edge routes under 'layout' in its
+            `api/pipelines/<pipeline_id>.json`, and the selected pipeline's in
+            pipeline.json, the bundled viewer still lays out itself.  Layouts are
+            cached in the user cache by the structural hash of the pipeline. Not
+            available with load_file. Default is False
 
     Returns (None): None
 
     """
-
     if isinstance(directory, str):
         directory = Path(directory)
-    copy_site(directory)
-    viz_file = f"{directory}/pipeline.json"
-
     if isinstance(load_file, str):
         load_file = Path(load_file)
+    if watch and load_file is not None:
+        raise ValueError("watch rebuilds from the project, not from a load_file")
+    if pipelines is not None and (watch or load_file is not None):
+        raise ValueError("pipelines can not be combined with load_file or watch")
 
-    if load_file is not None:
-        shutil.copy(load_file, viz_file)
-    else:
-        _call_viz(save_file=viz_file, pipeline_name=pipeline, env=env)
+    profiler = Profiler() if profile is not None else None
+    with stage(profiler, "build"):
+        with stage(profiler, "copy_site"):
+            copy_site(directory, sync=sync, link=link)
+
+        rebuild = partial(
+            _write_data,
+            directory,
+            load_file=load_file,
+            pipeline=pipeline,
+            env=env,
+            shard=shard,
+            node_metadata=node_metadata,
+            metadata_workers=metadata_workers,
+            compact=compact,
+            report=report,
+            content_hash=content_hash,
+            views=views,
+            layout=layout,
+        )
+        rebuild(profiler=profiler, pipelines=pipelines, catalog=catalog)
+        if compress:
+            with stage(profiler, "compress"):
+                compress_site(directory, level=compress_level)
+        if content_hash:
+            from .publish import write_deploy_manifest
+
+            with stage(profiler, "deploy_manifest"):
+                _print_deploy_diff(write_deploy_manifest(directory))
+    if profiler is not None:
+        print(profiler.summary())
+        profiler.write_trace(profile)
 
     if not Path(directory).exists():
         raise FileNotFoundError(f"Directory was not found at: {directory}")
     if browser and serve:
         webbrowser.open_new("http://localhost:{:d}/".format(port))
 
-    if serve:
+    if watch:
+        _watch_project(
+            rebuild, directory, port, serve, compress_level if compress else None
+        )
+    elif serve:
         run_static_server(directory=directory, port=port)
-
-
-def run_static_server(directory: Union[str, Path], port: int = 4141) -> None:
-    """Serves content from the given directory on the given port
-
-    FOR DEVELOPMENT USE ONLY, use a real server for production.
-
-    behaves very much like `python -m http.server`
-
-    Arguments:
-        directory {[str]} -- Path to the directory to serve.
-        port {[int]} -- TCP port that viz will listen to
-    """
-    here = Path(directory).absolute()
-    handler = partial(http.server.SimpleHTTPRequestHandler, directory=str(here))
-    with socketserver.TCPServer(("", port), handler) as httpd:
-        print("kedro-static-viz serving at port", port)
-        httpd.serve_forever()
@@ -0,0 +1,185 @@
+"""
+writes precomputed api responses into the static site
+
+The static site has no backend, so the responses the kedro-viz flask api would
+serve are written as json files at matching paths under `api/` in the output
+directory.
+
+Example:
+
+    >>> from kedro_static_viz.export import write_node_metadata, write_pipeline_shards
+    >>> write_pipeline_shards(builder.data, "public", graph=builder.graph)
+    >>> write_node_metadata(builder, "public")
+"""
+import json
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+from .graph import Graph
+from .publish import content_addressed
+from .serialize import dump
+from .vendored import _pipeline_data
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .builder import StaticVizBuilder
+
+logger = logging.getLogger(__name__)
+
+# pipeline ids name their files under `api/`, these would leave the directory
+_UNSAFE_FILE_NAME = re.compile(r"[/\\\0]|\.\.")
+
+
+def safe_file_name(name: str) -> bool:
+    "whether name, a pipeline id, names a file without '/', '\\', '..' or NUL"
+    return not _UNSAFE_FILE_NAME.search(name)
+
+
+def clear_data_dir(directory: Path) -> None:
+    """
+    removes the files an earlier build wrote under directory, but for the
+    content addressed ones, which `publish.content_address` keeps, with their
+    modification time, while their content does not change and removes once
+    they are stale
+
+    Arguments:
+        directory (Path): data directory of the site, e.g. `api/pipelines`
+    """
+    if not directory.exists():
+        return
+    # deepest first, so directories are empty once their files are removed
+    for path in sorted(directory.rglob("*"), reverse=True):
+        if path.is_dir():
+            if not any(path.iterdir()):
+                path.rmdir()
+        elif not content_addressed(path.name):
+            path.unlink()
+
+
+def check_file_names(names: List[str]) -> None:
+    "raises a ValueError for the first pipeline id that is not a safe file name"
+    for name in names:
+        if not safe_file_name(name):
+            raise ValueError(f"pipeline id {name!r} can not be used as a file name")
+
+
+def write_json(data: Dict, path: Path) -> None:
+    """
+    writes data as compact json, creating parent directories
+
+    Arguments:
+        data (dict): api response to write
+        path (Path): file to write
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        dump(data, f, compact=True)
+
+
+def main_index(data: Dict) -> Dict:
+    """
+    the small index a viewer loads first, everything but the nodes and edges
+
+    Arguments:
+        data (dict): formatted pipeline data as written to pipeline.json
+
+    Returns (dict): pipelines, selected_pipeline, tags and layers
+    """
+    return {
+        "pipelines": data["pipelines"],
+        "selected_pipeline": data["selected_pipeline"],
+        "tags": data["tags"],
+        "layers": data["layers"],
+    }
+
+
+def write_pipeline_shards(
+    data: Dict,
+    directory: Union[str, Path],
+    graph: Optional[Graph] = None,
+    layouts: Optional[Dict[str, Dict]] = None,
+) -> List[Path]:
+    """
+    writes `api/main.json` and one `api/pipelines/<id>.json` per pipeline
+
+    Each shard holds the same payload as the kedro-viz
+    `/api/pipelines/<pipeline_id>` endpoint, so a viewer only downloads the nodes
+    and edges of the pipeline it shows. Shards of pipelines that no longer exist
+    are removed.
+
+    Arguments:
+        data (dict): formatted pipeline data as written to pipeline.json
+        directory (str, Path): static site directory
+        graph (Graph): graph data was formatted from, slices are taken from it
+            when given
+        layouts (dict): layout of every pipeline by id, see `layout.layout`,
+            embedded in its shard under 'layout' when given
+
+    Returns (list): paths of the files written
+
+    Raises:
+        ValueError: when a pipeline id contains '/', '\\', '..' or NUL
+    """
+    check_file_names([pipeline["id"] for pipeline in data["pipelines"]])
+    api = Path(directory) / "api"
+    shard_dir = api / "pipelines"
+    clear_data_dir(shard_dir)
+
+    written = [api / "main.json"]
+    write_json(main_index(data), written[0])
+    for pipeline in data["pipelines"]:
+        path = shard_dir / f"{pipeline['id']}.json"
+        shard = _pipeline_data(data, pipeline["id"], graph)
+        if layouts is not None:
+            shard["layout"] = layouts[pipeline["id"]]
+        write_json(shard, path)
+        written.append(path)
+    return written
+
+
+def write_node_metadata(
+    builder: "StaticVizBuilder",
+    directory: Union[str, Path],
+    workers: Optional[int] = None,
+) -> List[Path]:
+    """
+    writes one `api/nodes/<node_id>.json` per node formatted by builder
+
+    Code, docstrings, filepaths, dataset descriptions and parameters are
+    extracted in a thread pool. Source files are read once per build and shared
+    by every node defined in them.  Nodes whose metadata cannot be extracted,
+    e.g. functions without available source, are logged and skipped.
+
+    Arguments:
+        builder (StaticVizBuilder): builder that formatted the pipelines
+        directory (str, Path): static site directory
+        workers (int): size of the thread pool, defaults to the
+            ThreadPoolExecutor default
+
+    Returns (list): paths of the files written
+    """
+    node_dir = Path(directory) / "api" / "nodes"
+    clear_data_dir(node_dir)
+    node_dir.mkdir(parents=True, exist_ok=True)
+
+    def export(node_id: str) -> Optional[Path]:
+        "extracts and writes the metadata of a single node"
+        try:
+            metadata = builder.node_metadata(node_id)
+        except Exception as exc:  # a single bad node must not break the site
+            # one line per node, a catalog of unloadable datasets would flood the
+            # log with tracebacks, which are only logged at debug level
+            logger.warning("could not export metadata of node %s: %s", node_id, exc)
+            logger.debug("metadata of node %s failed", node_id, exc_info=True)
+            return None
+        path = node_dir / f"{node_id}.json"
+        path.write_text(
+            json.dumps(metadata, sort_keys=True, separators=(",", ":"), default=str)
+        )
+        return path
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        written = pool.map(export, list(builder.json_nodes))
+        return [path for path in written if path is not None]
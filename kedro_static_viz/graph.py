@@ -0,0 +1,328 @@
+"""
+integer indexed graph of the nodes and edges of one build
+
+Formatting used to keep the graph as a dict of node dicts, a list of edge dicts
+deduplicated through a set of id pairs and a dict of dependency sets, hashing
+the same namespaces and nodes over and over again.  The graph interns every
+string once, gives every node id an integer index, keeps the edges in two
+integer arrays and the nodes in `__slots__` records whose pipeline membership
+is a bitset.  The node and edge dicts of the kedro-viz payload are only created
+when the payload is requested.
+
+Example:
+
+    >>> graph = Graph(["__default__"], dataset_to_layer={"cars": "raw"})
+    >>> task = graph.add_task(node, "__default__")
+    >>> graph.add_edge(graph.intern("cars"), task)
+    >>> graph.add_dataset("cars", "data", {"tag"}, "raw", "__default__")
+"""
+import hashlib
+from array import array
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from toposort import toposort_flatten
+
+TASK = "task"
+
+
+def _sha1_id(value: str) -> str:
+    "the 8 character id kedro-viz uses for a node or a namespace"
+    return hashlib.sha1(value.encode("UTF-8")).hexdigest()[:8]
+
+
+def dataset_namespace(name: str) -> Optional[str]:
+    """
+    modular pipeline namespace of a dataset or `params:` name, e.g. `a.b` for
+    `a.b.cars` and `params:a.b.alpha`, None outside of a namespace
+    """
+    if name.startswith("params:"):
+        name = name[len("params:") :]
+    return name.rpartition(".")[0] or None
+
+
+def sort_layers(
+    layer_of: Sequence[Optional[str]], offsets: Sequence[int], children: Sequence[int]
+) -> List[str]:
+    """
+    layers of an integer indexed graph in topological order, see
+    `vendored._sort_layers` for the algorithm
+
+    Arguments:
+        layer_of (list): layer of every node index, None for nodes without one
+        offsets (list): children of node `i` are `children[offsets[i]:offsets[i + 1]]`
+        children (list): child node indexes, grouped by parent
+
+    Returns (list): layers sorted based on topological order
+    """
+    layers: List[str] = []
+    layer_bits: Dict[str, int] = {}
+    for layer in layer_of:
+        if layer is not None and layer not in layer_bits:
+            layer_bits[layer] = 1 << len(layers)
+            layers.append(layer)
+    bit_of = [0 if layer is None else layer_bits[layer] for layer in layer_of]
+
+    # bitset of the layers depending on every node, -1 while unvisited
+    node_layers = [-1] * len(layer_of)
+    for root in range(len(layer_of)):
+        if node_layers[root] != -1:
+            continue
+        node_layers[root] = 0
+        stack = [(root, offsets[root])]
+        while stack:
+            node, position = stack[-1]
+            end = offsets[node + 1]
+            while position < end:
+                child = children[position]
+                position += 1
+                node_layers[node] |= bit_of[child]
+                if node_layers[child] != -1:
+                    node_layers[node] |= node_layers[child]
+                    continue
+                node_layers[child] = 0
+                stack[-1] = (node, position)
+                stack.append((child, offsets[child]))
+                break
+            else:
+                stack.pop()
+                if stack:
+                    node_layers[stack[-1][0]] |= node_layers[node]
+
+    child_layers_of: Dict[str, int] = defaultdict(int)
+    for node, child_layers in enumerate(node_layers):
+        node_layer = layer_of[node]
+        if node_layer is not None and child_layers:
+            child_layers_of[node_layer] |= child_layers
+
+    layer_dependencies: Dict[str, Set[str]] = defaultdict(set)
+    for node_layer, child_layers in child_layers_of.items():
+        for index, layer in enumerate(layers):
+            if child_layers >> index & 1:
+                layer_dependencies[layer].add(node_layer)
+    return toposort_flatten(layer_dependencies)
+
+
+class GraphNode:
+    "a task, data or parameters node of the graph"
+
+    __slots__ = ("id", "type", "name", "full_name", "tags", "layer", "namespace")
+
+    def __init__(
+        self,
+        node_id: str,
+        node_type: str,
+        name: str,
+        full_name: str,
+        tags: List[str],
+        layer: Optional[str],
+        namespace: Optional[str] = None,
+    ) -> None:
+        "initializes the record"
+        self.id = node_id
+        self.type = node_type
+        self.name = name
+        self.full_name = full_name
+        self.tags = tags
+        self.layer = layer
+        self.namespace = namespace
+
+
+class Graph:
+    """
+    nodes and edges of a set of pipelines, indexed by integers
+
+    Pipelines are added through `add_task`, `add_dataset` and `add_edge`.  Once
+    sealed only the payloads, slices and the integer arrays are kept.
+
+    Arguments:
+        pipelines (list): keys of the pipelines, in order
+        dataset_to_layer (dict): layer of every dataset of the catalog
+        pretty_name (callable): display name of a dataset namespace
+    """
+
+    def __init__(
+        self,
+        pipelines: Sequence[str],
+        dataset_to_layer: Dict[str, Optional[str]],
+        pretty_name: Callable[[str], str] = str,
+    ) -> None:
+        "initializes an empty graph"
+        self.pipelines = list(pipelines)
+        self.bits = {key: 1 << i for i, key in enumerate(self.pipelines)}
+        self.dataset_to_layer = dataset_to_layer
+        self.pretty_name = pretty_name
+        self.ids: List[str] = []
+        self.records: List[Optional[GraphNode]] = []
+        # bitset of the pipeline positions every node is in
+        self.membership: List[int] = []
+        self.layer_of: List[Optional[str]] = []
+        # modular pipeline namespace of every node, kept for the collapsed views
+        self.namespace_of: List[Optional[str]] = []
+        # node indexes in the order their records were created
+        self.order = array("l")
+        self.sources = array("l")
+        self.targets = array("l")
+        self.tags: Set[str] = set()
+        self._index_of: Dict[str, int] = {}
+        self._interned: Dict[str, int] = {}
+        self._edges: Set[int] = set()
+        self._node_dicts: Optional[List[Dict]] = None
+
+    def index(self, node_id: str) -> int:
+        "the index of a node id, allocated on first use"
+        try:
+            return self._index_of[node_id]
+        except KeyError:
+            index = self._index_of[node_id] = len(self.ids)
+            self.ids.append(node_id)
+            self.records.append(None)
+            self.membership.append(0)
+            self.layer_of.append(None)
+            self.namespace_of.append(None)
+            return index
+
+    def intern(self, value: str) -> int:
+        """
+        the index of the node whose id is the hash of a namespace or a node's
+        string, each distinct string is hashed once
+        """
+        try:
+            return self._interned[value]
+        except KeyError:
+            index = self._interned[value] = self.index(_sha1_id(value))
+            return index
+
+    def _create(self, index: int, *fields: Any) -> None:
+        "creates the record of a node seen for the first time"
+        record = self.records[index] = GraphNode(self.ids[index], *fields)
+        self.layer_of[index] = record.layer
+        self.namespace_of[index] = record.namespace
+        self.order.append(index)
+        self._node_dicts = None
+
+    def add_task(self, node: Any, pipeline_key: str) -> int:
+        "adds a kedro node to pipeline_key, returns its index"
+        index = self.intern(str(node))
+        if self.records[index] is None:
+            self._create(
+                index,
+                TASK,
+                getattr(node, "short_name", node.name),
+                getattr(node, "_func_name", str(node)),
+                sorted(node.tags),
+                None,
+                # kedro before 0.17 has no namespaces
+                getattr(node, "namespace", None),
+            )
+        self.membership[index] |= self.bits[pipeline_key]
+        return index
+
+    def add_dataset(
+        self,
+        namespace: str,
+        node_type: str,
+        tags: Set[str],
+        layer: Optional[str],
+        pipeline_key: str,
+    ) -> int:
+        "adds a data or parameters node to pipeline_key, returns its index"
+        index = self.intern(namespace)
+        if self.records[index] is None:
+            self._create(
+                index,
+                node_type,
+                self.pretty_name(namespace),
+                namespace,
+                sorted(tags),
+                layer,
+                dataset_namespace(namespace),
+            )
+        self.membership[index] |= self.bits[pipeline_key]
+        return index
+
+    def add_edge(self, source: int, target: int) -> None:
+        "adds the edge from source to target unless it is already in the graph"
+        key = source << 32 | target
+        if key not in self._edges:
+            self._edges.add(key)
+            self.sources.append(source)
+            self.targets.append(target)
+
+    def seal(self) -> None:
+        """
+        creates the node payloads and drops the records and lookup tables only
+        needed while nodes and edges are added
+        """
+        self.node_dicts()
+        self.records = []
+        self._index_of = {}
+        self._interned = {}
+        self._edges = set()
+
+    def _node_dict(self, index: int) -> Dict:
+        "the kedro-viz payload of a node"
+        record = self.records[index]
+        node: Dict[str, Any] = {
+            "type": record.type,
+            "id": record.id,
+            "name": record.name,
+            "full_name": record.full_name,
+            "tags": record.tags,
+        }
+        if record.type != TASK:
+            node["layer"] = record.layer
+        membership = self.membership[index]
+        node["pipelines"] = [
+            key
+            for position, key in enumerate(self.pipelines)
+            if membership >> position & 1
+        ]
+        return node
+
+    def node_dicts(self) -> List[Dict]:
+        "kedro-viz payload of the nodes in the order they were added, cached"
+        if self._node_dicts is None:
+            self._node_dicts = [self._node_dict(index) for index in self.order]
+        return self._node_dicts
+
+    def edge_dicts(self) -> List[Dict]:
+        "kedro-viz payload of the edges in the order they were added"
+        ids = self.ids
+        return [
+            {"source": ids[source], "target": ids[target]}
+            for source, target in zip(self.sources, self.targets)
+        ]
+
+    def pipeline_slice(self, pipeline_key: str) -> Dict[str, List[Dict]]:
+        "nodes and edges of a single pipeline, edges need both ends in it"
+        bit = self.bits[pipeline_key]
+        membership = self.membership
+        nodes = [
+            node
+            for index, node in zip(self.order, self.node_dicts())
+            if membership[index] & bit
+        ]
+        ids = self.ids
+        edges = [
+            {"source": ids[source], "target": ids[target]}
+            for source, target in zip(self.sources, self.targets)
+            if membership[source] & bit and membership[target] & bit
+        ]
+        return {"nodes": nodes, "edges": edges}
+
+    def sort_layers(self) -> List[str]:
+        "layers of the data nodes in topological order"
+        count = len(self.ids)
+        degree = [0] * (count + 1)
+        for source in self.sources:
+            degree[source + 1] += 1
+        offsets = array("l", degree)
+        for i in range(count):
+            offsets[i + 1] += offsets[i]
+        children = array("l", bytes(offsets[count] * offsets.itemsize))
+        position = array("l", offsets)
+        for source, target in zip(self.sources, self.targets):
+            children[position[source]] = target
+            position[source] += 1
+        return sort_layers(self.layer_of, offsets, children)
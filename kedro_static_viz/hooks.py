@@ -12,13 +12,104 @@ Example:
 """
 
 
+import hashlib
+import json
+import logging
+import os
+import threading
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Optional, Union
 
-from kedro.framework.hooks import hook_impl
+from pluggy import HookimplMarker
 
+from . import __version__
 from .core import static_viz
 
+FINGERPRINT_NAME = ".kedro-static-viz-fingerprint"
+
+# the marker of kedro.framework.hooks.hook_impl, without importing kedro's hook
+# specs and with them most of kedro
+hook_impl = HookimplMarker("kedro")
+
+logger = logging.getLogger(__name__)
+
+
+def _node_signature(node: Any) -> list:
+    "structure of a node plus a hash of its function's bytecode"
+    func = getattr(node, "func", None)
+    code = getattr(func, "__code__", None)
+    return [
+        node.name,
+        sorted(node.inputs),
+        sorted(node.outputs),
+        sorted(node.tags),
+        hashlib.sha1(code.co_code).hexdigest() if code is not None else None,
+    ]
+
+
+def _registered_pipelines(pipeline: Any) -> Dict[str, Any]:
+    """
+    the project's registered pipelines, already loaded by the running session on
+    kedro versions that expose them, otherwise only the pipeline being run
+    """
+    try:
+        from kedro.framework.project import pipelines  # type: ignore
+
+        return dict(pipelines)
+    except Exception:  # older kedro without a pipeline registry
+        return {"__run__": pipeline}
+
+
+def _load_parameters(catalog: Any) -> Any:
+    "parameters registered in the catalog, None when there are none"
+    try:
+        return catalog.load("parameters")
+    except Exception:  # not every catalog carries parameters
+        return None
+
+
+def fingerprint(
+    pipeline: Any,
+    catalog: Any,
+    env: str = None,
+    pipeline_name: str = None,
+) -> str:
+    """
+    cheap fingerprint of everything that ends up in the static site
+
+    Covers the structure of the registered pipelines, catalog layers, parameters,
+    the kedro environment and the kedro-static-viz version, without creating a
+    session or formatting anything.
+
+    Arguments:
+        pipeline (Pipeline): pipeline of the current run
+        catalog (DataCatalog): catalog of the current run
+        env (str): Kedro configuration environment
+        pipeline_name (str): The name of the modular pipeline to visualize
+
+    Returns (str): hex digest
+    """
+    pipelines = _registered_pipelines(pipeline)
+    if pipeline_name is not None and pipeline_name in pipelines:
+        pipelines = {pipeline_name: pipelines[pipeline_name]}
+    payload = {
+        "version": __version__,
+        "env": env,
+        "pipeline_name": pipeline_name,
+        "pipelines": {
+            name: sorted(_node_signature(node) for node in p.nodes)
+            for name, p in pipelines.items()
+        },
+        "layers": {
+            layer: sorted(datasets)
+            for layer, datasets in (getattr(catalog, "layers", None) or {}).items()
+        },
+        "parameters": _load_parameters(catalog),
+    }
+    return hashlib.sha1(
+        json.dumps(payload, sort_keys=True, default=repr).encode("UTF-8")
+    ).hexdigest()
+
 
 class StaticViz:
     """
@@ -28,11 +119,34 @@ class StaticViz:
     `static_viz_hook()` to your hooks list in your `ProjectContext` class as shown
     below.nv
 
+    The site is only rebuilt when the fingerprint of the pipelines, catalog layers,
+    parameters, environment or kedro-static-viz version differs from the one stored
+    by the last build. Set `force=True`, or the `KEDRO_STATIC_VIZ_FORCE` environment
+    variable, to rebuild on every run.
+
+    The site is formatted from the pipelines and catalog the running session
+    already loaded, the project is not loaded a second time.
+
+    With `background=True` the site is generated in a worker thread while the
+    pipeline runs. The worker is joined after the run, or after a pipeline error,
+    waiting at most `timeout` seconds. A failed or slow build is logged and never
+    fails or delays the pipeline beyond that timeout.
+
     Arguments:
         pipeline (str): The name of the modular pipeline to visualize, default is None
-        env (str): Kedro configuration environment. If not specified,
-            catalog config in `local` will be used, default is None
+        env (str): Kedro configuration environment recorded in the fingerprint,
+            defaults to the environment of the run. The site always shows the
+            run's catalog, default is None
         directory (str, Path): Path to save the static site to, default is 'public'
+        force (bool): Rebuild even when nothing changed since the last build,
+            default is False
+        background (bool): Generate the site in a worker thread instead of before
+            the run starts, default is False
+        timeout (float): Seconds to wait for a background build once the pipeline
+            has finished, default is 60
+        profile (str, Path): Print the wall time, CPU time and peak memory of
+            every build stage and write them to this path as a Chrome trace-event
+            file, default is None
 
     Example:
 
@@ -45,21 +159,108 @@ class StaticViz:
         pipeline: str = None,
         env: str = None,
         directory: Union[str, Path] = "public",
+        force: bool = False,
+        background: bool = False,
+        timeout: float = 60,
+        profile: Union[str, Path, None] = None,
     ) -> None:
         "initializes static_viz_hook"
         self.pipeline = pipeline
         self.env = env
         self.directory = directory
+        self.force = force or bool(os.environ.get("KEDRO_STATIC_VIZ_FORCE"))
+        self.background = background
+        self.timeout = timeout
+        self.profile = profile
+        self._worker: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def _is_current(self, fingerprint: str) -> bool:
+        "True if the site in directory was built from the given fingerprint"
+        directory = Path(self.directory)
+        try:
+            stored = (directory / FINGERPRINT_NAME).read_text().strip()
+        except OSError:
+            return False
+        return stored == fingerprint and (directory / "pipeline.json").exists()
 
     @hook_impl
-    def before_pipeline_run(self) -> None:
+    def before_pipeline_run(
+        self, run_params: Dict[str, Any], pipeline: Any, catalog: Any
+    ) -> None:
         "createts static viz before pipeline run"
-        # breakpoint()
+        current = fingerprint(
+            pipeline,
+            catalog,
+            env=self.env or run_params.get("env"),
+            pipeline_name=self.pipeline,
+        )
+        if not self.force and self._is_current(current):
+            return
+        # the run already loaded the pipelines and catalog, the build formats
+        # them instead of creating a second session.  The runner adds datasets
+        # to the catalog while a background build reads it, so it gets a copy.
+        pipelines = _registered_pipelines(pipeline)
+        shallow_copy = getattr(catalog, "shallow_copy", None)
+        catalog = shallow_copy() if shallow_copy is not None else catalog
+        if not self.background:
+            self._build(current, pipelines, catalog)
+            return
+        self._error = None
+        self._worker = threading.Thread(
+            target=self._build_in_background,
+            args=(current, pipelines, catalog),
+            name="kedro-static-viz",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def _build(self, fingerprint: str, pipelines: Dict[str, Any], catalog: Any) -> None:
+        "builds the site and stores the fingerprint it was built from"
         static_viz(
             browser=False,
             load_file=None,
             pipeline=self.pipeline,
-            env=self.env,
             directory=self.directory,
             serve=False,
+            profile=self.profile,
+            pipelines=pipelines,
+            catalog=catalog,
         )
+        (Path(self.directory) / FINGERPRINT_NAME).write_text(fingerprint)
+
+    def _build_in_background(
+        self, fingerprint: str, pipelines: Dict[str, Any], catalog: Any
+    ) -> None:
+        "worker thread target, keeps the failure for the main thread to report"
+        try:
+            self._build(fingerprint, pipelines, catalog)
+        except BaseException as e:  # a viz failure must never reach the pipeline
+            self._error = e
+
+    def _join(self) -> None:
+        "waits for the background build and logs its outcome, never raises"
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        worker.join(self.timeout)
+        if worker.is_alive():
+            logger.warning(
+                "kedro-static-viz build still running after %ss, not waiting for it",
+                self.timeout,
+            )
+        elif self._error is not None:
+            logger.warning(
+                "kedro-static-viz build failed",
+                exc_info=(type(self._error), self._error, self._error.__traceback__),
+            )
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        "joins the background build after a successful run"
+        self._join()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        "joins the background build after a failed run"
+        self._join()
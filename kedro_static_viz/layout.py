@@ -0,0 +1,515 @@
+"""
+layered layout of a pipeline, computed at build time
+
+Laying out a large graph is the slowest part of opening the viewer, and the
+graph of a pipeline does not change once it is formatted, so the build can lay
+it out once.  Nodes are ranked top to bottom with the datasets of every layer in
+a band below the layers before it, edges spanning several ranks are routed
+through virtual nodes near their ends, the order within each rank is improved
+with barycenter sweeps and nodes are placed as close to their neighbours as
+their order and widths allow.
+
+Layouts are cached on disk by the structural hash of the pipeline, the ids,
+types, names and layers of its nodes, its edges and the layers order, so a
+pipeline that did not change is never laid out again.
+
+Example:
+
+    >>> from kedro_static_viz.layout import cached_layout
+    >>> shard = builder.pipeline_data("__default__")
+    >>> cached_layout(shard["nodes"], shard["edges"], shard["layers"], cache)
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple, Union
+
+# bumped whenever the algorithm or the layout format changes, it is part of the
+# structural hash so cached layouts of an older algorithm are not reused
+LAYOUT_VERSION = 2
+# directory of the cached layouts in the user cache
+LAYOUT_CACHE = "layouts"
+
+NODE_HEIGHT = 40
+# estimated width of a node label character and of the icon and padding around it
+CHAR_WIDTH = 7
+NODE_PADDING = 40
+NODE_SEP = 20
+# separation next to the virtual nodes long edges are routed through
+EDGE_SEP = 10
+RANK_SEP = 60
+# ranks next to each end a long edge is routed through virtual nodes on, it runs
+# straight in between
+STUB_RANKS = 2
+# barycenter and placement sweeps, each one down and one up
+SWEEPS = 4
+
+logger = logging.getLogger(__name__)
+
+
+def structural_hash(
+    nodes: Sequence[Dict], edges: Sequence[Dict], layers: Sequence[str]
+) -> str:
+    "hex digest of everything the layout of a pipeline depends on"
+    payload = [
+        LAYOUT_VERSION,
+        [
+            [node["id"], node["type"], node["name"], node.get("layer")]
+            for node in nodes
+        ],
+        [[edge["source"], edge["target"]] for edge in edges],
+        list(layers),
+    ]
+    return hashlib.sha1(
+        json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def _topological(
+    count: int, successors: List[List[int]], predecessors: List[List[int]]
+) -> Tuple[List[int], bool]:
+    """
+    vertices in topological order, and whether there was a cycle.  A cycle is
+    broken at its first vertex in index order, placed before the rest of it.
+    """
+    degree = [len(p) for p in predecessors]
+    queue = deque(v for v in range(count) if not degree[v])
+    placed = [False] * count
+    order: List[int] = []
+    forced, cyclic = 0, False
+    while len(order) < count:
+        if not queue:
+            while placed[forced]:
+                forced += 1
+            degree[forced] = 0
+            queue.append(forced)
+            cyclic = True
+        vertex = queue.popleft()
+        placed[vertex] = True
+        order.append(vertex)
+        for successor in successors[vertex]:
+            degree[successor] -= 1
+            if not degree[successor] and not placed[successor]:
+                queue.append(successor)
+    return order, cyclic
+
+
+def _ranks(
+    count: int, edges: List[Tuple[int, int]], bands: List[int]
+) -> Tuple[List[int], List[int]]:
+    """
+    rank of every node and the nodes in topological order
+
+    Nodes of a layer rank below every node of the layers before it, through a
+    virtual node between every two consecutive layers that the nodes of the
+    first layer point to and that points to the nodes of the second.  Ranks are
+    the longest path from the sources, then nodes move down next to their
+    closest successor, and empty ranks are removed.  Edges closing a cycle are
+    left out of the ranking.
+
+    Arguments:
+        count (int): number of nodes
+        edges (list): source and target node of every edge
+        bands (list): position of the layer of every node in the layers order,
+            -1 for nodes without a layer
+    """
+    present = sorted(set(bands) - {-1})
+    # the virtual node between a layer and the next one present
+    boundary = {band: count + i for i, band in enumerate(present[:-1])}
+    after = dict(zip(present[1:], present[:-1]))
+
+    for constrained in (True, False):
+        total = count + (len(boundary) if constrained else 0)
+        successors: List[List[int]] = [[] for _ in range(total)]
+        predecessors: List[List[int]] = [[] for _ in range(total)]
+        links = list(edges)
+        if constrained:
+            for node, band in enumerate(bands):
+                if band in boundary:
+                    links.append((node, boundary[band]))
+                if band in after:
+                    links.append((boundary[after[band]], node))
+        for source, target in links:
+            successors[source].append(target)
+            predecessors[target].append(source)
+        order, cyclic = _topological(total, successors, predecessors)
+        if not cyclic or not boundary:
+            break
+        # layers contradicting the edges are not banded
+        logger.debug("layers order contradicts the edges, laying out without bands")
+
+    position = [0] * total
+    for i, vertex in enumerate(order):
+        position[vertex] = i
+    rank = [0] * total
+    for vertex in order:
+        for predecessor in predecessors[vertex]:
+            if position[predecessor] < position[vertex]:
+                rank[vertex] = max(rank[vertex], rank[predecessor] + 1)
+    for vertex in reversed(order):
+        below = [
+            rank[s] for s in successors[vertex] if position[s] > position[vertex]
+        ]
+        if below:
+            rank[vertex] = min(below) - 1
+
+    used = sorted(set(rank[:count]))
+    compact = {r: i for i, r in enumerate(used)}
+    return [compact[r] for r in rank[:count]], [v for v in order if v < count]
+
+
+def _fit(targets: List[float]) -> List[float]:
+    """
+    the nondecreasing values closest to targets in least squares, pooling
+    adjacent violators
+    """
+    blocks: List[List[float]] = []
+    for target in targets:
+        total, size = target, 1
+        while blocks and blocks[-1][0] * size > total * blocks[-1][1]:
+            previous_total, previous_size = blocks.pop()
+            total += previous_total
+            size += previous_size
+        blocks.append([total, size])
+    fitted: List[float] = []
+    for total, size in blocks:
+        fitted.extend([total / size] * int(size))
+    return fitted
+
+
+def _crossings(
+    rows: List[List[int]], down: List[List[int]], position: List[int]
+) -> int:
+    """
+    crossings between the edges of every two consecutive ranks, the inversions
+    of the positions of their lower ends counted with a Fenwick tree
+    """
+    total = 0
+    for row, below in zip(rows, rows[1:]):
+        size = len(below)
+        # tree[i] counts the lower ends inserted in a range of positions ending
+        # at i - 1, the ends left of the current node
+        tree = [0] * (size + 1)
+        inserted = 0
+        for vertex in row:
+            lower = sorted(map(position.__getitem__, down[vertex]))
+            for end in lower:
+                # ends inserted at or left of end do not cross
+                i = end + 1
+                while i:
+                    total -= tree[i]
+                    i &= i - 1
+                total += inserted
+            for end in lower:
+                i = end + 1
+                while i <= size:
+                    tree[i] += 1
+                    i += i & -i
+            inserted += len(lower)
+    return total
+
+
+def _barycenters(row: List[int], values: List, neighbours: List[List[int]]) -> List:
+    "mean of the values of the neighbours of every vertex of row, its own without any"
+    return [
+        values[adjacent[0]]
+        if len(adjacent) == 1
+        else (
+            sum(map(values.__getitem__, adjacent)) / len(adjacent)
+            if adjacent
+            else values[vertex]
+        )
+        for vertex, adjacent in zip(row, map(neighbours.__getitem__, row))
+    ]
+
+
+def _pairs(nodes: Sequence[Dict], edges: Sequence[Dict]) -> List[Tuple[int, int]]:
+    "source and target index of every edge, without duplicates and self loops"
+    index = {node["id"]: i for i, node in enumerate(nodes)}
+    pairs: List[Tuple[int, int]] = []
+    seen = set()
+    for edge in edges:
+        source, target = index.get(edge["source"]), index.get(edge["target"])
+        if source is None or target is None or source == target:
+            continue
+        if (source, target) not in seen:
+            seen.add((source, target))
+            pairs.append((source, target))
+    return pairs
+
+
+def _chains(
+    pairs: List[Tuple[int, int]], rank: List[int], width: List[float]
+) -> Tuple[List[List[int]], List[List[int]], Dict[Tuple[int, int], List[int]]]:
+    """
+    neighbours above and below every vertex and the virtual nodes every edge is
+    routed through, from its source to its target
+
+    Long edges leaving the same node share a trunk of virtual nodes, one per
+    rank crossed, and branch off it on the rank above their other end.  Edges
+    crossing more than `2 * STUB_RANKS` ranks only follow the trunk for
+    `STUB_RANKS` ranks, run straight to a stub of virtual nodes shared by the
+    long edges entering their other end, and follow it for `STUB_RANKS` ranks,
+    so the virtual nodes grow with the nodes rather than with the edges times
+    the ranks they span.  Edges closing a cycle point up and are routed from
+    their target down.  The rank and width of the virtual nodes are appended to
+    rank and width.
+    """
+    count = len(rank)
+    up: List[List[int]] = [[] for _ in range(count)]
+    down: List[List[int]] = [[] for _ in range(count)]
+    trunks: Dict[int, List[int]] = {}
+    stubs: Dict[int, List[int]] = {}
+    chains: Dict[Tuple[int, int], List[int]] = {}
+
+    def extend(run: List[int], step: int, length: int) -> None:
+        "adds virtual nodes to run, a step of a rank each, until run[length]"
+        while len(run) <= length:
+            dummy = len(rank)
+            rank.append(rank[run[0]] + step * len(run))
+            width.append(0)
+            if step > 0:  # a trunk grows down
+                up.append([run[-1]])
+                down.append([])
+                down[run[-1]].append(dummy)
+            else:  # a stub grows up
+                up.append([])
+                down.append([run[-1]])
+                up[run[-1]].append(dummy)
+            run.append(dummy)
+
+    for source, target in pairs:
+        top, bottom = source, target
+        if rank[source] > rank[target]:
+            top, bottom = target, source
+        span = rank[bottom] - rank[top]
+        if not span:
+            chains[(source, target)] = []
+            continue
+        trunk = trunks.setdefault(top, [top])
+        if span <= 2 * STUB_RANKS + 1:
+            extend(trunk, 1, span - 1)
+            down[trunk[span - 1]].append(bottom)
+            up[bottom].append(trunk[span - 1])
+            chain = trunk[1:span]
+        else:
+            stub = stubs.setdefault(bottom, [bottom])
+            extend(trunk, 1, STUB_RANKS)
+            extend(stub, -1, STUB_RANKS)
+            chain = trunk[1 : STUB_RANKS + 1] + stub[STUB_RANKS:0:-1]
+        chains[(source, target)] = chain if top == source else chain[::-1]
+    return up, down, chains
+
+
+def _order(
+    rows: List[List[int]], up: List[List[int]], down: List[List[int]]
+) -> List[List[int]]:
+    """
+    rows reordered by barycenter sweeps, the order with the fewest crossings
+    since sweeps do not always remove them
+    """
+    # rows hold every vertex once
+    position = [0] * sum(map(len, rows))
+
+    def place(row: List[int]) -> None:
+        "records the position of every vertex in row"
+        for i, vertex in enumerate(row):
+            position[vertex] = i
+
+    for row in rows:
+        place(row)
+    best, fewest = [row[:] for row in rows], _crossings(rows, down, position)
+    for _ in range(SWEEPS):
+        for sweep, neighbours in ((rows[1:], up), (rows[-2::-1], down)):
+            for row in sweep:
+                keys = _barycenters(row, position, neighbours)
+                row[:] = [row[i] for i in sorted(range(len(row)), key=keys.__getitem__)]
+                place(row)
+        crossings = _crossings(rows, down, position)
+        if crossings < fewest:
+            best, fewest = [row[:] for row in rows], crossings
+    return best
+
+
+def _place(
+    rows: List[List[int]],
+    width: List[float],
+    count: int,
+    up: List[List[int]],
+    down: List[List[int]],
+) -> List[float]:
+    """
+    x of the center of every vertex, as close to the barycenter of its
+    neighbours as the order and widths of its row allow
+    """
+    # centers of a row are at least half their widths and a separation apart,
+    # offsets are where they would be packed from zero
+    x = [0.0] * len(width)
+    offsets: List[List[float]] = []
+    for row in rows:
+        row_offsets = [0.0]
+        for previous, vertex in zip(row, row[1:]):
+            gap = NODE_SEP if previous < count and vertex < count else EDGE_SEP
+            row_offsets.append(
+                row_offsets[-1] + (width[previous] + width[vertex]) / 2 + gap
+            )
+        offsets.append(row_offsets)
+        for vertex, offset in zip(row, row_offsets):
+            x[vertex] = offset - row_offsets[-1] / 2
+
+    ranks_down = range(1, len(rows))
+    ranks_up = range(len(rows) - 2, -1, -1)
+    for _ in range(SWEEPS):
+        for sweep, neighbours in ((ranks_down, up), (ranks_up, down)):
+            for r in sweep:
+                row, row_offsets = rows[r], offsets[r]
+                targets = [
+                    target - offset
+                    for target, offset in zip(
+                        _barycenters(row, x, neighbours), row_offsets
+                    )
+                ]
+                for vertex, fitted, offset in zip(row, _fit(targets), row_offsets):
+                    x[vertex] = fitted + offset
+    return x
+
+
+def _routes(
+    nodes: Sequence[Dict],
+    pairs: List[Tuple[int, int]],
+    chains: Dict[Tuple[int, int], List[int]],
+    rank: List[int],
+    xs: List[float],
+    y: List[float],
+) -> List[Dict]:
+    "the points of every edge, from the border of its source to its target"
+    routes: List[Dict] = []
+    for source, target in pairs:
+        # edges leave the bottom of their source and enter the top of their
+        # target, or the other way around when they point up
+        side = NODE_HEIGHT / 2 if rank[source] <= rank[target] else -NODE_HEIGHT / 2
+        points = [[xs[source], y[source] + side]]
+        chain = chains[(source, target)]
+        for i, vertex in enumerate(chain):
+            # virtual nodes in a vertical run are not bends
+            following = chain[i + 1] if i + 1 < len(chain) else target
+            if not points[-1][0] == xs[vertex] == xs[following]:
+                points.append([xs[vertex], y[vertex]])
+        points.append([xs[target], y[target] - side])
+        routes.append(
+            {
+                "source": nodes[source]["id"],
+                "target": nodes[target]["id"],
+                "points": points,
+            }
+        )
+    return routes
+
+
+def layout(
+    nodes: Sequence[Dict], edges: Sequence[Dict], layers: Sequence[str]
+) -> Dict:
+    """
+    node positions and edge routes of a pipeline, top to bottom
+
+    Arguments:
+        nodes (list): nodes of the pipeline as in pipeline.json
+        edges (list): edges between them as in pipeline.json
+        layers (list): layers in topological order
+
+    Returns (dict): 'nodes' maps every node id to the 'x' and 'y' of its center,
+        its 'width', 'height' and 'rank', 'edges' holds the 'source', 'target'
+        and the 'points' of every edge, from the border of its source through
+        its bends to the border of its target, and 'width' and 'height' the
+        size of the layout
+    """
+    count = len(nodes)
+    band_of = {layer: i for i, layer in enumerate(layers)}
+    bands = [band_of.get(node.get("layer"), -1) for node in nodes]
+    pairs = _pairs(nodes, edges)
+    rank, order = _ranks(count, pairs, bands)
+
+    width: List[float] = [
+        max(NODE_HEIGHT, CHAR_WIDTH * len(node["name"]) + NODE_PADDING)
+        for node in nodes
+    ]
+    up, down, chains = _chains(pairs, rank, width)
+
+    rows: List[List[int]] = [[] for _ in range(max(rank, default=-1) + 1)]
+    for vertex in order + list(range(count, len(rank))):
+        rows[rank[vertex]].append(vertex)
+    rows = _order(rows, up, down)
+    x = _place(rows, width, count, up, down)
+
+    left = min((x[v] - width[v] / 2 for v in range(len(rank))), default=0.0)
+    xs = [round(value - left, 1) for value in x]
+    y = [r * (NODE_HEIGHT + RANK_SEP) + NODE_HEIGHT / 2 for r in rank]
+    laid_out: Dict[str, Dict] = {}
+    for i, node in enumerate(nodes):
+        laid_out[node["id"]] = {
+            "x": xs[i],
+            "y": y[i],
+            "width": width[i],
+            "height": NODE_HEIGHT,
+            "rank": rank[i],
+        }
+    right = max((x[v] + width[v] / 2 for v in range(len(rank))), default=0.0)
+    return {
+        "version": LAYOUT_VERSION,
+        "width": round(right - left, 1),
+        "height": len(rows) * (NODE_HEIGHT + RANK_SEP) - RANK_SEP if rows else 0,
+        "nodes": laid_out,
+        "edges": _routes(nodes, pairs, chains, rank, xs, y),
+    }
+
+
+def cached_layout(
+    nodes: Sequence[Dict],
+    edges: Sequence[Dict],
+    layers: Sequence[str],
+    cache: Union[str, Path, None] = None,
+) -> Dict:
+    """
+    the layout of a pipeline, read from cache when its structural hash was laid
+    out before
+
+    Arguments:
+        nodes (list): nodes of the pipeline as in pipeline.json
+        edges (list): edges between them as in pipeline.json
+        layers (list): layers in topological order
+        cache (str, Path): directory of the cached layouts, created when
+            missing. Default is None, no cache
+
+    Returns (dict): see `layout`, with the structural 'hash' it was cached by
+    """
+    key = structural_hash(nodes, edges, layers)
+    path = None if cache is None else Path(cache) / f"{key}.json"
+    if path is not None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("hash") == key:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+    result = {**layout(nodes, edges, layers), "hash": key}
+    if path is not None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=str(path.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(result, f, separators=(",", ":"))
+                # concurrent builds of the same pipeline write the same layout
+                os.replace(tmp, str(path))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            logger.warning("could not cache the layout in %s", path, exc_info=True)
+    return result
@@ -0,0 +1,790 @@
+"""
+streaming validation and normalization of pipeline JSON files
+
+`--load-file` used to copy the file into the site without looking at it, and the
+vendored loader read it with a single `json.loads` only to check three top
+level keys, so a malformed export produced a blank site.  The file is read in
+chunks and decoded one node or edge at a time instead.  The schema of every
+element, the uniqueness of node, tag and pipeline ids and the references of
+edges, node tags and node pipelines are checked with memory bounded by the ids
+of the graph rather than the size of the file, and the first problem raises a
+LoadFileError with the line and column it was found at.
+
+The same pass writes pipeline.json, compact or indented, and the api shards, so
+a large export is read once.  Files exported without `pipelines`,
+`selected_pipeline` or `layers` are normalized to a single `__default__`
+pipeline.
+
+Example:
+
+    >>> from kedro_static_viz.loadfile import convert, load
+    >>> data = load("pipeline.json")
+    >>> convert("pipeline.json", "public", compact=True, shard=True)
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Set, Tuple, Union
+
+from .export import clear_data_dir, main_index, safe_file_name, write_json
+from .serialize import BATCH_SIZE, CHUNK_SIZE, _default_backend, _encoder, _indent
+from .vendored import _DEFAULT_KEY, _pretty_name
+
+NODE_TYPES = ("task", "data", "parameters")
+REQUIRED_KEYS = ("nodes", "edges", "tags")
+# top level lists decoded one element at a time
+STREAMED_KEYS = ("nodes", "edges")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# a number or literal is complete once a delimiter follows it
+_SCALAR_END = re.compile(r"[,\]}\s]")
+# a decoding error this close to the end of the buffer may be a value cut by it
+_TRUNCATION_MARGIN = 8
+
+Location = Tuple[int, int]
+
+
+class LoadFileError(ValueError):
+    """
+    a malformed pipeline JSON file
+
+    Arguments:
+        path (str): the file
+        line (int): line of the problem, from 1
+        column (int): column of the problem, from 1
+        message (str): what is wrong
+    """
+
+    def __init__(self, path: str, line: int, column: int, message: str) -> None:
+        "initializes the error with its location"
+        super().__init__(f"{path}:{line}:{column}: {message}")
+        self.path = path
+        self.line = line
+        self.column = column
+        self.message = message
+
+
+class _Reader:
+    """
+    decodes a json document one value at a time from a text stream, keeping
+    only the value being decoded in memory
+    """
+
+    def __init__(self, fp: IO[str], path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        "initializes a reader at the start of fp"
+        self.fp = fp
+        self.path = path
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        # file offset of buf[0], and line number and file offset of the line
+        # holding it
+        self.offset = 0
+        self.line = 1
+        self.line_start = 0
+        # the last offset located, later offsets count lines from there
+        self._mark = (0, 1, 0)
+
+    def _fill(self) -> bool:
+        "drops the consumed text and reads the next chunk, False at the end"
+        if self.eof:
+            return False
+        self.line, self.line_start = self._line_of(self.offset + self.pos)
+        self.offset += self.pos
+        self.buf = self.buf[self.pos :]
+        self.pos = 0
+        # reads grow with a value spanning several chunks, so decoding it again
+        # after every read stays linear in its size
+        chunk = self.fp.read(max(self.chunk_size, len(self.buf)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def tell(self) -> int:
+        "file offset of the next character"
+        return self.offset + self.pos
+
+    def _line_of(self, offset: int) -> Tuple[int, int]:
+        """
+        line number and file offset of the line holding a buffered file offset,
+        counted from the last offset located when it is before this one
+        """
+        base, line, line_start = self._mark
+        if not self.offset <= base <= offset:
+            base, line, line_start = self.offset, self.line, self.line_start
+        start, end = base - self.offset, offset - self.offset
+        newlines = self.buf.count("\n", start, end)
+        if newlines:
+            line += newlines
+            line_start = self.offset + self.buf.rfind("\n", start, end) + 1
+        self._mark = (offset, line, line_start)
+        return line, line_start
+
+    def location(self, offset: int) -> Location:
+        "line and column of a file offset that is still buffered"
+        line, line_start = self._line_of(offset)
+        return line, offset - line_start + 1
+
+    def error(self, message: str, offset: int = None) -> LoadFileError:
+        "a LoadFileError at a buffered file offset, the next character by default"
+        line, column = self.location(self.tell() if offset is None else offset)
+        return LoadFileError(self.path, line, column, message)
+
+    def peek(self) -> str:
+        "the next character that is not whitespace, '' at the end of the file"
+        while True:
+            if self.pos < len(self.buf):
+                if self.buf[self.pos] not in " \t\n\r":
+                    return self.buf[self.pos]
+                self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+                if self.pos < len(self.buf):
+                    return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        "consumes char, the next character that is not whitespace"
+        if self.peek() != char:
+            raise self.error(f"Expecting {char!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        "decodes the value starting at the next character, found with peek"
+        first = self.buf[self.pos : self.pos + 1]
+        while True:
+            if first not in '{["':
+                while not self.eof and not _SCALAR_END.search(self.buf, self.pos):
+                    self._fill()
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                truncated = len(self.buf) - e.pos <= _TRUNCATION_MARGIN or (
+                    e.msg.startswith("Unterminated string")
+                )
+                if self.eof or not truncated:
+                    raise self.error(e.msg, self.offset + e.pos) from None
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+
+class _Sink:
+    "receives the validated document, element by element"
+
+    def key(self, key: str) -> None:
+        "a top level key starts"
+
+    def item(self, key: str, value: Dict) -> None:
+        "an element of a streamed list"
+
+    def end(self, key: str) -> None:
+        "a streamed list ended"
+
+    def value(self, key: str, value: Any) -> None:
+        "the value of a top level key that is not streamed"
+
+    def finish(self, values: Dict[str, Any], added: List[str]) -> None:
+        """
+        the document ended, values holds every top level value but the streamed
+        lists and added the keys normalization added to it
+        """
+
+    def abort(self) -> None:
+        "the document is invalid, removes what was written"
+
+
+class _Collector(_Sink):
+    "collects the whole document in memory"
+
+    def __init__(self) -> None:
+        "initializes an empty document"
+        self.data: Dict[str, Any] = {}
+
+    def key(self, key: str) -> None:
+        "starts a list for a streamed key"
+        if key in STREAMED_KEYS:
+            self.data[key] = []
+
+    def item(self, key: str, value: Dict) -> None:
+        "appends the element to its list"
+        self.data[key].append(value)
+
+    def value(self, key: str, value: Any) -> None:
+        "stores the value"
+        self.data[key] = value
+
+    def finish(self, values: Dict[str, Any], added: List[str]) -> None:
+        "adds the values normalization added"
+        for key in added:
+            self.data[key] = values[key]
+
+
+class _Emitter(_Sink):
+    """
+    writes the document to path as `serialize.dump` does, indented or compact,
+    through a temporary file that replaces path once it is valid
+
+    Every node and edge is encoded again, so the output does not depend on how
+    the input was formatted.  The streamed lists are spooled to temporary files
+    as they are read and the top level keys written in sorted order once the
+    document ended, whatever their order in the input.
+    """
+
+    def __init__(self, path: Path, compact: bool) -> None:
+        "opens the temporary file"
+        self.path = path
+        self.tmp = path.with_name(path.name + ".tmp")
+        self.compact = compact
+        self.encode = _encoder(compact, _default_backend())
+        self.f = open(self.tmp, "wb")
+        # encoded text of every streamed list, by key
+        self.lists: Dict[str, IO[bytes]] = {}
+        self.batch: List[Dict] = []
+        self.items = 0
+
+    def _write(self, text: str) -> None:
+        "writes text to the temporary file"
+        self.f.write(text.encode("utf-8"))
+
+    def key(self, key: str) -> None:
+        "opens the spool of a streamed list"
+        if key in STREAMED_KEYS:
+            self.lists[key] = tempfile.TemporaryFile()
+            self.items = 0
+
+    def _flush(self, key: str) -> None:
+        "encodes the batched elements, a list encodes much faster than items"
+        if not self.batch:
+            return
+        if self.compact:
+            text = ("[" if not self.items else ",") + self.encode(self.batch)[1:-1]
+        else:
+            batch = self.encode(self.batch)[2:-2]
+            text = ("[\n" if not self.items else ",\n") + "    " + _indent(batch, 1)
+        self.lists[key].write(text.encode("utf-8"))
+        self.items += len(self.batch)
+        self.batch = []
+
+    def item(self, key: str, value: Dict) -> None:
+        "batches the element"
+        self.batch.append(value)
+        if len(self.batch) >= BATCH_SIZE:
+            self._flush(key)
+
+    def end(self, key: str) -> None:
+        "writes the batched elements and closes the list"
+        self._flush(key)
+        if not self.items:
+            text = "[]"
+        else:
+            text = "]" if self.compact else "\n    ]"
+        self.lists[key].write(text.encode("utf-8"))
+
+    def finish(self, values: Dict[str, Any], added: List[str]) -> None:
+        "writes the document with sorted top level keys and replaces path"
+        for i, key in enumerate(sorted(values.keys() | self.lists.keys())):
+            separator = ("{" if not i else ",") + ("" if self.compact else "\n    ")
+            self._write(separator + json.dumps(key) + (":" if self.compact else ": "))
+            if key in self.lists:
+                spool = self.lists.pop(key)
+                spool.seek(0)
+                shutil.copyfileobj(spool, self.f)
+                spool.close()
+            else:
+                encoded = self.encode(values[key])
+                self._write(encoded if self.compact else _indent(encoded, 1))
+        self._write("}" if self.compact else "\n}")
+        self.f.close()
+        os.replace(str(self.tmp), str(self.path))
+
+    def abort(self) -> None:
+        "removes the temporary file and the spools"
+        for spool in self.lists.values():
+            spool.close()
+        self.f.close()
+        self.tmp.unlink()
+
+
+class _Sharder(_Sink):
+    """
+    streams nodes and edges into `api/pipelines/<id>.json` as they are read,
+    buffered per pipeline and appended in chunks, then writes `api/main.json`
+
+    An edge goes to the pipelines of both its ends, edges listed before the
+    nodes, like `serialize.dump` sorts them, are spilled to a temporary file
+    until the nodes have been read.
+    """
+
+    def __init__(self, directory: Path, node_pipelines: Dict[str, Tuple]) -> None:
+        "removes the shards of an earlier build"
+        self.api = directory / "api"
+        self.shard_dir = self.api / "pipelines"
+        clear_data_dir(self.shard_dir)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.node_pipelines = node_pipelines
+        self.encode = _encoder(True, _default_backend())
+        # list being written of every shard, 'nodes' or 'edges'
+        self.sections: Dict[str, str] = {}
+        self.buffers: Dict[str, List[str]] = {}
+        self.buffered: Dict[str, int] = {}
+        self.nodes_read = False
+        self.pending = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self.written: List[Path] = []
+
+    def _append(self, pipeline_id: str, text: str) -> None:
+        "appends text to the shard of pipeline_id, flushing a full buffer"
+        buffer = self.buffers.setdefault(pipeline_id, [])
+        buffer.append(text)
+        self.buffered[pipeline_id] = self.buffered.get(pipeline_id, 0) + len(text)
+        if self.buffered[pipeline_id] >= CHUNK_SIZE:
+            self._flush(pipeline_id)
+
+    def _flush(self, pipeline_id: str) -> None:
+        "appends the buffered text of pipeline_id to its shard"
+        with open(self.shard_dir / f"{pipeline_id}.json", "ab") as f:
+            f.write("".join(self.buffers.pop(pipeline_id, [])).encode("utf-8"))
+        self.buffered[pipeline_id] = 0
+
+    def _add(self, pipeline_id: str, section: str, text: str) -> None:
+        "adds an encoded node or edge to the shard of pipeline_id"
+        state = self.sections.get(pipeline_id)
+        if state is None:
+            prefix = '{"nodes":[' + ('],"edges":[' if section == "edges" else "")
+        elif state != section:
+            prefix = '],"edges":['
+        else:
+            prefix = ","
+        self.sections[pipeline_id] = section
+        self._append(pipeline_id, prefix + text)
+
+    def _edge(self, edge: Dict, text: str) -> None:
+        "adds an encoded edge to the pipelines of both its ends"
+        target = self.node_pipelines[edge["target"]]
+        for pipeline_id in self.node_pipelines[edge["source"]]:
+            if pipeline_id in target:
+                self._add(pipeline_id, "edges", text)
+
+    def item(self, key: str, value: Dict) -> None:
+        "adds a node to the shards of its pipelines, an edge once its ends are known"
+        if key == "nodes":
+            text = self.encode(value)
+            for pipeline_id in value["pipelines"]:
+                self._add(pipeline_id, "nodes", text)
+        elif self.nodes_read:
+            self._edge(value, self.encode(value))
+        else:
+            self.pending.write(self.encode(value) + "\n")
+
+    def end(self, key: str) -> None:
+        "adds the edges read before the nodes once the nodes are read"
+        if key == "nodes":
+            self.nodes_read = True
+            self.pending.seek(0)
+            for line in self.pending:
+                text = line[:-1]
+                self._edge(json.loads(text), text)
+            self.pending.close()
+
+    def finish(self, values: Dict[str, Any], added: List[str]) -> None:
+        "closes every shard and writes `api/main.json`"
+        shared = ",".join(
+            json.dumps(key) + ":" + self.encode(values[key])
+            for key in ("tags", "layers", "pipelines")
+        )
+        for pipeline in values["pipelines"]:
+            pipeline_id = pipeline["id"]
+            state = self.sections.get(pipeline_id)
+            opening = {None: '{"nodes":[],"edges":[', "nodes": '],"edges":['}
+            self._append(
+                pipeline_id,
+                opening.get(state, "")
+                + "],"
+                + shared
+                + ',"selected_pipeline":'
+                + json.dumps(pipeline_id)
+                + "}",
+            )
+            self._flush(pipeline_id)
+            self.written.append(self.shard_dir / f"{pipeline_id}.json")
+        main = self.api / "main.json"
+        write_json(main_index(values), main)
+        self.written.insert(0, main)
+
+    def abort(self) -> None:
+        "removes the shards written so far"
+        self.pending.close()
+        clear_data_dir(self.shard_dir)
+
+
+class _Validator:
+    """
+    checks the document element by element and passes the valid, normalized
+    elements on to the sinks
+    """
+
+    def __init__(self, reader: _Reader, sinks: List[_Sink]) -> None:
+        "initializes the validator before the first key"
+        self.reader = reader
+        self.sinks = sinks
+        # pipelines of every node, nodes with the same pipelines share a tuple
+        self.node_pipelines: Dict[str, Tuple] = {}
+        self._memberships: Dict[Tuple, Tuple] = {}
+        self._tag_lists: Dict[Tuple, Tuple] = {}
+        self.values: Dict[str, Any] = {}
+        self.keys: Set[str] = set()
+        # location of the first use of every tag and pipeline of the nodes, and
+        # of edge ends read before their node
+        self.tag_refs: Dict[str, Location] = {}
+        self.pipeline_refs: Dict[str, Location] = {}
+        self.dangling: Dict[str, Location] = {}
+        # location of the top level values checked once the document ended
+        self.value_refs: Dict[str, Location] = {}
+        self.nodes_read = False
+
+    def _error(self, message: str, offset: int) -> LoadFileError:
+        "a LoadFileError at a buffered file offset"
+        return self.reader.error(message, offset)
+
+    def _refer(self, refs: Dict[str, Location], name: str, offset: int) -> None:
+        "records the first use of a name that has to be defined somewhere else"
+        if name not in refs:
+            refs[name] = self.reader.location(offset)
+
+    def _strings(self, value: Any, what: str, offset: int) -> List[str]:
+        "value, which has to be a list of strings"
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise self._error(f"{what} must be a list of strings", offset)
+        return value
+
+    def _names(
+        self,
+        value: Any,
+        what: str,
+        offset: int,
+        refs: Dict[str, Location],
+        seen: Dict[Tuple, Tuple],
+        file_names: bool = False,
+    ) -> Tuple:
+        """
+        value, a list of names defined elsewhere, as a tuple shared by every node
+        listing the same names, which are only checked the first time, also as
+        file names when file_names is set
+        """
+        try:
+            names = seen.get(tuple(value)) if isinstance(value, list) else None
+        except TypeError:  # unhashable elements
+            names = None
+        if names is None:
+            names = tuple(self._strings(value, what, offset))
+            if file_names:
+                self._file_names(names, what, offset)
+            for name in names:
+                self._refer(refs, name, offset)
+            seen[names] = names
+        return names
+
+    def _node(self, node: Any, offset: int) -> Dict:
+        "the validated node, in the default pipeline when it has none"
+        if not isinstance(node, dict):
+            raise self._error("a node must be an object", offset)
+        node_id = node.get("id")
+        if not isinstance(node_id, str) or not node_id:
+            raise self._error("a node needs a string 'id'", offset)
+        if node_id in self.node_pipelines:
+            raise self._error(f"duplicate node id {node_id!r}", offset)
+        if not isinstance(node.get("name"), str):
+            raise self._error(f"node {node_id!r} needs a string 'name'", offset)
+        if node.get("type") not in NODE_TYPES:
+            raise self._error(
+                f"node {node_id!r} has type {node.get('type')!r}, "
+                f"not one of {NODE_TYPES}",
+                offset,
+            )
+        self._names(
+            node.get("tags", []),
+            f"tags of {node_id!r}",
+            offset,
+            self.tag_refs,
+            self._tag_lists,
+        )
+        layer = node.get("layer")
+        if layer is not None and not isinstance(layer, str):
+            raise self._error(f"layer of {node_id!r} must be a string or null", offset)
+        if "pipelines" not in node:
+            node["pipelines"] = [_DEFAULT_KEY]
+        self.node_pipelines[node_id] = self._names(
+            node["pipelines"],
+            f"pipelines of {node_id!r}",
+            offset,
+            self.pipeline_refs,
+            self._memberships,
+            file_names=True,
+        )
+        self.dangling.pop(node_id, None)
+        return node
+
+    def _edge(self, edge: Any, offset: int) -> Dict:
+        "the validated edge, ends not read yet are checked once nodes are"
+        if not isinstance(edge, dict):
+            raise self._error("an edge must be an object", offset)
+        source, target = edge.get("source"), edge.get("target")
+        if not isinstance(source, str) or not isinstance(target, str):
+            raise self._error("an edge needs a string 'source' and 'target'", offset)
+        for end in (source, target):
+            if end in self.node_pipelines:
+                continue
+            if self.nodes_read:
+                raise self._error(
+                    f"edge {source!r} -> {target!r} references unknown node {end!r}",
+                    offset,
+                )
+            self._refer(self.dangling, end, offset)
+        return edge
+
+    def _file_names(self, names: Tuple, what: str, offset: int) -> None:
+        "checks pipeline ids, which name the api shards"
+        for name in names:
+            if not safe_file_name(name):
+                raise self._error(
+                    f"{what} has {name!r}, which can not be used as a file name",
+                    offset,
+                )
+
+    def _named(self, value: Any, key: str, offset: int) -> Set[str]:
+        "ids of a list of {id, name} objects, which have to be unique"
+        if not isinstance(value, list):
+            raise self._error(f"{key!r} must be a list", offset)
+        ids: Set[str] = set()
+        for entry in value:
+            if not isinstance(entry, dict) or not isinstance(entry.get("id"), str):
+                raise self._error(f"every entry of {key!r} needs a string 'id'", offset)
+            if entry["id"] in ids:
+                raise self._error(f"duplicate id {entry['id']!r} in {key!r}", offset)
+            ids.add(entry["id"])
+        return ids
+
+    def key(self, key: str, offset: int) -> None:
+        "checks a top level key is not repeated and passes it on"
+        if key in self.keys:
+            raise self._error(f"duplicate top level key {key!r}", offset)
+        self.keys.add(key)
+        for sink in self.sinks:
+            sink.key(key)
+
+    def item(self, key: str, value: Any, offset: int) -> None:
+        "validates an element of a streamed list and passes it on"
+        if key == "nodes":
+            value = self._node(value, offset)
+        else:
+            value = self._edge(value, offset)
+        for sink in self.sinks:
+            sink.item(key, value)
+
+    def end(self, key: str) -> None:
+        "passes on the end of a streamed list"
+        if key == "nodes":
+            self.nodes_read = True
+        for sink in self.sinks:
+            sink.end(key)
+
+    def value(self, key: str, value: Any, offset: int) -> None:
+        "validates the value of a top level key and passes it on"
+        if key in STREAMED_KEYS:
+            raise self._error(f"{key!r} must be a list", offset)
+        if key in ("tags", "pipelines"):
+            self._named(value, key, offset)
+            if key == "pipelines":
+                if not value:
+                    raise self._error("'pipelines' must not be empty", offset)
+                self._file_names(
+                    tuple(pipeline["id"] for pipeline in value), "'pipelines'", offset
+                )
+        elif key == "layers":
+            self._strings(value, "'layers'", offset)
+        elif key == "selected_pipeline" and not isinstance(value, str):
+            raise self._error("'selected_pipeline' must be a string", offset)
+        if key == "selected_pipeline":
+            self.value_refs[key] = self.reader.location(offset)
+        self.values[key] = value
+        for sink in self.sinks:
+            sink.value(key, value)
+
+    def finish(self) -> None:
+        "checks the references and normalizes the missing keys"
+        end = self.reader.tell()
+        for key in REQUIRED_KEYS:
+            if key not in self.keys:
+                raise self._error(f"top level key {key!r} not found", end)
+        added = []
+        if "layers" not in self.keys:
+            self.values["layers"] = []
+            added.append("layers")
+        if "pipelines" not in self.keys:
+            self.values["pipelines"] = [
+                {"id": _DEFAULT_KEY, "name": _pretty_name(_DEFAULT_KEY)}
+            ]
+            added.append("pipelines")
+        pipeline_ids = [pipeline["id"] for pipeline in self.values["pipelines"]]
+        if "selected_pipeline" not in self.keys:
+            self.values["selected_pipeline"] = (
+                _DEFAULT_KEY if _DEFAULT_KEY in pipeline_ids else pipeline_ids[0]
+            )
+            added.append("selected_pipeline")
+
+        tag_ids = {tag["id"] for tag in self.values["tags"]}
+        unresolved = [
+            (location, f"edge references unknown node {name!r}")
+            for name, location in self.dangling.items()
+        ] + [
+            (location, f"node tag {name!r} is not one of the top level 'tags'")
+            for name, location in self.tag_refs.items()
+            if name not in tag_ids
+        ] + [
+            (location, f"node pipeline {name!r} is not one of the 'pipelines'")
+            for name, location in self.pipeline_refs.items()
+            if name not in pipeline_ids
+        ]
+        if unresolved:
+            (line, column), message = min(unresolved)
+            raise LoadFileError(self.reader.path, line, column, message)
+        if self.values["selected_pipeline"] not in pipeline_ids:
+            line, column = self.value_refs["selected_pipeline"]
+            raise LoadFileError(
+                self.reader.path,
+                line,
+                column,
+                f"selected_pipeline {self.values['selected_pipeline']!r} is not one "
+                "of the 'pipelines'",
+            )
+        for sink in self.sinks:
+            sink.finish(self.values, added)
+
+
+def _parse(reader: _Reader, validator: _Validator) -> None:
+    "reads the document, a top level object whose node and edge lists stream"
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            if reader.peek() != '"':
+                raise reader.error("Expecting property name enclosed in double quotes")
+            offset = reader.tell()
+            key = reader.value()
+            validator.key(key, offset)
+            reader.expect(":")
+            if key in STREAMED_KEYS and reader.peek() == "[":
+                reader.pos += 1
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        reader.peek()
+                        offset = reader.tell()
+                        validator.item(key, reader.value(), offset)
+                        char = reader.peek()
+                        reader.pos += 1
+                        if char == "]":
+                            break
+                        if char != ",":
+                            reader.pos -= 1
+                            raise reader.error("Expecting ',' or ']'")
+                validator.end(key)
+            else:
+                reader.peek()
+                offset = reader.tell()
+                validator.value(key, reader.value(), offset)
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                break
+            if char != ",":
+                reader.pos -= 1
+                raise reader.error("Expecting ',' or '}'")
+    if reader.peek() != "":
+        raise reader.error("Extra data after the top level object")
+    validator.finish()
+
+
+def _run(
+    path: Union[str, Path], sinks_of: Callable[[_Validator], List[_Sink]]
+) -> None:
+    """
+    parses path into the sinks sinks_of creates for its validator, aborting them
+    on any problem
+    """
+    with open(path, encoding="utf-8") as f:
+        reader = _Reader(f, str(path))
+        validator = _Validator(reader, [])
+        validator.sinks = sinks_of(validator)
+        try:
+            _parse(reader, validator)
+        except BaseException:
+            for sink in validator.sinks:
+                sink.abort()
+            raise
+
+
+def load(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    the validated, normalized data of a pipeline JSON file
+
+    Arguments:
+        path (str, Path): pipeline JSON file
+
+    Returns (dict): nodes, edges, tags, layers, pipelines and selected_pipeline
+
+    Raises:
+        LoadFileError: at the first problem, with its line and column
+    """
+    collector = _Collector()
+    _run(path, lambda validator: [collector])
+    return collector.data
+
+
+def convert(
+    path: Union[str, Path],
+    directory: Union[str, Path],
+    compact: bool = False,
+    shard: bool = True,
+) -> List[Path]:
+    """
+    validates a pipeline JSON file and writes it to the static site in one pass
+
+    pipeline.json is only replaced once the whole file is valid.
+
+    Arguments:
+        path (str, Path): pipeline JSON file
+        directory (str, Path): static site directory
+        compact (bool): Write pipeline.json without indentation. Default is False
+        shard (bool): Also write `api/main.json` and one `api/pipelines/<id>.json`
+            per pipeline. Default is True
+
+    Returns (list): paths of the files written
+
+    Raises:
+        LoadFileError: at the first problem, with its line and column
+    """
+    directory = Path(directory)
+    viz_file = directory / "pipeline.json"
+    sharders: List[_Sharder] = []
+
+    def sinks_of(validator: _Validator) -> List[_Sink]:
+        """
+        the sharder reads the pipelines of the nodes from the validator, the
+        emitter opens its temporary file last
+        """
+        if shard:
+            sharders.append(_Sharder(directory, validator.node_pipelines))
+        return sharders + [_Emitter(viz_file, compact)]
+
+    _run(path, sinks_of)
+    return [viz_file] + (sharders[0].written if sharders else [])
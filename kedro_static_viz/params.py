@@ -0,0 +1,118 @@
+"""
+per build cache of catalog lookups and parameter loads
+
+Formatting looks up the dataset of every input of every node, once per pipeline
+the node is in, and used to load `parameters` and `params:<x>` again for each
+node consuming them.  The cache looks every namespace up once and loads every
+parameter namespace once, on first use, and hands out the same read-only view to
+every node.  Views are dict and list subclasses, so they serialize exactly like
+the loaded values.
+
+Example:
+
+    >>> cache = ParameterCache(catalog, lookup=catalog._get_dataset)
+    >>> cache.load("params:model_options")["test_size"]
+    0.2
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> None:
+    "replaces the methods of dict that would modify it"
+    raise TypeError("parameters are shared between nodes and read-only")
+
+
+class FrozenDict(dict):
+    "read-only dict of loaded parameters"
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self) -> Tuple:
+        "pickles and copies as a plain dict, which the mutators would refuse"
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    "read-only list of loaded parameters"
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __reduce__(self) -> Tuple:
+        "pickles and copies as a plain list, which the mutators would refuse"
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    "read-only deep view of a loaded value, dicts and lists are frozen"
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+class ParameterCache:
+    """
+    memoizes catalog lookups and parameter loads for one build
+
+    Thread safe, every namespace is looked up and loaded once even when node
+    metadata is exported concurrently.
+
+    Arguments:
+        catalog (DataCatalog): catalog the cache belongs to
+        lookup (callable): returns the dataset of a namespace, or None
+    """
+
+    def __init__(self, catalog: Any, lookup: Callable[[str], Any]) -> None:
+        "initializes an empty cache"
+        self.catalog = catalog
+        self._lookup = lookup
+        self._datasets: Dict[str, Any] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def dataset(self, namespace: str) -> Any:
+        "the dataset of namespace, None when it is not in the catalog"
+        try:
+            return self._datasets[namespace]
+        except KeyError:
+            pass
+        with self._lock:
+            if namespace not in self._datasets:
+                self._datasets[namespace] = self._lookup(namespace)
+            return self._datasets[namespace]
+
+    def load(self, namespace: str) -> Any:
+        "read-only view of the loaded parameters, {} when not in the catalog"
+        try:
+            return self._values[namespace]
+        except KeyError:
+            pass
+        dataset = self.dataset(namespace)
+        with self._lock:
+            if namespace not in self._values:
+                value = dataset.load() if dataset is not None else {}
+                self._values[namespace] = freeze(value)
+            return self._values[namespace]
+
+    def node_parameters(self, namespaces: Iterable[str]) -> Any:
+        """
+        parameters of a task node from the parameter namespaces among its inputs,
+        in input order
+
+        `parameters` stands for every parameter, `params:<x>` adds `x`.  The
+        result is the shared view itself when the node only reads `parameters`.
+        """
+        parameters: Any = {}
+        for namespace in namespaces:
+            if namespace == "parameters":
+                parameters = self.load(namespace)
+                continue
+            if isinstance(parameters, FrozenDict):
+                parameters = dict(parameters)
+            parameters[namespace.replace("params:", "")] = self.load(namespace)
+        return parameters
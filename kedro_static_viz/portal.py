@@ -0,0 +1,232 @@
+"""
+builds one static site for many kedro projects
+
+Every project is formatted in a fresh process of its own, since kedro sessions,
+project settings and the project's package are process global.  The site assets
+are copied once to the root of the output directory and every project gets a
+route, `/<name>/`, holding only its pipeline data.  `portal.json` at the root
+lists the projects with their build times and errors.
+
+Example:
+
+    >>> from kedro_static_viz.portal import build_many
+    >>> build_many(["../project-a", ("../project-b", "prod")], directory="public")
+"""
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .core import copy_site, template_dir
+
+Project = Union[str, Path, Tuple[Union[str, Path], Optional[str]]]
+# written at the root of a portal next to the template, routes can not use them
+RESERVED_NAMES = {"api", "pipeline.json", "portal.json"}
+
+
+class ProjectResult(NamedTuple):
+    "outcome of building a single project of a portal"
+
+    name: str
+    path: str
+    env: Optional[str]
+    seconds: float
+    error: Optional[str]
+
+
+def parse_project(spec: str) -> Tuple[str, Optional[str]]:
+    """
+    splits a `PATH[@ENV]` command line project into its path and environment
+
+    Arguments:
+        spec (str): project path, optionally followed by `@` and a kedro env
+
+    Returns (tuple): path and env, env is None when not given
+    """
+    path, sep, env = spec.rpartition("@")
+    if not sep or not env or "/" in env or "\\" in env:
+        return spec, None
+    return path, env
+
+
+def _route_names(paths: Sequence[Path], reserved: Iterable[str] = ()) -> List[str]:
+    """
+    url safe, unique route names from the project directory names, none of them
+    one of the reserved names
+    """
+    taken = set(reserved)
+    names: List[str] = []
+    for path in paths:
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "-", path.name).strip("-.") or "project"
+        candidate, i = name, 2
+        while candidate in names or candidate in taken:
+            candidate, i = f"{name}-{i}", i + 1
+        names.append(candidate)
+    return names
+
+
+def _build_project(
+    project_path: str,
+    env: Optional[str],
+    pipeline: Optional[str],
+    output: str,
+    compact: bool,
+    shard: bool,
+) -> Tuple[float, Optional[str]]:
+    """
+    worker process entry point, formats one project into output
+
+    Returns (tuple): seconds taken and the formatted traceback on failure
+    """
+    start = time.perf_counter()
+    try:
+        os.chdir(project_path)
+        try:
+            from kedro.framework.startup import bootstrap_project  # type: ignore
+
+            bootstrap_project(Path(project_path))
+        except ImportError:  # pragma: no cover kedro < 0.17.1
+            from kedro.framework.startup import _get_project_metadata  # type: ignore
+
+            source_dir = _get_project_metadata(project_path).source_dir
+            sys.path.insert(0, str(source_dir))
+
+        from .builder import StaticVizBuilder
+
+        Path(output).mkdir(parents=True, exist_ok=True)
+        with StaticVizBuilder.from_project(project_path, env, pipeline) as builder:
+            builder.format_pipelines()
+            builder.save(Path(output) / "pipeline.json", compact=compact)
+            if shard:
+                builder.write_pipeline_shards(output)
+    except Exception:  # every failure is reported, never raised across projects
+        return time.perf_counter() - start, traceback.format_exc()
+    return time.perf_counter() - start, None
+
+
+def _build_isolated(*args: Any) -> Tuple[float, Optional[str]]:
+    """
+    runs `_build_project` in a new process that only builds this project.  A
+    worker reused across projects would still hold the previous project's
+    package, settings and hooks, and render them for a project of the same
+    package name.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_build_project, *args).result()
+
+
+def _add_route(directory: Path, name: str) -> None:
+    """
+    makes `/<name>/` render the viz page from the shared assets
+
+    Gatsby resolves a route through `page-data/<route>/page-data.json`, so the
+    index page's data is copied there with its path rewritten, next to a copy of
+    the prerendered index.html.
+    """
+    route = directory / name
+    route.mkdir(parents=True, exist_ok=True)
+    (route / "index.html").write_bytes((directory / "index.html").read_bytes())
+
+    index_data = directory / "page-data" / "index" / "page-data.json"
+    page_data = json.loads(index_data.read_text())
+    page_data["path"] = f"/{name}/"
+    target = directory / "page-data" / name / "page-data.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(page_data))
+
+
+def build_many(
+    projects: Sequence[Project],
+    directory: Union[str, Path] = "public",
+    pipeline: str = None,
+    workers: int = None,
+    compact: bool = False,
+    shard: bool = True,
+) -> List[ProjectResult]:
+    """
+    builds a portal with one route per kedro project
+
+    Projects are formatted in parallel, each in a fresh process; a failing
+    project is reported in the results and in `portal.json` without affecting
+    the others.
+
+    Arguments:
+        projects (list): project paths, or (path, env) tuples
+        directory (str, Path): Path to save the portal to. Default is 'public'
+        pipeline (str): The name of the modular pipeline to visualize in every
+            project. Default is None
+        workers (int): number of projects formatted at once, defaults to the
+            number of cpus
+        compact (bool): Write pipeline.json without indentation. Default is False
+        shard (bool): Write per-pipeline api shards. Default is True
+
+    Returns (list): a ProjectResult per project, in the given order
+    """
+    specs = [
+        (Path(p[0]), p[1]) if isinstance(p, tuple) else (Path(p), None)
+        for p in projects
+    ]
+    directory = Path(directory).absolute()
+    copy_site(directory)
+    # the template's sample data would otherwise show up at the portal root
+    sample = directory / "pipeline.json"
+    if sample.exists():
+        sample.unlink()
+
+    # a route named like a file or directory of the site would overwrite it
+    reserved = {entry.name for entry in template_dir().iterdir()}
+    names = _route_names(
+        [path.resolve() for path, _ in specs], reserved | RESERVED_NAMES
+    )
+    results: List[ProjectResult] = []
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [
+            pool.submit(
+                _build_isolated,
+                str(path.resolve()),
+                env,
+                pipeline,
+                str(directory / name),
+                compact,
+                shard,
+            )
+            for (path, env), name in zip(specs, names)
+        ]
+        for (path, env), name, future in zip(specs, names, futures):
+            try:
+                seconds, error = future.result()
+            except Exception:  # the worker process itself died
+                seconds, error = 0.0, traceback.format_exc()
+            if error is None:
+                _add_route(directory, name)
+            results.append(ProjectResult(name, str(path), env, seconds, error))
+
+    portal: List[Dict] = [
+        {
+            "name": result.name,
+            "route": f"/{result.name}/",
+            "env": result.env,
+            "seconds": round(result.seconds, 3),
+            "ok": result.error is None,
+        }
+        for result in results
+    ]
+    (directory / "portal.json").write_text(json.dumps({"projects": portal}, indent=4))
+    return results
@@ -0,0 +1,171 @@
+"""
+per stage profile of a kedro-static-viz build
+
+A Profiler records the wall time, process CPU time and peak memory of the named
+stages of a build, e.g. creating the session, instantiating the catalog,
+formatting, sorting the layers, serializing or copying the site.  Stages nest,
+the peak memory of a stage includes the stages inside it.  Memory is traced
+with tracemalloc while an outermost stage runs, which slows allocation heavy
+stages down, so the wall times of a profiled build are an upper bound.
+
+The profile is printed as a summary and written as a Chrome trace-event file,
+which `chrome://tracing`, Perfetto or speedscope open.
+
+Example:
+
+    >>> profiler = Profiler()
+    >>> with stage(profiler, "build"):
+    ...     with stage(profiler, "format"):
+    ...         builder.format_pipelines()
+    >>> print(profiler.summary())
+    >>> profiler.write_trace("profile.json")
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from . import __version__
+
+
+class Stage:
+    "a stage of a build, its times in seconds and its peak memory in bytes"
+
+    __slots__ = ("name", "depth", "thread", "start", "wall", "cpu", "memory", "peak")
+
+    def __init__(self, name: str, depth: int, start: float, memory: int) -> None:
+        "initializes a stage that has just started"
+        self.name = name
+        self.depth = depth
+        self.thread = threading.get_ident()
+        self.start = start
+        self.wall = 0.0
+        self.cpu = time.process_time()
+        # traced memory when the stage started, then its peak above that
+        self.memory = memory
+        self.peak = memory
+
+
+class Profiler:
+    """
+    records the stages of one build, used by one thread at a time
+
+    Arguments:
+        memory (bool): Trace peak memory with tracemalloc. Default is True
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        "initializes a profiler without stages"
+        self.memory = memory
+        self.stages: List[Stage] = []
+        self._open: List[Stage] = []
+        self._origin = time.perf_counter()
+        self._started_tracing = False
+
+    def _traced(self) -> int:
+        """
+        folds the peak traced since the last call into the open stages and
+        returns the memory traced now
+        """
+        if not tracemalloc.is_tracing():
+            return 0
+        current, peak = tracemalloc.get_traced_memory()
+        for open_stage in self._open:
+            open_stage.peak = max(open_stage.peak, peak)
+        # python < 3.9 keeps one peak since tracing started, an upper bound
+        reset_peak = getattr(tracemalloc, "reset_peak", None)
+        if reset_peak is not None:
+            reset_peak()
+        return current
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Stage]:
+        "records the stage run inside the with block"
+        if not self._open and self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current = self._traced()
+        record = Stage(name, len(self._open), time.perf_counter(), current)
+        self.stages.append(record)
+        self._open.append(record)
+        try:
+            yield record
+        finally:
+            self._traced()
+            self._open.pop()
+            record.wall = time.perf_counter() - record.start
+            record.cpu = time.process_time() - record.cpu
+            record.peak -= record.memory
+            if not self._open and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def summary(self) -> str:
+        "one line per stage, nested stages indented below the stage they are in"
+        width = max((2 * s.depth + len(s.name) for s in self.stages), default=5) + 2
+        header = f"{'wall (s)':>10}{'cpu (s)':>10}{'peak (MiB)':>12}"
+        lines = [f"{'stage':<{width}}{header}"]
+        for s in self.stages:
+            name = "  " * s.depth + s.name
+            peak = f"{s.peak / 2 ** 20:>12.1f}" if self.memory else f"{'-':>12}"
+            lines.append(f"{name:<{width}}{s.wall:>10.3f}{s.cpu:>10.3f}{peak}")
+        return "\n".join(lines)
+
+    def trace(self) -> Dict[str, Any]:
+        "the stages as Chrome trace-event complete events, in microseconds"
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "kedro-static-viz"},
+            }
+        ]
+        for s in self.stages:
+            args: Dict[str, Any] = {"cpu_ms": round(s.cpu * 1e3, 3)}
+            if self.memory:
+                args["peak_mib"] = round(s.peak / 2 ** 20, 3)
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": "build",
+                    "ph": "X",
+                    "ts": round((s.start - self._origin) * 1e6, 1),
+                    "dur": round(s.wall * 1e6, 1),
+                    "pid": pid,
+                    "tid": s.thread,
+                    "args": args,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"version": __version__},
+        }
+
+    def write_trace(self, path: Union[str, Path]) -> None:
+        """
+        writes the Chrome trace-event json file
+
+        Arguments:
+            path (str, Path): file to write, its directory is created
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f, indent=1)
+
+
+@contextmanager
+def stage(profiler: Optional[Profiler], name: str) -> Iterator[None]:
+    "records a stage on profiler, does nothing when profiler is None"
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
@@ -0,0 +1,240 @@
+"""
+content addressed site data and deploy manifests for incremental publishing
+
+Every build rewrites the data files of the site, so a static host synced by
+name and modification time receives the whole site every time.  With content
+addressing the data files are renamed to `<name>.<hash>.json`, a file keeps
+its name for as long as its content does not change, and `data-manifest.json`
+maps the stable names the viewer requests to the hashed ones.  A small loader
+injected into `index.html` resolves the viewer's requests through it.
+
+The deploy manifest lists the hash and size of every file of the site and the
+deploy diff the files added, changed and removed since the previous build, so
+deploy tooling only uploads the changed objects.
+
+Example:
+
+    >>> from kedro_static_viz.publish import content_address, write_deploy_manifest
+    >>> content_address("public", [Path("public/pipeline.json")])
+    >>> write_deploy_manifest("public")
+"""
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+from .core import _file_hash, record_edit
+from .server import ENCODINGS
+
+ENTRY_NAME = "data-manifest.json"
+DEPLOY_MANIFEST_NAME = ".kedro-static-viz-deploy.json"
+DEPLOY_DIFF_NAME = ".kedro-static-viz-deploy-diff.json"
+# build bookkeeping that is never deployed
+PRIVATE_PREFIX = ".kedro-static-viz"
+# hex digits of the content hash in a file name, the length gatsby uses
+HASH_LENGTH = 20
+# a content addressed data file or one of its precompressed siblings
+_HASHED_NAME = re.compile(
+    rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.json"
+    rf"(?:{'|'.join(re.escape(suffix) for suffix in ENCODINGS.values())})?$"
+)
+
+# resolves the viewer's requests for `<name>.json` below the directory of the
+# page through the entry manifest, which lies next to the page, so the site
+# also works under a subpath.  Requests for files it does not list, with a
+# query or to other origins go through unchanged.
+LOADER_SCRIPT = (
+    "<script>(function(){var f=window.fetch.bind(window),m=null,"
+    "b=new URL('.',document.baseURI);"
+    "window.fetch=function(u,o){if(typeof u!=='string')return f(u,o);"
+    "var a=new URL(u,document.baseURI),r;"
+    "if(a.origin!==b.origin||a.search||a.hash||"
+    "a.pathname.indexOf(b.pathname)!==0)return f(u,o);"
+    "try{r=decodeURIComponent(a.pathname.slice(b.pathname.length))}"
+    "catch(e){return f(u,o)}"
+    f"if(!/\\.json$/.test(r)||r==='{ENTRY_NAME}')return f(u,o);"
+    f"m=m||f(new URL('{ENTRY_NAME}',b).href,{{cache:'no-cache'}})"
+    ".then(function(s){return s.json()}).catch(function(){return{files:{}}});"
+    "return m.then(function(d){var h=(d.files||{})[r];return f(h?new URL("
+    "h.split('/').map(encodeURIComponent).join('/'),b).href:u,o)})}})();</script>"
+)
+
+
+def _read_json(path: Path) -> Dict:
+    "a json file written by an earlier build, empty if missing or corrupt"
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_if_changed(path: Path, text: str) -> None:
+    "writes text unless path already holds it, keeping its modification time"
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    path.write_text(text, encoding="utf-8")
+
+
+def hashed_name(path: Path, digest: str) -> Path:
+    "path with the content hash between its stem and its suffix"
+    return path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}")
+
+
+def content_addressed(name: str) -> bool:
+    "whether a file name is a content addressed name, or one of its siblings"
+    return _HASHED_NAME.search(name) is not None
+
+
+def _remove(path: Path) -> None:
+    """
+    removes a file written by an earlier build and its precompressed siblings,
+    if they are still there
+    """
+    for name in [path.name] + [path.name + suffix for suffix in ENCODINGS.values()]:
+        try:
+            path.with_name(name).unlink()
+        except OSError:
+            pass
+
+
+def _replace_index(directory: Path, html: str) -> None:
+    """
+    replaces `index.html` with html through a temporary file, since it may be a
+    hardlink to the cached template, which must not change
+    """
+    index = directory / "index.html"
+    tmp = index.with_name(index.name + ".tmp")
+    tmp.write_text(html, encoding="utf-8")
+    os.replace(str(tmp), str(index))
+    # the edited copy is kept by later syncs, which would otherwise place the
+    # template again and have the loader injected again, with a new mtime
+    record_edit(directory, "index.html")
+
+
+def inject_loader(directory: Union[str, Path]) -> None:
+    """
+    adds the loader resolving data requests through the entry manifest to the
+    head of `index.html`, before the viewer's scripts run
+    """
+    directory = Path(directory)
+    html = (directory / "index.html").read_text(encoding="utf-8")
+    if LOADER_SCRIPT in html:
+        return
+    head = re.search(r"<head[^>]*>", html)
+    position = head.end() if head is not None else 0
+    _replace_index(directory, html[:position] + LOADER_SCRIPT + html[position:])
+
+
+def content_address(directory: Union[str, Path], paths: Sequence[Path]) -> Dict:
+    """
+    renames data files to their content addressed names and writes the entry
+    manifest mapping the stable names to them
+
+    A file whose content was already published keeps the name, and the
+    modification time, it was published with.  Content addressed files of the
+    previous build that are no longer referenced are removed.
+
+    Arguments:
+        directory (str, Path): static site directory
+        paths (list): data files written by the build, inside directory
+
+    Returns (dict): content addressed name by stable name, both relative to
+        directory
+    """
+    directory = Path(directory)
+    previous = _read_json(directory / ENTRY_NAME).get("files", {})
+    files: Dict[str, str] = {}
+    for path in paths:
+        path = Path(path)
+        target = hashed_name(path, _file_hash(path))
+        if target.exists():  # same name, same content
+            path.unlink()
+        else:
+            path.replace(target)
+        files[path.relative_to(directory).as_posix()] = target.relative_to(
+            directory
+        ).as_posix()
+
+    for stale in set(previous.values()) - set(files.values()):
+        _remove(directory / stale)
+    _write_if_changed(
+        directory / ENTRY_NAME,
+        json.dumps({"version": 1, "files": files}, sort_keys=True),
+    )
+    inject_loader(directory)
+    return files
+
+
+def clear_content_addresses(directory: Union[str, Path]) -> None:
+    """
+    removes the content addressed files, the entry manifest and the deploy
+    manifests of an earlier build, for a build writing its data files under
+    their stable names
+    """
+    directory = Path(directory)
+    entry = directory / ENTRY_NAME
+    for name in _read_json(entry).get("files", {}).values():
+        _remove(directory / name)
+    for name in (ENTRY_NAME, DEPLOY_MANIFEST_NAME, DEPLOY_DIFF_NAME):
+        _remove(directory / name)
+    index = directory / "index.html"
+    if index.exists():
+        html = index.read_text(encoding="utf-8")
+        if LOADER_SCRIPT in html:
+            _replace_index(directory, html.replace(LOADER_SCRIPT, ""))
+
+
+def write_deploy_manifest(directory: Union[str, Path]) -> Dict[str, List[str]]:
+    """
+    writes the hash and size of every file of the site and the diff against the
+    manifest of the previous build
+
+    Files whose size and modification time match the previous manifest are not
+    hashed again.  Build bookkeeping files starting with `.kedro-static-viz` are
+    not part of the site.
+
+    Arguments:
+        directory (str, Path): static site directory
+
+    Returns (dict): sorted relative paths 'added', 'changed' and 'removed'
+        since the previous build
+    """
+    directory = Path(directory)
+    previous = _read_json(directory / DEPLOY_MANIFEST_NAME).get("files", {})
+    files: Dict[str, Dict] = {}
+    for path in sorted(directory.rglob("*")):
+        if path.name.startswith(PRIVATE_PREFIX) or not path.is_file():
+            continue
+        rel = path.relative_to(directory).as_posix()
+        stat = path.stat()
+        entry = previous.get(rel) or {}
+        unchanged = (entry.get("size"), entry.get("mtime_ns")) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+        digest = entry["hash"] if unchanged else _file_hash(path)
+        files[rel] = {
+            "hash": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    diff = {
+        "added": sorted(files.keys() - previous.keys()),
+        "changed": sorted(
+            rel
+            for rel in files.keys() & previous.keys()
+            if files[rel]["hash"] != previous[rel].get("hash")
+        ),
+        "removed": sorted(previous.keys() - files.keys()),
+    }
+    (directory / DEPLOY_MANIFEST_NAME).write_text(
+        json.dumps({"version": 1, "files": files}, sort_keys=True)
+    )
+    (directory / DEPLOY_DIFF_NAME).write_text(json.dumps(diff, indent=2))
+    return diff
@@ -0,0 +1,130 @@
+"""
+streaming json serialization of formatted pipeline data
+
+The top level lists, i.e. nodes and edges, are written to the file handle one
+element at a time in buffered chunks, so saving never holds a second full copy
+of the graph as a string.  The default pretty output is byte for byte the same
+as `json.dumps(data, indent=4, sort_keys=True)`.  Compact output uses orjson
+when it is installed and falls back to the standard library.
+
+Example:
+
+    >>> from kedro_static_viz.serialize import dump
+    >>> with open("pipeline.json", "wb") as f:
+    ...     dump(data, f, compact=True)
+"""
+import json
+from typing import IO, Any, Callable, Dict, Iterator, List
+
+BACKENDS = ("json", "orjson")
+# flush the write buffer once it holds this many characters
+CHUNK_SIZE = 1 << 16
+# list items encoded per call
+BATCH_SIZE = 1024
+
+
+def _orjson() -> Any:
+    "the orjson module when it is installed"
+    try:
+        import orjson  # type: ignore
+
+        return orjson
+    except ImportError:
+        return None
+
+
+def _default_backend() -> str:
+    "orjson when available, otherwise the standard library"
+    return "orjson" if _orjson() is not None else "json"
+
+
+def _encoder(compact: bool, backend: str) -> Callable[[Any], str]:
+    "function encoding a single value the way the whole document is encoded"
+    if not compact:
+        return json.JSONEncoder(indent=4, sort_keys=True).encode
+    if backend == "orjson":
+        orjson = _orjson()
+        return lambda value: orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode(
+            "utf-8"
+        )
+    return json.JSONEncoder(sort_keys=True, separators=(",", ":")).encode
+
+
+def _indent(text: str, level: int) -> str:
+    """
+    indents every line but the first, strings never contain raw newlines since
+    json escapes them
+    """
+    return text.replace("\n", "\n" + " " * 4 * level)
+
+
+def _iter_pretty(data: Dict, encode: Callable[[Any], str]) -> Iterator[str]:
+    "chunks of `json.dumps(data, indent=4, sort_keys=True)`, element by element"
+    if not data:
+        yield "{}"
+        return
+    for i, key in enumerate(sorted(data)):
+        yield ("{\n" if i == 0 else ",\n") + "    " + json.dumps(key) + ": "
+        value = data[key]
+        if isinstance(value, list) and value:
+            # encoding a batch of items as a list is much faster than one call
+            # per item with the pure python indenting encoder, strip its
+            # brackets and indent its lines one more level.
+            for start in range(0, len(value), BATCH_SIZE):
+                batch = encode(value[start : start + BATCH_SIZE])[2:-2]
+                yield ("[\n" if start == 0 else ",\n") + "    " + _indent(batch, 1)
+            yield "\n    ]"
+        else:
+            yield _indent(encode(value), 1)
+    yield "\n}"
+
+
+def _iter_compact(data: Dict, encode: Callable[[Any], str]) -> Iterator[str]:
+    "chunks of the compact encoding of data, element by element"
+    yield "{"
+    for i, key in enumerate(sorted(data)):
+        yield ("" if i == 0 else ",") + json.dumps(key) + ":"
+        value = data[key]
+        if isinstance(value, list):
+            yield "["
+            for start in range(0, len(value), BATCH_SIZE):
+                batch = encode(value[start : start + BATCH_SIZE])[1:-1]
+                yield ("" if start == 0 else ",") + batch
+            yield "]"
+        else:
+            yield encode(value)
+    yield "}"
+
+
+def dump(data: Dict, fp: IO[bytes], compact: bool = False, backend: str = None) -> int:
+    """
+    streams formatted pipeline data to a binary file handle as utf-8 json
+
+    Arguments:
+        data (dict): formatted pipeline data
+        fp (IO[bytes]): file handle opened for binary writing
+        compact (bool): Write without indentation or whitespace. Default is False
+        backend (str): 'json' or 'orjson', only used for compact output. Defaults
+            to orjson when it is installed
+
+    Returns (int): number of bytes written
+    """
+    backend = backend or _default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if backend == "orjson" and _orjson() is None:
+        raise ImportError("the orjson backend requires orjson to be installed")
+    encode = _encoder(compact, backend)
+    chunks = _iter_compact(data, encode) if compact else _iter_pretty(data, encode)
+
+    written = 0
+    buffer: List[str] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= CHUNK_SIZE:
+            written += fp.write("".join(buffer).encode("utf-8"))
+            buffer, buffered = [], 0
+    written += fp.write("".join(buffer).encode("utf-8"))
+    return written
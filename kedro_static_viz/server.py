@@ -0,0 +1,424 @@
+"""
+development server for a built kedro-static-viz site
+
+FOR DEVELOPMENT USE ONLY, use a real server for production.
+
+The default threaded mode speaks HTTP/1.1 with keep-alive, answers conditional
+requests with ETag and Last-Modified validators, lets browsers cache hashed
+Gatsby assets for a year, keeps small files in an in-memory LRU and sends large
+ones with `sendfile`. Precompressed `.br` and `.gz` siblings are served to
+clients that accept them. With a ReloadNotifier, html pages are served with a
+script listening to server-sent events on `RELOAD_PATH` and reload when the
+site is rebuilt.
+
+Example:
+
+    >>> from kedro_static_viz.server import run_static_server
+    >>> run_static_server("public", port=4141)
+"""
+import email.utils
+import http.server
+import io
+import os
+import re
+import socketserver
+import threading
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import IO, Any, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+COMPRESS_SUFFIXES = (".json", ".js", ".css")
+# precompressed sibling suffix by content coding, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+# gatsby fingerprints bundles as name-<20 hex>.js and styles.<20 hex>.css, content
+# addressed data files are named <name>.<20 hex>.json
+HASHED_ASSET = re.compile(r"[-.][0-9a-f]{20}\.(js|css|json)$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+RELOAD_PATH = "/__kedro_static_viz/reload"
+RELOAD_SCRIPT = (
+    "<script>new EventSource(%r).addEventListener("
+    '"reload",function(){location.reload()})</script>' % RELOAD_PATH
+).encode()
+# seconds between keep-alive comments on an idle event stream, writing them is
+# how a closed page is noticed
+RELOAD_KEEPALIVE = 15.0
+
+
+def _is_fresh(compressed: Path, source: Path) -> bool:
+    "True if compressed exists and is not older than source"
+    try:
+        return compressed.stat().st_mtime_ns >= source.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def _accepted_encodings(header: str) -> List[str]:
+    "content codings accepted by an Accept-Encoding header, q=0 excluded"
+    accepted = []
+    for token in header.split(","):
+        coding, _, params = token.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.append(coding.strip().lower())
+    return accepted
+
+
+class FileCache:
+    """
+    thread safe LRU of small file contents, keyed by path and validated against
+    the file's mtime and size on every lookup
+
+    Arguments:
+        max_bytes (int): total size of the cached contents
+        max_file_size (int): files larger than this are never cached
+    """
+
+    def __init__(
+        self, max_bytes: int = 64 << 20, max_file_size: int = 1 << 20
+    ) -> None:
+        "initializes an empty cache"
+        self.max_bytes = max_bytes
+        self.max_file_size = max_file_size
+        self._entries: OrderedDict[str, Tuple[int, int, bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result) -> Optional[bytes]:
+        "contents of path if it is small enough to cache, read on a miss"
+        if stat.st_size > self.max_file_size:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                return entry[2]
+        with open(path, "rb") as f:
+            data = f.read()
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._size -= len(old[2])
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return data
+
+
+class ReloadNotifier:
+    """
+    tells the pages open on a server to reload, every `notify` starts a new
+    generation that waiting event streams pick up
+    """
+
+    def __init__(self) -> None:
+        "initializes the notifier at generation 0"
+        self.generation = 0
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def notify(self) -> None:
+        "asks every open page to reload"
+        with self._condition:
+            self.generation += 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        "ends every event stream, e.g. when the server shuts down"
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def wait(self, generation: int, timeout: float) -> int:
+        """
+        blocks until the generation moves past generation, the notifier is
+        closed or timeout seconds passed
+
+        Returns (int): the current generation
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.generation != generation or self.closed, timeout
+            )
+            return self.generation
+
+
+class PrecompressedHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    SimpleHTTPRequestHandler that serves the precompressed sibling of a file when
+    the client accepts its content coding and the sibling is up to date
+    """
+
+    def _variant(self, path: str) -> Optional[Tuple[str, Path]]:
+        "the content coding and precompressed file to serve for path, if any"
+        source = Path(path)
+        if source.suffix not in COMPRESS_SUFFIXES or not source.is_file():
+            return None
+        accepted = _accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for encoding, suffix in ENCODINGS.items():
+            compressed = Path(f"{source}{suffix}")
+            if encoding in accepted and _is_fresh(compressed, source):
+                return encoding, compressed
+        return None
+
+    def send_head(self) -> Optional[IO[bytes]]:
+        "sends the headers of the precompressed variant or falls back to the file"
+        path = self.translate_path(self.path)
+        self._vary = Path(path).suffix in COMPRESS_SUFFIXES
+        variant = self._variant(path)
+        if variant is None:
+            return super().send_head()
+        encoding, compressed = variant
+        f = open(compressed, "rb")
+        fs = os.fstat(f.fileno())
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(fs.st_size))
+        self.send_header("Last-Modified", self.date_time_string(int(fs.st_mtime)))
+        self.end_headers()
+        return f
+
+    def end_headers(self) -> None:
+        "adds Vary for every compressible response, compressed or not"
+        if getattr(self, "_vary", False):
+            self.send_header("Vary", "Accept-Encoding")
+        super().end_headers()
+
+
+class CachingHandler(PrecompressedHandler):
+    """
+    HTTP/1.1 keep-alive handler with validators, cache headers, an in-memory LRU
+    for small files and sendfile for large ones
+    """
+
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes, without TCP_NODELAY keep-alive
+    # responses stall on delayed acks
+    disable_nagle_algorithm = True
+
+    def __init__(
+        self,
+        *args: Any,
+        cache: FileCache = None,
+        reload: ReloadNotifier = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        initializes the handler, cache and reload are shared by every request of
+        a server
+        """
+        self.cache = cache
+        self.reload = reload
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        "streams reload events on RELOAD_PATH, serves files otherwise"
+        if self.reload is not None and urlsplit(self.path).path == RELOAD_PATH:
+            self._stream_reloads()
+            return
+        super().do_GET()
+
+    def _stream_reloads(self) -> None:
+        "sends a `reload` event every time the site is rebuilt, until disconnected"
+        self.close_connection = True
+        self.send_response(http.HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        generation = self.reload.generation
+        try:
+            self.wfile.write(b"retry: 500\n\n")
+            while not self.reload.closed:
+                current = self.reload.wait(generation, RELOAD_KEEPALIVE)
+                if current != generation:
+                    generation = current
+                    self.wfile.write(b"event: reload\ndata: %d\n\n" % generation)
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_page(self, path: str) -> IO[bytes]:
+        "sends an html page with the live reload script, never cached"
+        with open(path, "rb") as f:
+            page = f.read()
+        end = page.rfind(b"</body>")
+        end = len(page) if end == -1 else end
+        page = page[:end] + RELOAD_SCRIPT + page[end:]
+        self.send_response(http.HTTPStatus.OK)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(len(page)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        return io.BytesIO(page)
+
+    def _resolve(self) -> Optional[str]:
+        """
+        the file a GET or HEAD should serve, None when the base class has to
+        answer, i.e. directory redirects, listings and missing files
+        """
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not urlsplit(self.path).path.endswith("/"):
+                return None
+            for index in ("index.html", "index.htm"):
+                if os.path.isfile(os.path.join(path, index)):
+                    return os.path.join(path, index)
+            return None
+        return path if os.path.isfile(path) else None
+
+    def _not_modified(self, etag: str, stat: os.stat_result) -> bool:
+        "True if the request's validators match the file being served"
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        return since is not None and int(stat.st_mtime) <= since.timestamp()
+
+    def _send_validators(self, path: str, etag: str, stat: os.stat_result) -> None:
+        "sends ETag, Last-Modified and Cache-Control for path"
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(int(stat.st_mtime)))
+        immutable = HASHED_ASSET.search(os.path.basename(path)) is not None
+        self.send_header("Cache-Control", IMMUTABLE if immutable else REVALIDATE)
+
+    def send_head(self) -> Optional[IO[bytes]]:
+        "sends the headers for the file, its precompressed variant, or a 304"
+        path = self._resolve()
+        if path is None:
+            self._vary = False
+            return http.server.SimpleHTTPRequestHandler.send_head(self)
+        self._vary = Path(path).suffix in COMPRESS_SUFFIXES
+        if self.reload is not None and path.endswith((".html", ".htm")):
+            return self._send_page(path)
+        variant = self._variant(path)
+        encoding, served = variant if variant is not None else (None, Path(path))
+        try:
+            stat = os.stat(served)
+        except OSError:
+            self.send_error(http.HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        etag = f'"{etag}-{encoding}"' if encoding else f'"{etag}"'
+        if self._not_modified(etag, stat):
+            self.send_response(http.HTTPStatus.NOT_MODIFIED)
+            self._send_validators(path, etag, stat)
+            self.end_headers()
+            return None
+
+        data = self.cache.get(str(served), stat) if self.cache is not None else None
+        f = io.BytesIO(data) if data is not None else open(served, "rb")
+        self.send_response(http.HTTPStatus.OK)
+        self.send_header("Content-Type", self.guess_type(path))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(stat.st_size))
+        self._send_validators(path, etag, stat)
+        self.end_headers()
+        return f
+
+    def copyfile(self, source: Any, outputfile: Any) -> None:
+        "sends real files with sendfile, in-memory ones through the write buffer"
+        if isinstance(source, io.BytesIO):
+            outputfile.write(source.getbuffer())
+            return
+        outputfile.flush()
+        self.connection.sendfile(source)
+
+
+class ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    "HTTPServer handling every connection in its own daemon thread"
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def make_server(
+    directory: Union[str, Path],
+    port: int = 4141,
+    host: str = "",
+    threaded: bool = True,
+    cache: FileCache = None,
+    reload: ReloadNotifier = None,
+) -> socketserver.TCPServer:
+    """
+    creates, without starting, a server for the given directory
+
+    Arguments:
+        directory (str, Path): Path to the directory to serve
+        port (int): TCP port to listen to, 0 picks a free port
+        host (str): interface to bind, all interfaces by default
+        threaded (bool): Serve concurrent keep-alive connections with validators
+            and caching. False is the single threaded HTTP/1.0 server of earlier
+            versions. Default is True
+        cache (FileCache): LRU for small files when threaded, a 64 MiB one by
+            default
+        reload (ReloadNotifier): Inject the live reload script into html pages
+            and stream the notifier's reloads to them. Needs threaded. Default
+            is None
+
+    Returns (TCPServer): the bound server
+    """
+    here = str(Path(directory).absolute())
+    if not threaded:
+        if reload is not None:
+            raise ValueError("live reload needs the threaded server")
+        handler = partial(PrecompressedHandler, directory=here)
+        return socketserver.TCPServer((host, port), handler)
+    handler = partial(
+        CachingHandler, directory=here, cache=cache or FileCache(), reload=reload
+    )
+    return ThreadingServer((host, port), handler)
+
+
+def run_static_server(
+    directory: Union[str, Path],
+    port: int = 4141,
+    threaded: bool = True,
+    reload: ReloadNotifier = None,
+) -> None:
+    """Serves content from the given directory on the given port
+
+    FOR DEVELOPMENT USE ONLY, use a real server for production.
+
+    behaves very much like `python -m http.server`, except that precompressed
+    `.br` and `.gz` siblings are served to clients that accept them and, in
+    threaded mode, connections are served concurrently and cache validated
+
+    Arguments:
+        directory {[str]} -- Path to the directory to serve.
+        port {[int]} -- TCP port that viz will listen to
+        threaded {[bool]} -- Serve concurrent keep-alive connections.
+        reload {[ReloadNotifier]} -- Reload open pages on its notifications.
+    """
+    with make_server(directory, port=port, threaded=threaded, reload=reload) as httpd:
+        print("kedro-static-viz serving at port", port)
+        try:
+            httpd.serve_forever()
+        finally:
+            if reload is not None:
+                reload.close()
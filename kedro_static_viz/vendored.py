@@ -1,8 +1,6 @@
 """ Kedro-Viz plugin and webserver """
 # pylint: disable=protected-access
 import hashlib
-import inspect
-import json
 import logging
 import multiprocessing
 import socket
@@ -13,21 +11,23 @@ from collections import defaultdict
 from contextlib import closing
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Set, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple, Union
 
 import click
 import kedro
-import requests
-from flask import Flask, abort, jsonify, send_from_directory
-from IPython.core.display import HTML, display
-from kedro.framework.cli.utils import KedroCliError
-from kedro.framework.context import KedroContextError, load_context
 from kedro.io import AbstractDataSet, DataCatalog, DataSetNotFoundError
 from kedro.pipeline.node import Node
 from semver import VersionInfo
-from toposort import toposort_flatten
 
-from kedro_viz.utils import wait_for
+from .graph import Graph, sort_layers
+from .params import ParameterCache
+from .profile import stage
+
+if TYPE_CHECKING:  # pragma: no cover
+    from flask import Flask
+
+    from .builder import StaticVizBuilder
+    from .profile import Profiler
 
 KEDRO_VERSION = VersionInfo.parse(kedro.__version__)
 
@@ -35,13 +35,9 @@ _VIZ_PROCESSES = {}  # type: Dict[int, multiprocessing.Process]
 
 _DEFAULT_KEY = "__default__"
 
-_DATA = None  # type: Dict
-_CATALOG = None  # type: DataCatalog
-_JSON_NODES = {}  # type: Dict[str, Dict[str, Union[Node, AbstractDataSet, Dict, None]]]
-
-app = Flask(  # pylint: disable=invalid-name
-    __name__, static_folder=str(Path(__file__).parent.absolute() / "html" / "static")
-)
+# the build served by the Flask app, every other build owns its builder
+_BUILDER = None  # type: StaticVizBuilder
+_APP = None  # type: Flask
 
 ERROR_PROJECT_ROOT = (
     "Could not find a Kedro project root. You can run `kedro viz` by either providing "
@@ -55,10 +51,10 @@ ERROR_PIPELINE_FLAG_NOT_SUPPORTED = (
 )
 
 
-@app.route("/")
-@app.route("/<path:subpath>")
 def root(subpath="index.html"):
     """Serve the non static html and js etc"""
+    from flask import send_from_directory
+
     return send_from_directory(
         str(Path(__file__).parent.absolute() / "html"), subpath, cache_timeout=0
     )
@@ -69,6 +65,8 @@ def _hash(value):
 
 
 def _check_viz_up(port):
+    import requests
+
     url = "http://127.0.0.1:{}/".format(port)
     try:
         response = requests.get(url)
@@ -92,6 +90,9 @@ def run_viz(port=None, line=None, local_ns=None) -> None:
             https://ipython.readthedocs.io/en/stable/config/custommagics.html
 
     """
+    from IPython.core.display import HTML, display
+    from kedro_viz.utils import wait_for
+
     port = port or 4141  # Default argument doesn't work in Jupyter line magic.
     port = _allocate_port(start_at=port)
 
@@ -141,14 +142,14 @@ def _allocate_port(start_at: int, end_at: int = 65535) -> int:
 
 
 def _load_from_file(load_file: str) -> dict:
-    global _DATA  # pylint: disable=global-statement,invalid-name
-    _DATA = json.loads(Path(load_file).read_text())
-    for key in ["nodes", "edges", "tags"]:
-        if key not in _DATA:
-            raise KedroCliError(
-                "Invalid file, top level key '{}' not found.".format(key)
-            )
-    return _DATA
+    from kedro.framework.cli.utils import KedroCliError
+
+    from .loadfile import LoadFileError, load
+
+    try:
+        return load(load_file)
+    except LoadFileError as e:
+        raise KedroCliError("Invalid file, {}".format(e)) from None
 
 
 def _get_pipelines_from_context(context, pipeline_name) -> Dict[str, "Pipeline"]:
@@ -176,11 +177,14 @@ def _sort_layers(
     [transitive closure](https://en.wikipedia.org/wiki/Transitive_closure) in a graph of layers
     and then toposort them. The algorithm below follows a repeated depth-first search approach:
         * For every node, find all layers that depends on it in a depth-first search.
+        The search uses an explicit stack, so arbitrarily deep pipelines do not hit
+        Python's recursion limit.
         * While traversing, build up a dictionary of {node_id -> layers} for the node
-        that has already been visited.
-        * Turn the final {node_id -> layers} into a {layer -> layers} to represent the layers'
-        dependencies. Note: the key is a layer and the values are the parents of that layer,
-        just because that's the format toposort requires.
+        that has already been visited. The layers are stored as an integer bitset
+        over the distinct layers, i.e. one bit per layer per node.
+        * Fold the {node_id -> layers} into a {layer -> layers} bitset per layer of the
+        visited nodes, then expand it into {layer -> parent layers} to represent the
+        layers' dependencies, just because that's the format toposort requires.
         * Feed this layers dictionary to ``toposort`` and return the sorted values.
         * Raise CircularDependencyError if the layers cannot be sorted topologically,
         i.e. there are cycles among the layers.
@@ -204,60 +208,22 @@ def _sort_layers(
     Raises:
         CircularDependencyError: When the layers have cyclic dependencies.
     """
-    node_layers = {}  # map node_id to the layers that depend on it
-
-    def find_child_layers(node_id: str) -> Set[str]:
-        """For the given node_id, find all layers that depend on it in a depth-first manner.
-        Build up the node_layers dependency dictionary while traversing so each node is visited
-        only once.
-        Note: Python's default recursive depth limit is 1000, which means this algorithm won't
-        work for pipeline with more than 1000 nodes. However, we can rewrite this using stack if
-        we run into this limit in practice.
-        """
-        if node_id in node_layers:
-            return node_layers[node_id]
-
-        node_layers[node_id] = set()
-
-        # for each child node of the given node_id,
-        # mark its layer and all layers that depend on it as child layers of the given node_id.
-        for child_node_id in dependencies[node_id]:
-            child_node = nodes[child_node_id]
-            child_layer = child_node.get("layer")
-            if child_layer is not None:
-                node_layers[node_id].add(child_layer)
-            node_layers[node_id].update(find_child_layers(child_node_id))
-
-        return node_layers[node_id]
-
-    # populate node_layers dependencies
+    index_of = {node_id: index for index, node_id in enumerate(nodes)}
+    offsets = [0]
+    children = []  # type: List[int]
     for node_id in nodes:
-        find_child_layers(node_id)
-
-    # compute the layer dependencies dictionary based on the node_layers dependencies,
-    # represented as {layer -> set(parent_layers)}
-    layer_dependencies = defaultdict(set)
-    for node_id, child_layers in node_layers.items():
-        node_layer = nodes[node_id].get("layer")
+        children.extend(index_of[child] for child in dependencies.get(node_id, ()))
+        offsets.append(len(children))
+    layer_of = [node.get("layer") for node in nodes.values()]
+    return sort_layers(layer_of, offsets, children)
 
-        # add the node's layer as a parent layer for all child layers.
-        # Even if a child layer is the same as the node's layer, i.e. a layer is marked
-        # as its own parent, toposort still works so we don't need to check for that explicitly.
-        if node_layer is not None:
-            for layer in child_layers:
-                layer_dependencies[layer].add(node_layer)
 
-    # toposort the layer_dependencies to find the layer order.
-    # Note that for string, toposort_flatten will default to alphabetical order for tie-break.
-    return toposort_flatten(layer_dependencies)
-
-
-def _construct_layer_mapping():
-    if _CATALOG.layers is None:
-        return {ds_name: None for ds_name in _CATALOG._data_sets}
+def _construct_layer_mapping(catalog: DataCatalog) -> Dict[str, str]:
+    if catalog.layers is None:
+        return {ds_name: None for ds_name in catalog._data_sets}
 
     dataset_to_layer = {}
-    for layer, dataset_names in _CATALOG.layers.items():
+    for layer, dataset_names in catalog.layers.items():
         dataset_to_layer.update({dataset_name: layer for dataset_name in dataset_names})
 
     return dataset_to_layer
@@ -269,86 +235,31 @@ def _pretty_name(name: str) -> str:
     return " ".join(parts)
 
 
-def format_pipelines_data(pipelines: Dict[str, "Pipeline"]) -> Dict[str, list]:
-    """
-    Format pipelines and catalog data from Kedro for kedro-viz.
-
-    Args:
-        pipelines: Dictionary of Kedro pipeline objects.
-
-    Returns:
-        Dictionary of pipelines, nodes, edges, tags and layers, and pipelines list.
-
-    """
-    pipelines_list = []
-    # keep track of a sorted list of nodes to returned to the client
-    nodes_list = []
-    # keep track of edges in the graph: [{source_node_id -> target_node_id}]
-    edges_list = []
-    # keep tracking of node_id -> node data in the graph
-    nodes = {}
-    # keep track of node_id -> set(child_node_ids) for layers sorting
-    node_dependencies = defaultdict(set)
-    tags = set()
-
-    for pipeline_key, pipeline in pipelines.items():
-        pipelines_list.append({"id": pipeline_key, "name": _pretty_name(pipeline_key)})
-        format_pipeline_data(
-            pipeline_key,
-            pipeline,
-            nodes,
-            node_dependencies,
-            tags,
-            edges_list,
-            nodes_list,
-        )
-
-    # sort tags
-    sorted_tags = [{"id": tag, "name": _pretty_name(tag)} for tag in sorted(tags)]
-    # sort layers
-    sorted_layers = _sort_layers(nodes, node_dependencies)
-
-    default_pipeline = {"id": _DEFAULT_KEY, "name": _pretty_name(_DEFAULT_KEY)}
-    selected_pipeline = (
-        default_pipeline["id"]
-        if default_pipeline in pipelines_list
-        else pipelines_list[0]["id"]
-    )
-
-    return {
-        "nodes": nodes_list,
-        "edges": edges_list,
-        "tags": sorted_tags,
-        "layers": sorted_layers,
-        "pipelines": pipelines_list,
-        "selected_pipeline": selected_pipeline,
-    }
-
-
 def _is_namespace_param(namespace: str) -> bool:
     """Returns whether a dataset namespace is a parameter"""
     return namespace.lower().startswith("param")
 
 
-# pylint: disable=too-many-locals,too-many-arguments,too-many-branches
+# pylint: disable=too-many-locals
 def format_pipeline_data(
     pipeline_key: str,
     pipeline: "Pipeline",  # noqa: F821
-    nodes: Dict[str, dict],
-    node_dependencies: Dict[str, Set[str]],
-    tags: Set[str],
-    edges_list: List[dict],
-    nodes_list: List[dict],
+    graph: Graph,
+    json_nodes: Dict[str, Dict[str, Union[Node, AbstractDataSet, Dict, None]]],
+    parameters: ParameterCache,
+    defer_parameters: bool = False,
 ) -> None:
     """Format pipeline and catalog data from Kedro for kedro-viz.
 
     Args:
         pipeline_key: key value of a pipeline object (e.g "__default__").
         pipeline: Kedro pipeline object.
-        nodes: Dictionary of id and node dict.
-        node_dependencies: Dictionary of id and node dependencies.
-        edges_list: List of all edges.
-        nodes_list: List of all nodes.
+        graph: Graph the pipeline's nodes, edges and tags are added to, it holds
+            the dataset layers of the catalog.
+        json_nodes: Dictionary of id and the objects backing the node's metadata.
+        parameters: Catalog lookups and parameter loads of the build.
+        defer_parameters: Only record the parameter namespaces of task nodes,
+            their values are loaded when the metadata is requested.
 
     """
     # keep_track of {data_set_namespace -> set(tags)}
@@ -356,202 +267,186 @@ def format_pipeline_data(
     # keep track of {data_set_namespace -> layer it belongs to}
     namespace_to_layer = {}
 
-    dataset_to_layer = _construct_layer_mapping()
+    dataset_to_layer = graph.dataset_to_layer
 
     # Nodes and edges
     for node in sorted(pipeline.nodes, key=lambda n: n.name):
-        task_id = _hash(str(node))
-        tags.update(node.tags)
-        _JSON_NODES[task_id] = {"type": "task", "obj": node}
-        if task_id not in nodes:
-            nodes[task_id] = {
-                "type": "task",
-                "id": task_id,
-                "name": getattr(node, "short_name", node.name),
-                "full_name": getattr(node, "_func_name", str(node)),
-                "tags": sorted(node.tags),
-                "pipelines": [pipeline_key],
-            }
-            nodes_list.append(nodes[task_id])
-        else:
-            nodes[task_id]["pipelines"].append(pipeline_key)
+        task = graph.add_task(node, pipeline_key)
+        task_id = graph.ids[task]
+        node_tags = node.tags
+        graph.tags.update(node_tags)
+        json_nodes[task_id] = {"type": "task", "obj": node}
+        parameter_namespaces = []
 
         for data_set in node.inputs:
             namespace = data_set.split("@")[0]
             namespace_to_layer[namespace] = dataset_to_layer.get(data_set)
-            namespace_id = _hash(namespace)
-            edge = {"source": namespace_id, "target": task_id}
-            if edge not in edges_list:
-                edges_list.append(edge)
-            namespace_tags[namespace].update(node.tags)
-            node_dependencies[namespace_id].add(task_id)
+            graph.add_edge(graph.intern(namespace), task)
+            namespace_tags[namespace].update(node_tags)
 
             # if it is a parameter, add it to the node's data
             if _is_namespace_param(namespace):
-                if "parameters" not in _JSON_NODES[task_id]:
-                    _JSON_NODES[task_id]["parameters"] = {}
-
-                if namespace == "parameters":
-                    _JSON_NODES[task_id]["parameters"] = _get_dataset_data_params(
-                        namespace
-                    ).load()
-                else:
-                    parameter_name = namespace.replace("params:", "")
-                    parameter_value = _get_dataset_data_params(namespace).load()
-                    _JSON_NODES[task_id]["parameters"][parameter_name] = parameter_value
+                parameter_namespaces.append(namespace)
+
+        if parameter_namespaces:
+            json_nodes[task_id]["parameter_namespaces"] = parameter_namespaces
+            if not defer_parameters:
+                json_nodes[task_id]["parameters"] = parameters.node_parameters(
+                    parameter_namespaces
+                )
 
         for data_set in node.outputs:
             namespace = data_set.split("@")[0]
             namespace_to_layer[namespace] = dataset_to_layer.get(data_set)
-            namespace_id = _hash(namespace)
-            edge = {"source": task_id, "target": namespace_id}
-            if edge not in edges_list:
-                edges_list.append(edge)
-            namespace_tags[namespace].update(node.tags)
-            node_dependencies[task_id].add(namespace_id)
+            graph.add_edge(task, graph.intern(namespace))
+            namespace_tags[namespace].update(node_tags)
     # Parameters and data
     for namespace, tag_names in sorted(namespace_tags.items()):
         is_param = _is_namespace_param(namespace)
-        node_id = _hash(namespace)
+        node_type = "parameters" if is_param else "data"
+        node_id = graph.ids[
+            graph.add_dataset(
+                namespace,
+                node_type,
+                tag_names,
+                namespace_to_layer[namespace],
+                pipeline_key,
+            )
+        ]
 
-        _JSON_NODES[node_id] = {
-            "type": "parameters" if is_param else "data",
-            "obj": _get_dataset_data_params(namespace),
+        json_nodes[node_id] = {
+            "type": node_type,
+            "obj": parameters.dataset(namespace),
         }
+        if is_param:
+            json_nodes[node_id]["namespace"] = namespace
         if is_param and namespace != "parameters":
             # Add "parameter_name" key only for "params:" prefix.
-            _JSON_NODES[node_id]["parameter_name"] = namespace.replace("params:", "")
-
-        if node_id not in nodes:
-            nodes[node_id] = {
-                "type": "parameters" if is_param else "data",
-                "id": node_id,
-                "name": _pretty_name(namespace),
-                "full_name": namespace,
-                "tags": sorted(tag_names),
-                "layer": namespace_to_layer[namespace],
-                "pipelines": [pipeline_key],
-            }
-            nodes_list.append(nodes[node_id])
-        else:
-            nodes[node_id]["pipelines"].append(pipeline_key)
-
-
-def _get_dataset_data_params(namespace: str):
+            json_nodes[node_id]["parameter_name"] = namespace.replace("params:", "")
+
+
+def _get_dataset_data_params(catalog: DataCatalog, namespace: str):
     if KEDRO_VERSION.match(">=0.16.0"):
         try:
-            node_data = _CATALOG._get_dataset(namespace)
+            node_data = catalog._get_dataset(namespace)
         except DataSetNotFoundError:
             node_data = None
     else:
-        node_data = _CATALOG._data_sets.get(namespace)  # pragma: no cover
+        node_data = catalog._data_sets.get(namespace)  # pragma: no cover
     return node_data
 
 
-def _get_parameter_values(node: Dict) -> Any:
-    """Get parameter values from a stored node."""
-    if node["obj"] is not None:
-        parameter_values = node["obj"].load()
-    else:  # pragma: no cover
-        parameter_values = {}
-    return parameter_values
-
-
-@app.route("/api/main")
 def nodes_json():
     """Serve the data from all Kedro pipelines in the project.
     This includes basic node data amongst others edges, tags, and layers.
     """
-    return jsonify(_DATA)
+    from flask import jsonify
 
+    return jsonify(_BUILDER.data)
 
-@app.route("/api/pipelines/<string:pipeline_id>")
-def pipeline_data(pipeline_id):
-    """Serve the data from a single pipeline in a Kedro project."""
+
+def _pipeline_data(
+    data: Dict, pipeline_id: str, graph: Graph = None
+) -> Union[Dict, None]:
+    """Slice formatted data down to the nodes and edges of a single pipeline.
+    Returns None when pipeline_id is not one of the pipelines in data.
+    The slice is taken from the graph data was formatted from when given.
+    """
     current_pipeline = {"id": pipeline_id, "name": _pretty_name(pipeline_id)}
-    if current_pipeline not in _DATA["pipelines"]:
-        abort(404, description="Invalid pipeline ID.")
+    if current_pipeline not in data["pipelines"]:
+        return None
+
+    if graph is not None:
+        return {
+            **graph.pipeline_slice(pipeline_id),
+            "tags": data["tags"],
+            "layers": data["layers"],
+            "pipelines": data["pipelines"],
+            "selected_pipeline": current_pipeline["id"],
+        }
 
     pipeline_node_ids = set()
     pipeline_nodes = []
 
-    for node in _DATA["nodes"]:
+    for node in data["nodes"]:
         if pipeline_id in node["pipelines"]:
             pipeline_node_ids.add(node["id"])
             pipeline_nodes.append(node)
 
     pipeline_edges = []
-    for edge in _DATA["edges"]:
+    for edge in data["edges"]:
         if {edge["source"], edge["target"]} <= pipeline_node_ids:
             pipeline_edges.append(edge)
 
-    return jsonify(
-        {
-            "nodes": pipeline_nodes,
-            "edges": pipeline_edges,
-            "tags": _DATA["tags"],
-            "layers": _DATA["layers"],
-            "pipelines": _DATA["pipelines"],
-            "selected_pipeline": current_pipeline["id"],
-        }
-    )
+    return {
+        "nodes": pipeline_nodes,
+        "edges": pipeline_edges,
+        "tags": data["tags"],
+        "layers": data["layers"],
+        "pipelines": data["pipelines"],
+        "selected_pipeline": current_pipeline["id"],
+    }
+
+
+def pipeline_data(pipeline_id):
+    """Serve the data from a single pipeline in a Kedro project."""
+    from flask import abort, jsonify
+
+    data = _BUILDER.pipeline_data(pipeline_id)
+    if data is None:
+        abort(404, description="Invalid pipeline ID.")
+    return jsonify(data)
 
 
-@app.route("/api/nodes/<string:node_id>")
 def nodes_metadata(node_id):
     """Serve the metadata for node and dataset."""
-    node = _JSON_NODES.get(node_id)
-    if not node:
+    from flask import abort, jsonify
+
+    if node_id not in _BUILDER.json_nodes:
         abort(404, description="Invalid node ID.")
-    if node["type"] == "task":
-        task_metadata = _get_task_metadata(node)
-        return jsonify(task_metadata)
-    if node["type"] == "data":
-        dataset_metadata = _get_dataset_metadata(node)
-        return jsonify(dataset_metadata)
-
-    parameter_values = _get_parameter_values(node)
-
-    if "parameter_name" in node:
-        # In case of 'params:' prefix
-        parameters_metadata = {"parameters": {node["parameter_name"]: parameter_values}}
-    else:
-        # In case of 'parameters'
-        parameters_metadata = {"parameters": parameter_values}
-    return jsonify(parameters_metadata)
+    return jsonify(_BUILDER.node_metadata(node_id))
 
 
-@app.errorhandler(404)
 def resource_not_found(error):
     """Returns HTTP 404 on resource not found."""
-    return jsonify(error=str(error)), 404
+    from flask import jsonify
 
+    return jsonify(error=str(error)), 404
 
-def _get_task_metadata(node):
-    """Get a dictionary of task metadata: 'code', 'filepath' and 'docstring'.
-    For 'filepath', remove the path to the project from the full code location
-    before sending to JSON.
 
-    Example:
-        'code_full_path':   'path-to-project/project_root/path-to-code/node.py'
-        'Path.cwd().parent':'path-to-project/'
-        'filepath':    'project_root/path-to-code/node.py''
+def _create_app() -> "Flask":
+    """Create the Flask app serving the formatted data and the viz frontend."""
+    from flask import Flask
 
-    """
-    task_metadata = {"code": inspect.getsource(node["obj"]._func)}
+    flask_app = Flask(
+        __name__,
+        static_folder=str(Path(__file__).parent.absolute() / "html" / "static"),
+    )
+    flask_app.add_url_rule("/", view_func=root)
+    flask_app.add_url_rule("/<path:subpath>", view_func=root)
+    flask_app.add_url_rule("/api/main", view_func=nodes_json)
+    flask_app.add_url_rule(
+        "/api/pipelines/<string:pipeline_id>", view_func=pipeline_data
+    )
+    flask_app.add_url_rule("/api/nodes/<string:node_id>", view_func=nodes_metadata)
+    flask_app.register_error_handler(404, resource_not_found)
+    return flask_app
 
-    code_full_path = Path(inspect.getfile(node["obj"]._func)).expanduser().resolve()
-    filepath = code_full_path.relative_to(Path.cwd().parent)
-    task_metadata["filepath"] = str(filepath)
 
-    docstring = inspect.getdoc(node["obj"]._func)
-    if docstring:
-        task_metadata["docstring"] = docstring
+def _get_app() -> "Flask":
+    """Get the Flask app, created on first use so importing this module does not
+    import Flask."""
+    global _APP  # pylint: disable=global-statement,invalid-name
+    if _APP is None:
+        _APP = _create_app()
+    return _APP
 
-    if "parameters" in node:
-        task_metadata["parameters"] = node["parameters"]
 
-    return task_metadata
+def __getattr__(name: str) -> Any:
+    """Create the module's Flask `app` lazily."""
+    if name == "app":
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _get_dataset_metadata(node):
@@ -622,6 +517,8 @@ def commands():
 )
 def viz(host, port, browser, load_file, save_file, pipeline, env):
     """Visualize the pipeline using kedroviz."""
+    from kedro.framework.cli.utils import KedroCliError
+
     try:
         _call_viz(host, port, browser, load_file, save_file, pipeline, env)
     except KedroCliError:
@@ -631,7 +528,64 @@ def viz(host, port, browser, load_file, save_file, pipeline, env):
         raise KedroCliError(str(ex))
 
 
-# pylint: disable=import-outside-toplevel,too-many-arguments,too-many-branches
+# pylint: disable=import-outside-toplevel
+def _load_project(
+    project_path: Path,
+    env: str = None,
+    pipeline_name: str = None,
+    profiler: "Profiler" = None,
+) -> Tuple[DataCatalog, Dict[str, "Pipeline"]]:
+    """Load the catalog and the pipelines to visualize of a Kedro project.
+
+    Args:
+        project_path: Root of the Kedro project.
+        env: Kedro configuration environment.
+        pipeline_name: Name of the only pipeline to load, all registered
+            pipelines when None.
+        profiler: Records the session, context, catalog and pipelines stages.
+
+    Returns:
+        Tuple of the project's catalog and its pipelines by key.
+
+    """
+    from kedro.framework.cli.utils import KedroCliError
+    from kedro.framework.context import KedroContextError
+
+    try:
+        if KEDRO_VERSION.match(">=0.17.0"):  # pragma: no cover
+            from kedro.framework.session import KedroSession
+            from kedro.framework.startup import (  # pylint: disable=no-name-in-module,import-error
+                _get_project_metadata,
+            )
+
+            package_name = _get_project_metadata(project_path).package_name
+            session_kwargs = dict(
+                package_name=package_name,
+                project_path=project_path,
+                env=env,
+                save_on_close=False,
+            )
+            with stage(profiler, "session"):
+                session = KedroSession.create(  # pylint: disable=unexpected-keyword-arg
+                    **session_kwargs
+                )
+            with stage(profiler, "context"):
+                context = session.load_context()  # pylint: disable=no-member
+        else:  # pragma: no cover
+            from kedro.framework.context import load_context
+
+            with stage(profiler, "context"):
+                context = load_context(project_path=project_path, env=env)
+        with stage(profiler, "catalog"):
+            catalog = context.catalog
+        with stage(profiler, "pipelines"):
+            pipelines = _get_pipelines_from_context(context, pipeline_name)
+    except KedroContextError:
+        raise KedroCliError(ERROR_PROJECT_ROOT)  # pragma: no cover
+    return catalog, pipelines
+
+
+# pylint: disable=import-outside-toplevel,too-many-arguments
 def _call_viz(
     host=None,
     port=None,
@@ -641,54 +595,38 @@ def _call_viz(
     pipeline_name=None,
     env=None,
     project_path=None,
+    compact=False,
+    timings=None,
+    defer_parameters=False,
 ):
-    global _DATA  # pylint: disable=global-statement,invalid-name
-    global _CATALOG  # pylint: disable=global-statement
+    from .builder import StaticVizBuilder
+
+    global _BUILDER  # pylint: disable=global-statement,invalid-name
 
     if load_file:
         # Remove all handlers for root logger
         root_logger = logging.getLogger()
         root_logger.handlers = []
 
-        _DATA = _load_from_file(load_file)
+        builder = StaticVizBuilder.from_file(load_file)
     else:
-        try:
-            project_path = project_path or Path.cwd()
-
-            if KEDRO_VERSION.match(">=0.17.0"):  # pragma: no cover
-                from kedro.framework.session import KedroSession
-                from kedro.framework.startup import (  # pylint: disable=no-name-in-module,import-error
-                    _get_project_metadata,
-                )
-
-                package_name = _get_project_metadata(project_path).package_name
-                session_kwargs = dict(
-                    package_name=package_name,
-                    project_path=project_path,
-                    env=env,
-                    save_on_close=False,
-                )
-                session = KedroSession.create(  # pylint: disable=unexpected-keyword-arg
-                    **session_kwargs
-                )
-                context = session.load_context()  # pylint: disable=no-member
-                pipelines = _get_pipelines_from_context(context, pipeline_name)
-            else:  # pragma: no cover
-                context = load_context(project_path=project_path, env=env)
-                pipelines = _get_pipelines_from_context(context, pipeline_name)
-        except KedroContextError:
-            raise KedroCliError(ERROR_PROJECT_ROOT)  # pragma: no cover
-
-        _CATALOG = context.catalog
-        _DATA = format_pipelines_data(pipelines)
+        builder = StaticVizBuilder.from_project(project_path, env, pipeline_name)
+        builder.format_pipelines(
+            timings=timings,
+            defer_parameters=defer_parameters,
+        )
 
     if save_file:
-        Path(save_file).write_text(json.dumps(_DATA, indent=4, sort_keys=True))
+        # a saved build is not served, release its nodes and catalog on return
+        with builder:
+            builder.save(save_file, compact=compact)
+            return builder.data
     else:
+        _BUILDER = builder
         is_localhost = host in ("127.0.0.1", "localhost", "0.0.0.0")
         if browser and is_localhost:
             webbrowser.open_new("http://{}:{:d}/".format(host, port))
-        app.run(host=host, port=port)
+        _get_app().run(host=host, port=port)
 
 
 # Launch a develop viz server manually by supplying this server script with a project_path.
@@ -0,0 +1,319 @@
+"""
+collapsed views of large pipelines, nodes grouped into super-nodes
+
+A pipeline with thousands of nodes takes the viewer seconds to lay out and
+render.  A collapsed view groups the nodes into super-nodes, by top level
+namespace, by modular pipeline or by layer, and aggregates the edges between
+groups once at build time.  Every view is written as a small overview per
+pipeline, `api/views/<view>/<pipeline_id>.json`, holding the groups and the
+nodes outside of any group, and one `api/views/<view>/groups/<group_id>.json`
+per group, fetched when the group is expanded.  A group file holds the group's
+nodes, the edges between them and its edges to the rest of the overview.
+
+Views:
+
+    namespace         the first part of a node's modular pipeline namespace,
+                      `a` for `a.b.cars`
+    modular_pipeline  the whole namespace, `a.b` for `a.b.cars`
+    layer             the layer of a dataset, tasks join the layer of their
+                      outputs, or of their inputs when their outputs have none
+
+Nodes without a namespace, or without a layer, stay in the overview as they are.
+
+Example:
+
+    >>> from kedro_static_viz.views import write_views
+    >>> write_views(builder.data, builder.graph, "public", views=["namespace"])
+"""
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Union
+
+from .export import check_file_names, clear_data_dir, write_json
+from .graph import TASK, Graph, _sha1_id
+
+VIEWS = ("namespace", "modular_pipeline", "layer")
+# type of the super-nodes in the overviews
+GROUP = "group"
+
+
+def _bits(mask: int) -> Iterator[int]:
+    "positions of the set bits of mask, lowest first"
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _node_layers(graph: Graph, types: Sequence[Optional[str]]) -> List[Optional[str]]:
+    """
+    layer of every node, a task takes the layer of its outputs when they are in
+    a single one, otherwise the layer of its inputs when they are in a single one
+    """
+    layer_of = graph.layer_of
+    inputs: Dict[int, Set[str]] = {}
+    outputs: Dict[int, Set[str]] = {}
+    for source, target in zip(graph.sources, graph.targets):
+        if types[source] == TASK and layer_of[target] is not None:
+            outputs.setdefault(source, set()).add(layer_of[target])
+        elif types[target] == TASK and layer_of[source] is not None:
+            inputs.setdefault(target, set()).add(layer_of[source])
+
+    layers = list(layer_of)
+    for index, node_type in enumerate(types):
+        if node_type != TASK:
+            continue
+        for neighbours in (outputs.get(index), inputs.get(index)):
+            if neighbours is not None and len(neighbours) == 1:
+                layers[index] = next(iter(neighbours))
+                break
+    return layers
+
+
+def group_keys(
+    graph: Graph, view: str, types: Sequence[Optional[str]]
+) -> List[Optional[str]]:
+    """
+    the group of every node index in a view, None for nodes outside of groups
+
+    Arguments:
+        graph (Graph): sealed graph of the build
+        view (str): one of VIEWS
+        types (list): type of every node index
+
+    Returns (list): group key by node index
+    """
+    if view == "namespace":
+        return [
+            None if namespace is None else namespace.split(".", 1)[0]
+            for namespace in graph.namespace_of
+        ]
+    if view == "modular_pipeline":
+        return list(graph.namespace_of)
+    if view == "layer":
+        return _node_layers(graph, types)
+    raise ValueError(f"view must be one of {VIEWS}, got {view!r}")
+
+
+class CollapsedView:
+    """
+    the groups of one view and the edges of the graph aggregated between them
+
+    Edges are aggregated once per distinct pipeline membership, an overview of a
+    pipeline sums the memberships it is part of.
+
+    Arguments:
+        graph (Graph): sealed graph of the build
+        view (str): one of VIEWS
+    """
+
+    def __init__(self, graph: Graph, view: str) -> None:
+        "groups the nodes and aggregates the edges"
+        self.graph = graph
+        self.view = view
+        count = len(graph.ids)
+        self.node_dicts: List[Optional[Dict]] = [None] * count
+        types: List[Optional[str]] = [None] * count
+        for index, node in zip(graph.order, graph.node_dicts()):
+            self.node_dicts[index] = node
+            types[index] = node["type"]
+
+        keys = group_keys(graph, view, types)
+        self.keys: List[str] = []
+        self.members: List[List[int]] = []
+        # group of every node index, -1 outside of groups
+        self.group_of = array("l", [-1]) * count
+        position: Dict[str, int] = {}
+        for index in graph.order:
+            key = keys[index]
+            if key is None:
+                continue
+            group = position.get(key)
+            if group is None:
+                group = position[key] = len(self.keys)
+                self.keys.append(key)
+                self.members.append([])
+            self.group_of[index] = group
+            self.members[group].append(index)
+        self.ids = [_sha1_id(f"{view}:{key}") for key in self.keys]
+
+        # edges inside every group, and the count of edges between two ends of
+        # the overview by their pipeline membership.  An end of the overview is
+        # a node index, or the node count plus a group.
+        self.internal: List[List[int]] = [[] for _ in self.keys]
+        self.coarse: Dict[int, Dict[int, int]] = {}
+        # ends of the coarse edges of every group
+        self.touching: List[List[int]] = [[] for _ in self.keys]
+        membership, group_of = graph.membership, self.group_of
+        for edge, (source, target) in enumerate(zip(graph.sources, graph.targets)):
+            source_group, target_group = group_of[source], group_of[target]
+            if source_group != -1 and source_group == target_group:
+                self.internal[source_group].append(edge)
+                continue
+            # an edge is in the pipelines of both its ends
+            mask = membership[source] & membership[target]
+            if source_group != -1:
+                source = count + source_group
+            if target_group != -1:
+                target = count + target_group
+            key = source << 32 | target
+            counts = self.coarse.get(key)
+            if counts is None:
+                counts = self.coarse[key] = {}
+                for group in {source_group, target_group} - {-1}:
+                    self.touching[group].append(key)
+            counts[mask] = counts.get(mask, 0) + 1
+
+    def end_id(self, end: int) -> str:
+        "id of an end of the overview, a node or a group"
+        count = len(self.graph.ids)
+        return self.ids[end - count] if end >= count else self.graph.ids[end]
+
+    def _group_dict(self, group: int, mask: int, size: int) -> Dict:
+        "the super-node of a group"
+        graph = self.graph
+        tags: Set[str] = set()
+        for index in self.members[group]:
+            tags.update(self.node_dicts[index]["tags"])
+        key = self.keys[group]
+        return {
+            "type": GROUP,
+            "id": self.ids[group],
+            "name": graph.pretty_name(key),
+            "full_name": key,
+            "view": self.view,
+            "tags": sorted(tags),
+            "layer": key if self.view == "layer" else None,
+            "pipelines": [graph.pipelines[position] for position in _bits(mask)],
+            "size": size,
+        }
+
+    def overviews(self) -> Dict[str, Dict[str, List[Dict]]]:
+        "nodes and edges of the overview of every pipeline, by pipeline key"
+        graph = self.graph
+        pipelines = graph.pipelines
+        nodes: List[List[Dict]] = [[] for _ in pipelines]
+        edges: List[Dict[int, int]] = [{} for _ in pipelines]
+
+        group_masks = [0] * len(self.keys)
+        sizes = [[0] * len(self.keys) for _ in pipelines]
+        for group, members in enumerate(self.members):
+            for index in members:
+                group_masks[group] |= graph.membership[index]
+                for position in _bits(graph.membership[index]):
+                    sizes[position][group] += 1
+        # groups take the place of their first member in the overview
+        for index in graph.order:
+            group = self.group_of[index]
+            if group == -1:
+                for position in _bits(graph.membership[index]):
+                    nodes[position].append(self.node_dicts[index])
+            elif self.members[group][0] == index:
+                node: Optional[Dict] = None
+                for position in _bits(group_masks[group]):
+                    node = node or self._group_dict(group, group_masks[group], 0)
+                    nodes[position].append(dict(node, size=sizes[position][group]))
+
+        for key, counts in self.coarse.items():
+            for mask, edge_count in counts.items():
+                for position in _bits(mask):
+                    pipeline_edges = edges[position]
+                    pipeline_edges[key] = pipeline_edges.get(key, 0) + edge_count
+
+        return {
+            pipeline_key: {
+                "nodes": nodes[position],
+                "edges": [
+                    {
+                        "source": self.end_id(key >> 32),
+                        "target": self.end_id(key & 0xFFFFFFFF),
+                        "count": edge_count,
+                    }
+                    for key, edge_count in edges[position].items()
+                ],
+            }
+            for position, pipeline_key in enumerate(pipelines)
+        }
+
+    def group_detail(self, group: int) -> Dict:
+        """
+        the nodes of a group, the edges between them and its edges to the other
+        ends of the overview, with the pipelines they are in
+        """
+        graph = self.graph
+        ids = graph.ids
+        boundary: List[Dict] = []
+        for key in self.touching[group]:
+            counts = self.coarse[key]
+            mask = 0
+            for edge_mask in counts:
+                mask |= edge_mask
+            boundary.append(
+                {
+                    "source": self.end_id(key >> 32),
+                    "target": self.end_id(key & 0xFFFFFFFF),
+                    "count": sum(counts.values()),
+                    "pipelines": [graph.pipelines[p] for p in _bits(mask)],
+                }
+            )
+        mask = 0
+        for index in self.members[group]:
+            mask |= graph.membership[index]
+        return {
+            **self._group_dict(group, mask, len(self.members[group])),
+            "nodes": [self.node_dicts[index] for index in self.members[group]],
+            "edges": [
+                {"source": ids[graph.sources[edge]], "target": ids[graph.targets[edge]]}
+                for edge in self.internal[group]
+            ],
+            "boundary": boundary,
+        }
+
+
+def write_views(
+    data: Dict,
+    graph: Graph,
+    directory: Union[str, Path],
+    views: Sequence[str] = VIEWS,
+) -> List[Path]:
+    """
+    writes the overview of every pipeline and the detail of every group of each
+    view under `api/views/<view>/`, views of an earlier build are removed
+
+    Arguments:
+        data (dict): formatted pipeline data as written to pipeline.json
+        graph (Graph): sealed graph data was formatted from
+        directory (str, Path): static site directory
+        views (list): views to write, from VIEWS. Default is all of them
+
+    Returns (list): paths of the files written
+
+    Raises:
+        ValueError: when a pipeline id contains '/', '\\', '..' or NUL
+    """
+    check_file_names([pipeline["id"] for pipeline in data["pipelines"]])
+    view_dir = Path(directory) / "api" / "views"
+    clear_data_dir(view_dir)
+
+    written: List[Path] = []
+    for view in views:
+        collapsed = CollapsedView(graph, view)
+        for pipeline_key, overview in collapsed.overviews().items():
+            path = view_dir / view / f"{pipeline_key}.json"
+            write_json(
+                {
+                    **overview,
+                    "view": view,
+                    "tags": data["tags"],
+                    "layers": data["layers"],
+                    "pipelines": data["pipelines"],
+                    "selected_pipeline": pipeline_key,
+                },
+                path,
+            )
+            written.append(path)
+        for group, group_id in enumerate(collapsed.ids):
+            path = view_dir / view / "groups" / f"{group_id}.json"
+            write_json(collapsed.group_detail(group), path)
+            written.append(path)
+    return written
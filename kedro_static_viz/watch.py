@@ -0,0 +1,182 @@
+"""
+watches a kedro project and rebuilds the pipeline data of its static site
+
+The project's `src/` and `conf/` trees are polled by file modification time and
+size, which over a project's few hundred files takes a few milliseconds per poll
+and needs no platform specific notification API.  Changes are debounced, so an
+editor saving several files, or writing one in several steps, triggers a single
+rebuild.  Rebuilds run in the watching process, the project's modules are
+dropped from `sys.modules` before each one so the session imports the edited
+source.
+
+Example:
+
+    >>> from kedro_static_viz.watch import watch
+    >>> watch(rebuild, [Path("src"), Path("conf")])
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+WATCHED = ("src", "conf")
+# editor, vcs and build artifacts that never change the pipelines
+IGNORED_DIRS = {"__pycache__", ".git", ".ipynb_checkpoints", ".pytest_cache"}
+IGNORED_SUFFIXES = (".pyc", ".swp", ".swx", ".tmp", "~")
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def snapshot(roots: Sequence[Path]) -> Snapshot:
+    """
+    modification time and size of every file under roots
+
+    Arguments:
+        roots (list): directories to walk, missing ones are skipped
+
+    Returns (dict): (st_mtime_ns, st_size) by path
+    """
+    files: Snapshot = {}
+    stack = [str(root) for root in roots]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif not entry.name.endswith(IGNORED_SUFFIXES):
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:  # removed while walking
+                    continue
+    return files
+
+
+def changed(before: Snapshot, after: Snapshot) -> List[str]:
+    "paths added, removed or modified between two snapshots"
+    return sorted(
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    )
+
+
+class Watcher:
+    """
+    polls directories and reports debounced batches of changes
+
+    Arguments:
+        roots (list): directories to watch
+        interval (float): seconds between polls
+        debounce (float): seconds without further changes before a batch is
+            reported
+    """
+
+    def __init__(
+        self, roots: Sequence[Path], interval: float = 0.1, debounce: float = 0.15
+    ) -> None:
+        "initializes the watcher with a snapshot of the current files"
+        self.roots = list(roots)
+        self.interval = interval
+        self.debounce = debounce
+        self.files = snapshot(self.roots)
+
+    def wait(self, stop: Optional[threading.Event] = None) -> List[str]:
+        """
+        blocks until files changed and then stayed unchanged for debounce
+        seconds
+
+        Arguments:
+            stop (Event): returns early, with the changes so far, once it is set
+
+        Returns (list): paths that changed since the last batch
+        """
+        stop = stop or threading.Event()
+        first = dict(self.files)
+        quiet_since: Optional[float] = None
+        while not stop.wait(self.interval):
+            files = snapshot(self.roots)
+            if files != self.files:
+                self.files = files
+                quiet_since = time.monotonic()
+            elif (
+                quiet_since is not None
+                and time.monotonic() - quiet_since >= self.debounce
+            ):
+                break
+        return changed(first, self.files)
+
+
+def forget_project_modules(project_path: Path) -> None:
+    """
+    drops the project package and its submodules from `sys.modules`, and
+    reconfigures kedro's project settings and pipeline registry where kedro has
+    them, so the next session imports the edited source
+
+    Arguments:
+        project_path (Path): root of the kedro project
+    """
+    try:
+        from kedro.framework.startup import _get_project_metadata  # type: ignore
+    except ImportError:  # pragma: no cover kedro < 0.17 imports per context
+        return
+    package_name = _get_project_metadata(project_path).package_name
+    for name in list(sys.modules):
+        if name == package_name or name.startswith(package_name + "."):
+            del sys.modules[name]
+    importlib.invalidate_caches()
+    try:
+        from kedro.framework.project import configure_project  # type: ignore
+    except ImportError:  # pragma: no cover kedro < 0.17.1 has no project registry
+        return
+    configure_project(package_name)
+
+
+def watch(
+    rebuild: Callable[[], None],
+    roots: Sequence[Path],
+    stop: Optional[threading.Event] = None,
+    interval: float = 0.1,
+    debounce: float = 0.15,
+) -> None:
+    """
+    calls rebuild after every debounced batch of changes under roots until stop
+    is set or the process is interrupted
+
+    A failing rebuild, e.g. a syntax error in a pipeline being edited, is printed
+    and the next change is waited for.
+
+    Arguments:
+        rebuild (callable): regenerates the site data
+        roots (list): directories to watch
+        stop (Event): ends the loop once set
+        interval (float): seconds between polls
+        debounce (float): seconds without further changes before rebuilding
+    """
+    stop = stop or threading.Event()
+    watcher = Watcher(roots, interval=interval, debounce=debounce)
+    print("kedro-static-viz watching", ", ".join(str(root) for root in roots))
+    while not stop.is_set():
+        paths = watcher.wait(stop)
+        if not paths or stop.is_set():
+            continue
+        start = time.perf_counter()
+        try:
+            rebuild()
+        except Exception:  # keep watching, the next save may fix it
+            traceback.print_exc()
+            print(f"kedro-static-viz rebuild failed, {len(paths)} changed files")
+            continue
+        print(
+            f"kedro-static-viz rebuilt in {time.perf_counter() - start:.2f}s, "
+            f"{len(paths)} changed files"
+        )
@@ -32,11 +32,12 @@ setup(
     description="Creates a static visualization of your pipeline",
     long_description=README,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     zip_safe=False,
     include_package_data=True,
     license="MIT",
     install_requires=requires,
+    extras_require={"brotli": ["brotli"], "orjson": ["orjson"]},
     classifiers=[
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3.6",